@@ -0,0 +1,29 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.services.warmup import get_readiness
+from app.utils.metrics import REGISTRY
+
+router = APIRouter()
+
+
+@router.get("/health")
+async def health():
+    # liveness: the process is up and serving
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready():
+    """
+    Readiness: 200 once the startup warm-up has finished (immediately in
+    lazy mode), 503 while it runs or if a model failed to load.
+    """
+    state = get_readiness()
+    return JSONResponse(state, status_code=200 if state["status"] == "ready" else 503)
+
+
+@router.get("/metrics")
+async def metrics():
+    # Prometheus text exposition format; includes the evaluation workers
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
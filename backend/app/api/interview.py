@@ -1,13 +1,38 @@
 import json
 import os
+import shutil
 import tempfile
-from typing import List
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, UploadFile, File, Form
+from fastapi import APIRouter, UploadFile, File, Form, Header, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 
-from app.services.interview_evaluator import evaluate_interview
-from app.services.question_service import generate_interview_questions
+from app.services.job_service import (
+    JobCancelledError,
+    QueueFullError,
+    get_job_status,
+    iter_job_events,
+    run_evaluation,
+    submit_evaluation,
+    wait_for_job,
+)
+from app.services.evaluation_profiles import EVALUATION_PROFILES
+from app.services.llm_evaluation_service import LLM_EVALUATION_MODES
+from app.utils.profiling import (
+    PROFILE_MODES,
+    THREADED_PROFILE_MODES,
+    ProfileRateLimitError,
+    acquire_profile_slot,
+    parse_profiler,
+    profile_path,
+    release_profile_slot,
+    run_profiled,
+)
+from app.utils.upload_limit import MAX_UPLOAD_BYTES, UPLOAD_CHUNK_BYTES, UploadTooLargeError
+from app.services.question_pool import QuestionPoolExhaustedError, get_pooled_questions
 from app.schemas.question import QuestionGenerationRequest
 
 router = APIRouter(prefix="/api/interview")
@@ -17,27 +42,72 @@ class GenerateQuestionsRequest(BaseModel):
     experience: str
     company_type: str
     interview_round: str
+    # questions are not repeated across calls with the same session_id
+    session_id: Optional[str] = None
 
 @router.post("/generate-questions")
-async def generate_questions_endpoint(request: GenerateQuestionsRequest):
+async def generate_questions_endpoint(
+    request: GenerateQuestionsRequest,
+    response: Response,
+    profiler: Optional[str] = Query(None),
+    x_profiler: Optional[str] = Header(None)
+):
     req = QuestionGenerationRequest(
         role=request.role,
         experience=request.experience,
         company_type=request.company_type,
         interview_round=request.interview_round
     )
-    questions = generate_interview_questions(req)
+    profiling = _start_profiling(profiler or x_profiler, response)
+    # a pool miss runs a full generation, so keep it off the event loop
+    try:
+        if profiling is None:
+            questions = await run_in_threadpool(get_pooled_questions, req, request.session_id)
+        else:
+            try:
+                questions = await run_in_threadpool(
+                    run_profiled, *profiling, get_pooled_questions, req, request.session_id
+                )
+            finally:
+                release_profile_slot()
+    except QuestionPoolExhaustedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     return {"questions": questions}
 
-@router.post("/evaluate")
-async def evaluate(audio: UploadFile = File(...), questions: str = Form(...)):
+
+def _copy_upload(src, path: str) -> int:
+    # fixed-size chunks, so memory stays flat whatever the upload size
+    written = 0
+    with open(path, "wb") as dst:
+        while chunk := src.read(UPLOAD_CHUNK_BYTES):
+            written += len(chunk)
+            if written > MAX_UPLOAD_BYTES:
+                raise UploadTooLargeError(MAX_UPLOAD_BYTES)
+            dst.write(chunk)
+    return written
+
+
+async def _save_upload(audio: UploadFile) -> Tuple[str, str]:
+    if audio.size is not None and audio.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=str(UploadTooLargeError(MAX_UPLOAD_BYTES)))
+
     tmp_dir = tempfile.mkdtemp(prefix="interview-")
-    filename = audio.filename or "answer.webm"
+    filename = os.path.basename(audio.filename or "") or "answer.webm"
     path = os.path.join(tmp_dir, filename)
 
-    with open(path, "wb") as f:
-        f.write(await audio.read())
+    try:
+        await run_in_threadpool(_copy_upload, audio.file, path)
+    except UploadTooLargeError as e:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise HTTPException(status_code=413, detail=str(e))
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    return path, tmp_dir
 
+
+def _parse_questions(questions: str) -> List[str]:
     try:
         parsed: List[str]
         data = json.loads(questions)
@@ -47,11 +117,186 @@ async def evaluate(audio: UploadFile = File(...), questions: str = Form(...)):
             parsed = [str(data)]
     except json.JSONDecodeError:
         parsed = [questions]
+    return parsed
+
+
+def _check_llm_mode(llm_mode: Optional[str]):
+    if llm_mode is not None and llm_mode not in LLM_EVALUATION_MODES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"llm_mode must be one of {list(LLM_EVALUATION_MODES)}"
+        )
 
+
+def _check_profile(profile: Optional[str]):
+    if profile is not None and profile not in EVALUATION_PROFILES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"profile must be one of {list(EVALUATION_PROFILES)}"
+        )
+
+
+def _start_profiling(
+    profiler: Optional[str],
+    response: Response,
+    modes: Tuple[str, ...] = PROFILE_MODES
+) -> Optional[Tuple[str, str]]:
+    """
+    For requests with ?profiler= or an X-Profiler header (sample, cprofile,
+    or 1 for sample; limited to modes): take a profiling slot and return
+    (mode, profile id). The id is sent back in X-Profile-Id; the caller
+    releases the slot.
+    """
     try:
-        return evaluate_interview(path, parsed)
-    finally:
+        mode = parse_profiler(profiler, modes)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if mode is None:
+        return None
+
+    try:
+        profile_id = acquire_profile_slot()
+    except ProfileRateLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except RuntimeError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+    response.headers["X-Profile-Id"] = profile_id
+    return mode, profile_id
+
+
+def _queue_full(e: QueueFullError) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+
+@router.post("/evaluate")
+async def evaluate(
+    request: Request,
+    response: Response,
+    audio: UploadFile = File(...),
+    questions: str = Form(...),
+    llm_mode: Optional[str] = Form(None),
+    profile: Optional[str] = Form(None),
+    debug: bool = Form(False),
+    profiler: Optional[str] = Query(None),
+    x_profiler: Optional[str] = Header(None)
+):
+    """
+    profile trades accuracy for latency: fast, balanced or accurate
+    (EVALUATION_PROFILE when omitted). debug adds "timings", the seconds
+    spent in each stage of this evaluation. profiler (query or X-Profiler
+    header, sample only) profiles this evaluation in its worker; download
+    the result from /profiles/{X-Profile-Id}. If the client disconnects
+    while the job is still queued, the job is cancelled.
+    """
+    _check_llm_mode(llm_mode)
+    _check_profile(profile)
+    profiling = _start_profiling(profiler or x_profiler, response, THREADED_PROFILE_MODES)
+
+    try:
+        path, tmp_dir = await _save_upload(audio)
+        parsed = _parse_questions(questions)
+
+        # The job service removes tmp_dir once the job has finished.
         try:
-            os.remove(path)
-        finally:
-            os.rmdir(tmp_dir)
+            return await run_evaluation(
+                path, tmp_dir, parsed, llm_mode=llm_mode, profile=profile, debug=debug,
+                profiler=profiling, is_disconnected=request.is_disconnected
+            )
+        except QueueFullError as e:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise _queue_full(e)
+        except JobCancelledError as e:
+            # nobody is listening any more; 499 as in nginx's access logs
+            raise HTTPException(status_code=499, detail=str(e))
+    finally:
+        if profiling is not None:
+            release_profile_slot()
+
+
+@router.post("/evaluate/stream")
+async def evaluate_stream(
+    audio: UploadFile = File(...),
+    questions: str = Form(...),
+    llm_mode: Optional[str] = Form(None),
+    profile: Optional[str] = Form(None),
+    debug: bool = Form(False)
+):
+    """
+    Same pipeline as /evaluate, streamed as NDJSON: one line per finished
+    stage (transcript, cs, tcs, placement) followed by the full result.
+    """
+    _check_llm_mode(llm_mode)
+    _check_profile(profile)
+    path, tmp_dir = await _save_upload(audio)
+    parsed = _parse_questions(questions)
+
+    try:
+        job_id = submit_evaluation(
+            path, tmp_dir, parsed, stream=True, llm_mode=llm_mode, profile=profile, debug=debug
+        )
+    except QueueFullError as e:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise _queue_full(e)
+
+    def ndjson():
+        yield json.dumps({"stage": "queued", "data": {"job_id": job_id}}) + "\n"
+        for event in iter_job_events(job_id):
+            yield json.dumps(jsonable_encoder(event)) + "\n"
+
+    # Sync generators are iterated in Starlette's threadpool.
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@router.post("/jobs", status_code=202)
+async def submit_evaluation_job(
+    audio: UploadFile = File(...),
+    questions: str = Form(...),
+    llm_mode: Optional[str] = Form(None),
+    profile: Optional[str] = Form(None),
+    debug: bool = Form(False)
+):
+    _check_llm_mode(llm_mode)
+    _check_profile(profile)
+    path, tmp_dir = await _save_upload(audio)
+    parsed = _parse_questions(questions)
+
+    try:
+        job_id = submit_evaluation(
+            path, tmp_dir, parsed, llm_mode=llm_mode, profile=profile, debug=debug
+        )
+    except QueueFullError as e:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise _queue_full(e)
+
+    return get_job_status(job_id)
+
+
+@router.get("/jobs/{job_id}")
+async def evaluation_job_status(
+    job_id: str,
+    wait: float = Query(0.0, ge=0.0, le=60.0, description="Long-poll for up to this many seconds")
+):
+    try:
+        if wait > 0:
+            return await wait_for_job(job_id, timeout=wait)
+        return get_job_status(job_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str):
+    """
+    A request profile: collapsed stacks (sample) for flamegraph.pl or
+    speedscope, or pstats (cprofile) for pstats / snakeviz.
+    """
+    path = profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    media_type = "text/plain" if path.endswith(".collapsed") else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=os.path.basename(path))
@@ -0,0 +1,158 @@
+import json
+import os
+import shutil
+import tempfile
+
+import soundfile as sf
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+
+from app.services.evaluation_profiles import get_evaluation_profile
+from app.services.job_service import QueueFullError, iter_job_events, submit_evaluation
+from app.services.live_ingest import (
+    SAMPLE_RATE,
+    LiveDurationError,
+    LiveSessionLimitError,
+    LiveTranscriptionSession,
+    acquire_live_slot,
+    release_live_slot,
+)
+from app.services.llm_evaluation_service import LLM_EVALUATION_MODES
+
+router = APIRouter(prefix="/api/interview")
+
+_DONE = object()
+
+
+def _next_event(events):
+    return next(events, _DONE)
+
+
+@router.websocket("/live")
+async def live_answer(ws: WebSocket):
+    """
+    Live ingest for one answer.
+
+    1. client sends {"format": "webm" | "pcm_f32le" | "pcm_s16le",
+       "sample_rate": 16000, "questions": [...], "llm_mode": null,
+       "profile": null}
+    2. client streams binary audio chunks while the candidate speaks; the
+       server sends {"stage": "segment", ...} as VAD segments are transcribed
+    3. client sends {"type": "end"}; the server transcribes the tail and
+       streams the same stage events as /evaluate/stream, then closes
+
+    Errors are sent as {"stage": "error", "data": {"detail": ...}} before
+    closing: 1008 for a bad config, 1007 for audio that cannot be decoded,
+    1009 past LIVE_MAX_SECONDS, 1013 (with retry_after) when LIVE_MAX_SESSIONS
+    sessions or the evaluation queue are full.
+    """
+    await ws.accept()
+
+    try:
+        acquire_live_slot()
+    except LiveSessionLimitError as e:
+        await _close_with_error(ws, 1013, str(e), retry_after=e.retry_after)
+        return
+
+    try:
+        await _live_session(ws)
+    finally:
+        release_live_slot()
+
+
+async def _close_with_error(ws: WebSocket, code: int, detail: str, **extra):
+    await ws.send_json({"stage": "error", "data": {"detail": detail, **extra}})
+    await ws.close(code=code)
+
+
+async def _live_session(ws: WebSocket):
+    try:
+        config = await ws.receive_json()
+    except WebSocketDisconnect:
+        return
+    except (ValueError, KeyError):
+        # not JSON, or a binary frame
+        await _close_with_error(ws, 1008, "The first message must be a JSON config")
+        return
+
+    try:
+        if not isinstance(config, dict):
+            raise ValueError("The config must be a JSON object")
+        questions = config.get("questions") or []
+        if not isinstance(questions, list):
+            questions = [questions]
+        questions = [str(q) for q in questions]
+
+        llm_mode = config.get("llm_mode")
+        profile = config.get("profile")
+        if llm_mode is not None and llm_mode not in LLM_EVALUATION_MODES:
+            raise ValueError(f"llm_mode must be one of {list(LLM_EVALUATION_MODES)}")
+        session = LiveTranscriptionSession(
+            config.get("format", "webm"),
+            int(config.get("sample_rate", SAMPLE_RATE)),
+            get_evaluation_profile(profile)
+        )
+    except (ValueError, TypeError) as e:
+        await _close_with_error(ws, 1008, str(e))
+        return
+
+    await ws.send_json({"stage": "ready", "data": {}})
+
+    try:
+        while True:
+            message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes") is not None:
+                for seg in await run_in_threadpool(session.feed, message["bytes"]):
+                    await ws.send_json({
+                        "stage": "segment",
+                        "data": {"start": seg["start"], "end": seg["end"], "text": seg["text"]}
+                    })
+            elif message.get("text"):
+                try:
+                    control = json.loads(message["text"])
+                except ValueError:
+                    control = None
+                if isinstance(control, dict) and control.get("type") == "end":
+                    break
+
+        audio, transcription, signals = await run_in_threadpool(session.finish)
+
+        tmp_dir = tempfile.mkdtemp(prefix="interview-")
+        path = os.path.join(tmp_dir, "answer.wav")
+        await run_in_threadpool(sf.write, path, audio, SAMPLE_RATE)
+
+        try:
+            job_id = submit_evaluation(
+                path,
+                tmp_dir,
+                questions,
+                stream=True,
+                llm_mode=llm_mode,
+                profile=profile,
+                precomputed={"transcription": transcription, "signals": signals}
+            )
+        except QueueFullError as e:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            await _close_with_error(ws, 1013, str(e), retry_after=e.retry_after)
+            return
+
+        await ws.send_json({"stage": "queued", "data": {"job_id": job_id}})
+        events = iter_job_events(job_id)
+        while True:
+            event = await run_in_threadpool(_next_event, events)
+            if event is _DONE:
+                break
+            await ws.send_json(jsonable_encoder(event))
+        await ws.close()
+
+    except WebSocketDisconnect:
+        pass
+    except LiveDurationError as e:
+        await _close_with_error(ws, 1009, str(e))
+    except ValueError as e:
+        await _close_with_error(ws, 1007, str(e))
+    finally:
+        session.close()
@@ -1,39 +1,90 @@
-import librosa, numpy as np
-import subprocess, tempfile, os
+import numpy as np
+import soundfile as sf
+import subprocess, os, threading
 import imageio_ffmpeg
 
-def load_audio_mono(path, sr=16000):
+# Containers libsndfile decodes natively; everything else (webm/opus from
+# the browser recorder, mp4, ...) is piped through ffmpeg.
+_NATIVE_MAGIC = (
+    (b"RIFF", 8, b"WAVE"),
+    (b"fLaC", None, None),
+)
+
+_READ_CHUNK = 1 << 16  # bytes per pipe read
+
+
+def sniff_container(path) -> str:
+    with open(path, "rb") as f:
+        head = f.read(12)
+
+    for magic, offset, tag in _NATIVE_MAGIC:
+        if head.startswith(magic) and (offset is None or head[offset:offset + len(tag)] == tag):
+            return "native"
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        return "webm"
+    return "other"
+
+
+def _estimate_samples(path, sr) -> int:
+    # compressed speech runs at roughly 4 KB/s (32 kbit/s opus); starting
+    # from that avoids most buffer growth without over-allocating much
+    return max(int(os.path.getsize(path) / 4000 * sr), sr)
+
+
+def decode_with_ffmpeg(path, sr=16000) -> np.ndarray:
+    """
+    Decode any ffmpeg-readable file to mono float32 PCM at `sr`, read
+    straight from ffmpeg's stdout into a growable preallocated buffer.
+    """
+    cmd = [
+        imageio_ffmpeg.get_ffmpeg_exe(), "-nostdin", "-loglevel", "error",
+        "-i", path, "-f", "f32le", "-ac", "1", "-ar", str(sr), "pipe:1",
+    ]
     try:
-        audio, orig_sr = librosa.load(path, sr=None, mono=True)
-    except Exception:
-        # Fallback: transcode (e.g., webm/opus) to wav using ffmpeg, then load.
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-            tmp_path = tmp.name
-        try:
-            ffmpeg_bin = imageio_ffmpeg.get_ffmpeg_exe()
-            proc = subprocess.run(
-                [ffmpeg_bin, "-y", "-i", path, "-ac", "1", "-ar", str(sr), tmp_path],
-                check=False,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            if proc.returncode != 0:
-                raise RuntimeError(
-                    f"ffmpeg failed to decode audio (status {proc.returncode}): {proc.stderr.decode(errors='ignore') or 'no stderr'}"
-                )
-            audio, orig_sr = librosa.load(tmp_path, sr=sr, mono=True)
-        except FileNotFoundError as e:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-            raise RuntimeError("ffmpeg not found; install ffmpeg to decode webm/opus audio") from e
-        except Exception as e:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-            raise
-        finally:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-
-    if orig_sr != sr:
-        audio = librosa.resample(y=audio, orig_sr=orig_sr, target_sr=sr)
-    return audio.astype(np.float32), sr
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except FileNotFoundError as e:
+        raise RuntimeError("ffmpeg not found; install ffmpeg to decode webm/opus audio") from e
+
+    # drained on a thread so a chatty ffmpeg cannot block on a full pipe
+    stderr_chunks = []
+    drain = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True)
+    drain.start()
+
+    buf = np.empty(_estimate_samples(path, sr), dtype=np.float32)
+    n_bytes = 0
+    with proc:
+        while True:
+            view = memoryview(buf).cast("B")
+            if n_bytes + _READ_CHUNK > len(view):
+                buf = np.resize(buf, len(buf) * 2)
+                view = memoryview(buf).cast("B")
+            read = proc.stdout.readinto(view[n_bytes:n_bytes + _READ_CHUNK])
+            if not read:
+                break
+            n_bytes += read
+        drain.join()
+
+    stderr = b"".join(stderr_chunks)
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"ffmpeg failed to decode audio (status {proc.returncode}): {stderr.decode(errors='ignore') or 'no stderr'}"
+        )
+    # a partial trailing sample can only come from a truncated stream
+    n = n_bytes // 4
+    if len(buf) > n + n // 4:
+        return buf[:n].copy()  # release the unused capacity
+    return buf[:n]
+
+
+def load_audio_mono(path, sr=16000):
+    if sniff_container(path) == "native":
+        audio, orig_sr = sf.read(path, dtype="float32", always_2d=True)
+        audio = audio.mean(axis=1)
+        if orig_sr != sr:
+            import librosa  # loads on first use; the import takes seconds
+
+            audio = librosa.resample(y=audio, orig_sr=orig_sr, target_sr=sr)
+        return audio.astype(np.float32), sr
+
+    # ffmpeg downmixes and resamples while decoding
+    return decode_with_ffmpeg(path, sr), sr
@@ -1,17 +1,175 @@
 # app/audio/pitch_analysis.py
 
+import os
+from typing import Dict, List, Optional, Tuple
+
 import numpy as np
-import librosa
+from numpy.lib.stride_tricks import sliding_window_view
+
+# "pyin": librosa.pyin from C2 to C7, the original tracker (default)
+# "yin": vectorized YIN over the speech range, tracked inside Whisper's
+#        speech segments only, so voiced_ratio is a share of speech rather
+#        than of the whole clip. Its monotone_score agreement with pyin has
+#        only been checked on synthetic clips; run benchmarks.bench_pitch
+#        --files on recorded answers before making it the default.
+PITCH_BACKEND = os.getenv("PITCH_BACKEND", "pyin")
+
+# Adult speaking f0 sits well inside this range; narrowing it shrinks the
+# lag search compared to pyin's C2-C7.
+SPEECH_FMIN = 65.0
+SPEECH_FMAX = 400.0
+
+YIN_THRESHOLD = 0.15
+YIN_HOP_SECONDS = 0.016
+YIN_BLOCK_FRAMES = 2048
+
+PYIN_FMIN_NOTE = "C2"
+PYIN_FMAX_NOTE = "C7"
+PYIN_FRAME_LENGTH = 2048
+
+
+def pitch_settings(backend: Optional[str] = None) -> tuple:
+    """Everything besides the audio a backend's output depends on (for cache keys)."""
+    backend = backend or PITCH_BACKEND
+    if backend == "pyin":
+        return ("pyin", PYIN_FMIN_NOTE, PYIN_FMAX_NOTE, PYIN_FRAME_LENGTH)
+    return (backend, SPEECH_FMIN, SPEECH_FMAX, YIN_THRESHOLD, YIN_HOP_SECONDS)
+
+
+def _pyin_track(audio: np.ndarray, sr: int) -> Tuple[np.ndarray, np.ndarray]:
+    import librosa  # loads on first use; the import takes seconds
+
+    f0, voiced_flag, _ = librosa.pyin(
+        audio,
+        fmin=librosa.note_to_hz(PYIN_FMIN_NOTE),
+        fmax=librosa.note_to_hz(PYIN_FMAX_NOTE),
+        sr=sr,
+        frame_length=PYIN_FRAME_LENGTH
+    )
+    return f0, voiced_flag
+
+
+def _yin_frames(frames: np.ndarray, sr: int, window: int, tau_min: int, tau_max: int):
+    # difference function d(tau) = e(0) + e(tau) - 2 r(tau), with the
+    # autocorrelation r computed for all frames at once through the FFT
+    frame_len = frames.shape[1]
+    n_fft = 1 << int(np.ceil(np.log2(2 * frame_len)))
+    spec = np.fft.rfft(frames, n_fft, axis=1)
+    head = np.fft.rfft(frames[:, :window], n_fft, axis=1)
+    acf = np.fft.irfft(spec * np.conj(head), n_fft, axis=1)[:, :tau_max + 1]
+
+    power = np.concatenate(
+        [np.zeros((len(frames), 1)), np.cumsum(frames ** 2, axis=1)],
+        axis=1
+    )
+    lags = np.arange(tau_max + 1)
+    energy = power[:, lags + window] - power[:, lags]
+    diff = np.maximum(energy[:, :1] + energy - 2 * acf, 0.0)
+
+    # cumulative mean normalized difference
+    cmnd = np.ones_like(diff)
+    running = np.cumsum(diff[:, 1:], axis=1)
+    cmnd[:, 1:] = diff[:, 1:] * lags[1:] / np.maximum(running, 1e-12)
+
+    search = cmnd[:, tau_min:]
+    below = search < YIN_THRESHOLD
+    voiced = below.any(axis=1)
+    tau = np.where(voiced, below.argmax(axis=1), search.argmin(axis=1)) + tau_min
+
+    # walk down to the bottom of the dip the threshold crossing landed in
+    rows = np.arange(len(frames))
+    for _ in range(tau_max - tau_min):
+        step = (tau < tau_max) & (cmnd[rows, np.minimum(tau + 1, tau_max)] < cmnd[rows, tau])
+        if not step.any():
+            break
+        tau = tau + step
+
+    # parabolic interpolation for sub-sample period
+    left = cmnd[rows, np.maximum(tau - 1, 0)]
+    mid = cmnd[rows, tau]
+    right = cmnd[rows, np.minimum(tau + 1, tau_max)]
+    denom = left - 2 * mid + right
+    shift = np.where(np.abs(denom) > 1e-12, 0.5 * (left - right) / denom, 0.0)
+    period = tau + np.clip(shift, -1, 1)
 
-def analyze_pitch_dynamics(audio: np.ndarray, sr: int):
+    rms = np.sqrt(energy[:, 0] / window)
+    return sr / period, voiced, rms
+
+
+def _yin_track(audio: np.ndarray, sr: int) -> Tuple[np.ndarray, np.ndarray]:
+    tau_min = int(sr / SPEECH_FMAX)
+    tau_max = int(np.ceil(sr / SPEECH_FMIN))
+    window = tau_max  # integration window: one period of the lowest f0
+    frame_len = window + tau_max + 1
+    hop = max(int(sr * YIN_HOP_SECONDS), 1)
+
+    if len(audio) < frame_len:
+        return np.zeros(0), np.zeros(0, dtype=bool)
+
+    # (n_frames, frame_len) strided view, no copy; processed in blocks so
+    # the FFT buffers stay small on long recordings
+    frames = sliding_window_view(audio.astype(np.float64), frame_len)[::hop]
+    parts = [
+        _yin_frames(frames[i:i + YIN_BLOCK_FRAMES], sr, window, tau_min, tau_max)
+        for i in range(0, len(frames), YIN_BLOCK_FRAMES)
+    ]
+    f0 = np.concatenate([p[0] for p in parts])
+    voiced = np.concatenate([p[1] for p in parts])
+    rms = np.concatenate([p[2] for p in parts])
+
+    # silence gate: pauses with faint noise can still look periodic
+    voiced &= rms > 0.05 * np.percentile(rms, 95)
+
+    return np.where(voiced, f0, np.nan), voiced
+
+
+_BACKENDS = {
+    "pyin": _pyin_track,
+    "yin": _yin_track,
+}
+
+
+def _speech_audio(audio: np.ndarray, sr: int, speech_regions: List[Dict]) -> List[np.ndarray]:
+    chunks = []
+    for region in speech_regions:
+        start = max(int(float(region["start"]) * sr), 0)
+        end = min(int(float(region["end"]) * sr), len(audio))
+        if end > start:
+            chunks.append(audio[start:end])
+    return chunks
+
+
+def track_pitch(
+    audio: np.ndarray,
+    sr: int,
+    speech_regions: Optional[List[Dict]] = None,
+    backend: Optional[str] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    f0 and voiced flags per frame. speech_regions ({"start", "end"} in
+    seconds, e.g. Whisper segments) restrict tracking to those spans.
+    """
+    track = _BACKENDS[backend or PITCH_BACKEND]
+
+    chunks = [audio] if not speech_regions else _speech_audio(audio, sr, speech_regions)
+    tracks = [track(chunk, sr) for chunk in chunks]
+    if not tracks:
+        return np.zeros(0), np.zeros(0, dtype=bool)
+
+    return (
+        np.concatenate([f0 for f0, _ in tracks]),
+        np.concatenate([voiced for _, voiced in tracks]).astype(bool)
+    )
+
+
+def analyze_pitch_dynamics(
+    audio: np.ndarray,
+    sr: int,
+    speech_regions: Optional[List[Dict]] = None,
+    backend: Optional[str] = None
+):
     try:
-        f0, voiced_flag, _ = librosa.pyin(
-            audio,
-            fmin=librosa.note_to_hz("C2"),
-            fmax=librosa.note_to_hz("C7"),
-            sr=sr,
-            frame_length=2048
-        )
+        f0, voiced_flag = track_pitch(audio, sr, speech_regions, backend)
 
         voiced_f0 = f0[voiced_flag]
         voiced_ratio = float(np.mean(voiced_flag)) if len(voiced_flag) else 0.0
@@ -1,37 +1,90 @@
 # app/audio/transcriber.py
 
-from typing import List, Dict
-from faster_whisper import WhisperModel
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Tuple
+import numpy as np
 from app.schemas.transcription import TranscriptionResult
 from app.utils.device import detect_device
 
-_WHISPER_MODEL = None  # cached
+SAMPLE_RATE = 16000
 
+# Model size name or a local CTranslate2 model directory.
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "medium")
+# Independent model instances; concurrent transcriptions in one process
+# each take one instead of serializing on a single model.
+WHISPER_POOL_SIZE = max(1, int(os.getenv("WHISPER_POOL_SIZE", "1")))
+# CPU cores per instance. 0 splits the machine's cores evenly across the
+# pool so instances do not oversubscribe each other.
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))
+# Batched mode decodes VAD chunks (of one or several recordings) together.
+WHISPER_BATCHED = os.getenv("WHISPER_BATCHED", "0") == "1"
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8"))
 
-def transcribe_audio(audio_path: str, model_size: str = "medium") -> TranscriptionResult:
-    global _WHISPER_MODEL
+_CHUNK_SECONDS = 30  # Whisper's input window
+_GAP_SECONDS = 1.0   # silence between recordings batched together
 
-    device = detect_device()
+_POOLS: Dict[str, "WhisperPool"] = {}  # cached per model
+_POOLS_LOCK = threading.Lock()
 
+
+def whisper_device() -> Tuple[str, str]:
+    """(device, compute_type) the Whisper models are loaded with."""
     # faster-whisper does NOT support MPS
-    whisper_device = "cuda" if device == "cuda" else "cpu"
-    compute_type = "float16" if whisper_device == "cuda" else "int8"
-
-    if _WHISPER_MODEL is None:
-        _WHISPER_MODEL = WhisperModel(
-            model_size,
-            device=whisper_device,
-            compute_type=compute_type
-        )
+    device = "cuda" if detect_device() == "cuda" else "cpu"
+    compute_type = "float16" if device == "cuda" else "int8"
+    return device, compute_type
 
-    segments_gen, info = _WHISPER_MODEL.transcribe(
-        audio_path,
-        beam_size=5,
-        word_timestamps=True,
-        vad_filter=True
-    )
 
-    segments = list(segments_gen)
+class WhisperPool:
+    """
+    A fixed set of WhisperModel instances handed out one caller at a time,
+    with the CPU cores partitioned between them.
+    """
+
+    def __init__(
+        self,
+        model_size: str,
+        size: int = WHISPER_POOL_SIZE,
+        cpu_threads: int = WHISPER_CPU_THREADS
+    ):
+        device, compute_type = whisper_device()
+
+        self.size = size
+        self.cpu_threads = cpu_threads or max((os.cpu_count() or 1) // size, 1)
+        # imported here so faster-whisper (and ctranslate2) load on first use
+        from faster_whisper import WhisperModel
+
+        self._idle: "queue.Queue[WhisperModel]" = queue.Queue()
+        for _ in range(size):
+            self._idle.put(WhisperModel(
+                model_size,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=self.cpu_threads
+            ))
+
+    @contextmanager
+    def acquire(self):
+        model = self._idle.get()
+        try:
+            yield model
+        finally:
+            self._idle.put(model)
+
+
+def get_whisper_pool(model_size: Optional[str] = None) -> WhisperPool:
+    model_size = model_size or WHISPER_MODEL_SIZE
+
+    with _POOLS_LOCK:
+        if model_size not in _POOLS:
+            _POOLS[model_size] = WhisperPool(model_size)
+        return _POOLS[model_size]
+
+
+def _to_result(segments, language: str) -> TranscriptionResult:
     text = "".join(s.text for s in segments).strip()
 
     seg_list = []
@@ -54,15 +107,112 @@ def transcribe_audio(audio_path: str, model_size: str = "medium") -> Transcripti
             "words": words
         })
 
-    duration = (
-        float(all_words[-1].end - all_words[0].start)
-        if all_words else 0.0
-    )
+    # without word timestamps the segment span is the closest estimate
+    if all_words:
+        duration = float(all_words[-1].end - all_words[0].start)
+    elif segments:
+        duration = float(segments[-1].end - segments[0].start)
+    else:
+        duration = 0.0
 
     return TranscriptionResult(
         text=text,
         segments=seg_list,
-        language=info.language,
+        language=language,
         duration=duration,
         num_segments=len(segments)
     )
+
+
+def _clips(audio: np.ndarray, offset: int) -> List[Dict]:
+    # VAD speech regions of one recording, grouped into windows of at most
+    # 30 s (Whisper's input) and shifted to its place in the batch buffer
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    clips = []
+    for speech in get_speech_timestamps(audio, VadOptions(max_speech_duration_s=_CHUNK_SECONDS)):
+        start, end = speech["start"] + offset, speech["end"] + offset
+        if clips and end - clips[-1]["start"] <= _CHUNK_SECONDS * SAMPLE_RATE:
+            clips[-1]["end"] = end
+        else:
+            clips.append({"start": start, "end": end})
+    return clips
+
+
+def transcribe_batch(
+    audios: List[np.ndarray],
+    model_size: Optional[str] = None,
+    batch_size: int = WHISPER_BATCH_SIZE,
+    beam_size: int = 5,
+    word_timestamps: bool = True
+) -> List[TranscriptionResult]:
+    """
+    Transcribe several 16 kHz recordings with one batched pass: their VAD
+    chunks are decoded together, batch_size at a time, and the segments
+    are handed back to the recording they came from.
+    """
+    gap = np.zeros(int(_GAP_SECONDS * SAMPLE_RATE), dtype=np.float32)
+    parts, clips, offsets = [], [], []
+    offset = 0
+    for audio in audios:
+        offsets.append(offset)
+        clips.extend(_clips(audio, offset))
+        parts.extend([audio, gap])
+        offset += len(audio) + len(gap)
+
+    results: List[List] = [[] for _ in audios]
+    language = ""
+    if clips:
+        from faster_whisper import BatchedInferencePipeline
+
+        with get_whisper_pool(model_size).acquire() as model:
+            segments, info = BatchedInferencePipeline(model).transcribe(
+                np.concatenate(parts),
+                clip_timestamps=[
+                    {"start": c["start"] / SAMPLE_RATE, "end": c["end"] / SAMPLE_RATE}
+                    for c in clips
+                ],
+                batch_size=batch_size,
+                beam_size=beam_size,
+                word_timestamps=word_timestamps
+            )
+            segments = list(segments)
+        language = info.language
+
+        bounds = np.array(offsets[1:]) / SAMPLE_RATE
+        for s in segments:
+            i = int(np.searchsorted(bounds, s.start, side="right"))
+            shift = offsets[i] / SAMPLE_RATE
+            s.start -= shift
+            s.end -= shift
+            for w in (s.words or []):
+                w.start -= shift
+                w.end -= shift
+            results[i].append(s)
+
+    return [_to_result(segs, language) for segs in results]
+
+
+def transcribe_audio(
+    audio: str | np.ndarray,
+    model_size: Optional[str] = None,
+    beam_size: int = 5,
+    word_timestamps: bool = True
+) -> TranscriptionResult:
+    # audio: a file path, or an already decoded float32 mono 16 kHz buffer
+    # (what load_audio_mono returns), which skips faster-whisper's own decode
+    if WHISPER_BATCHED and isinstance(audio, np.ndarray):
+        return transcribe_batch(
+            [audio], model_size, beam_size=beam_size, word_timestamps=word_timestamps
+        )[0]
+
+    with get_whisper_pool(model_size).acquire() as model:
+        segments_gen, info = model.transcribe(
+            audio,
+            beam_size=beam_size,
+            word_timestamps=word_timestamps,
+            vad_filter=True
+        )
+        segments = list(segments_gen)
+
+    return _to_result(segments, info.language)
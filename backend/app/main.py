@@ -1,9 +1,16 @@
 import os
+import threading
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.health import router as health_router
 from app.api.interview import router as interview_router
+from app.api.live import router as live_router
+from app.services.job_service import shutdown_job_pool
+from app.services.warmup import STARTUP_MODE, STARTUP_MODES, run_startup_warmup
+from app.utils.upload_limit import UploadLimitMiddleware
 
 
 def get_allowed_origins() -> list[str]:
@@ -16,8 +23,23 @@ def get_allowed_origins() -> list[str]:
     ]
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if STARTUP_MODE not in STARTUP_MODES:
+        raise RuntimeError(f"STARTUP_MODE must be one of {STARTUP_MODES}")
+    if STARTUP_MODE == "warm":
+        # on a thread so /health and /ready answer while models load
+        threading.Thread(target=run_startup_warmup, name="warmup", daemon=True).start()
+    yield
+    shutdown_job_pool()
 
+
+app = FastAPI(lifespan=lifespan)
+
+# added first so it runs inside CORS: its 413 still carries the CORS
+# headers the browser needs to read it, and oversized bodies are refused
+# before the endpoint parses them
+app.add_middleware(UploadLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=get_allowed_origins(),
@@ -26,4 +48,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.include_router(health_router)
 app.include_router(interview_router)
+app.include_router(live_router)
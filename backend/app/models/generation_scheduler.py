@@ -0,0 +1,318 @@
+# app/models/generation_scheduler.py
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import torch
+from transformers import LogitsProcessorList, StoppingCriteria, StoppingCriteriaList
+
+from app.models.json_schema_decoding import (
+    SCHEMA_DECODING_ENABLED,
+    JsonSchemaLogitsProcessor,
+)
+from app.models.json_stopping import JsonObjectStoppingCriteria, record_json_stop
+from app.models.llm_loader import (
+    compute_prefix_cache,
+    get_prefix_cache,
+    load_tcs_model,
+    merge_prefix_caches,
+    tokenize,
+    warm_prefix_caches,
+)
+from app.utils.metrics import (
+    LLM_BATCH_SIZE,
+    LLM_DECODE_SECONDS,
+    LLM_GENERATED_TOKENS,
+    LLM_PREFILL_SECONDS,
+    LLM_TOKENS_PER_SECOND,
+)
+
+GENERATION_BATCH_WINDOW_MS = float(os.getenv("GENERATION_BATCH_WINDOW_MS", "25"))
+GENERATION_MAX_BATCH = max(1, int(os.getenv("GENERATION_MAX_BATCH", "4")))
+
+_SCHEDULER = None  # cached
+_SCHEDULER_LOCK = threading.Lock()
+
+
+@dataclass
+class GenerationRequest:
+    input_ids: List[int]  # tokens after the cached prefix (all of them if none)
+    max_new_tokens: int
+    future: Future
+    prefix: Optional[str] = None
+    stop_at_json: bool = False
+    schema: Optional[dict] = None  # constrain the output to this JSON schema
+    task: str = "generate"  # metrics label, e.g. tcs / placement / questions
+
+
+class _PerRowBudget(StoppingCriteria):
+    """
+    Marks each row finished once it has produced its own max_new_tokens,
+    so a short request does not keep generating for a longer batch mate.
+    """
+
+    def __init__(self, prompt_len: int, budgets: List[int]):
+        self.prompt_len = prompt_len
+        self.budgets = torch.tensor(budgets)
+
+    def __call__(self, input_ids, scores, **kwargs):
+        generated = input_ids.shape[1] - self.prompt_len
+        return (generated >= self.budgets).to(input_ids.device)
+
+
+class _FirstTokenTimer(StoppingCriteria):
+    # first called once the prompt is prefilled and one token sampled
+    def __init__(self):
+        self.first_token_at = None
+
+    def __call__(self, input_ids, scores, **kwargs):
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        return torch.zeros(input_ids.shape[0], dtype=torch.bool, device=input_ids.device)
+
+
+class GenerationScheduler:
+    """
+    Collects prompts submitted from any thread over a short window and runs
+    them through model.generate as one left-padded greedy batch.
+
+    Prompts that start with a known constant prefix reuse that prefix's KV
+    cache, so only their variable suffix is prefilled. Rows with different
+    prefixes (or none) still share one generate call.
+
+    Batches only form when callers submit concurrently: the two LLM calls
+    of a batched evaluation (LLM_EVALUATION_MODE) and /generate-questions
+    requests served from the threadpool. A single caller runs alone.
+    """
+
+    def __init__(
+        self,
+        tokenizer,
+        model,
+        window_ms: float = GENERATION_BATCH_WINDOW_MS,
+        max_batch: int = GENERATION_MAX_BATCH,
+        prefix_cache: Optional[Callable[[str], Tuple[List[int], object]]] = None
+    ):
+        self.tokenizer = tokenizer
+        self.model = model
+        self.window = window_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+
+        if prefix_cache is None:
+            memo: Dict[str, Tuple[List[int], object]] = {}
+
+            def prefix_cache(prefix: str):
+                if prefix not in memo:
+                    memo[prefix] = compute_prefix_cache(tokenizer, model, prefix)
+                return memo[prefix]
+
+        self.prefix_cache = prefix_cache
+
+        self._queue: "queue.Queue[GenerationRequest]" = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._loop,
+            name="generation-scheduler",
+            daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self,
+        prompt: str,
+        max_new_tokens: int,
+        max_length: int,
+        prefix: Optional[str] = None,
+        stop_at_json: bool = False,
+        schema: Optional[dict] = None,
+        task: str = "generate"
+    ) -> Future:
+        input_ids, prefix = self.encode(prompt, max_length, prefix)
+
+        future: Future = Future()
+        self._queue.put(
+            GenerationRequest(
+                input_ids, max_new_tokens, future, prefix, stop_at_json, schema, task
+            )
+        )
+        return future
+
+    def encode(
+        self,
+        prompt: str,
+        max_length: int,
+        prefix: Optional[str] = None
+    ) -> Tuple[List[int], Optional[str]]:
+        """
+        Token ids to prefill after the cached prefix, and the prefix actually
+        used (None when the prompt does not start with it).
+        """
+        if prefix and prompt.startswith(prefix) and len(prompt) > len(prefix):
+            # Tokenized separately so the ids always match the cached prefix.
+            prefix_len = len(tokenize(self.tokenizer, prefix))
+            input_ids = tokenize(
+                self.tokenizer,
+                prompt[len(prefix):],
+                add_special_tokens=False,
+                truncation=True,
+                max_length=max(max_length - prefix_len, 1)
+            )
+            return input_ids, prefix
+
+        input_ids = tokenize(self.tokenizer, prompt, truncation=True, max_length=max_length)
+        return input_ids, None
+
+    def generate(
+        self,
+        prompt: str,
+        max_new_tokens: int,
+        max_length: int,
+        prefix: Optional[str] = None,
+        stop_at_json: bool = False,
+        schema: Optional[dict] = None,
+        task: str = "generate"
+    ) -> str:
+        return self.submit(
+            prompt, max_new_tokens, max_length, prefix, stop_at_json, schema, task
+        ).result()
+
+    def _collect(self) -> List[GenerationRequest]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            try:
+                outputs = self.run_batch(batch)
+            except Exception as e:
+                for req in batch:
+                    req.future.set_exception(e)
+                continue
+
+            for req, text in zip(batch, outputs):
+                req.future.set_result(text)
+
+    def run_batch(self, batch: List[GenerationRequest]) -> List[str]:
+        tokenizer, model = self.tokenizer, self.model
+        pad_id = tokenizer.pad_token_id
+        eos_id = tokenizer.eos_token_id
+
+        prefixes = [
+            self.prefix_cache(req.prefix) if req.prefix is not None else ([], None)
+            for req in batch
+        ]
+
+        p = max(len(prefix_ids) for prefix_ids, _ in prefixes)
+        prompt_len = p + max(len(req.input_ids) for req in batch)
+        input_ids = torch.full((len(batch), prompt_len), pad_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(batch), prompt_len), dtype=torch.long)
+
+        # Row layout: [pad][cached prefix][pad][suffix]. Every prefix ends at
+        # the same column so the merged cache lines up, and every suffix ends
+        # at the last column so it stays adjacent to its generated tokens.
+        for row, req in enumerate(batch):
+            prefix_ids = prefixes[row][0]
+            if prefix_ids:
+                input_ids[row, p - len(prefix_ids):p] = torch.tensor(prefix_ids)
+                attention_mask[row, p - len(prefix_ids):p] = 1
+            n = len(req.input_ids)
+            input_ids[row, prompt_len - n:] = torch.tensor(req.input_ids)
+            attention_mask[row, prompt_len - n:] = 1
+
+        past_key_values = None
+        if p:
+            past_key_values = merge_prefix_caches([kv for _, kv in prefixes], p)
+
+        budgets = [req.max_new_tokens for req in batch]
+        first_token = _FirstTokenTimer()
+        criteria = StoppingCriteriaList([_PerRowBudget(prompt_len, budgets), first_token])
+
+        json_stop = None
+        if any(req.stop_at_json for req in batch):
+            json_stop = JsonObjectStoppingCriteria(
+                tokenizer,
+                prompt_len,
+                [req.stop_at_json for req in batch]
+            )
+            criteria.append(json_stop)
+
+        processors = LogitsProcessorList()
+        if SCHEMA_DECODING_ENABLED and any(req.schema is not None for req in batch):
+            processors.append(JsonSchemaLogitsProcessor(
+                tokenizer,
+                prompt_len,
+                [req.schema for req in batch],
+                budgets
+            ))
+
+        # grad mode is thread-local, so it must be disabled on this thread too
+        start = time.perf_counter()
+        with torch.no_grad():
+            outputs = model.generate(
+                input_ids=input_ids.to(model.device),
+                attention_mask=attention_mask.to(model.device),
+                past_key_values=past_key_values,
+                max_new_tokens=max(budgets),
+                do_sample=False,
+                eos_token_id=eos_id,
+                pad_token_id=pad_id,
+                stopping_criteria=criteria,
+                logits_processor=processors
+            )
+        end = time.perf_counter()
+
+        if json_stop is not None:
+            for row, req in enumerate(batch):
+                if req.stop_at_json:
+                    record_json_stop(req.max_new_tokens, json_stop.closed_at[row])
+
+        results = []
+        for row, req in enumerate(batch):
+            generated = outputs[row, prompt_len:prompt_len + req.max_new_tokens].tolist()
+            if eos_id in generated:
+                generated = generated[:generated.index(eos_id)]
+            results.append(
+                tokenizer.decode(generated, skip_special_tokens=True).strip()
+            )
+            LLM_GENERATED_TOKENS.inc(req.task, amount=len(generated))
+            LLM_TOKENS_PER_SECOND.observe(len(generated) / max(end - start, 1e-9), req.task)
+
+        first_token_at = first_token.first_token_at or end
+        LLM_BATCH_SIZE.observe(len(batch))
+        for task in {req.task for req in batch}:
+            LLM_PREFILL_SECONDS.observe(first_token_at - start, task)
+            LLM_DECODE_SECONDS.observe(end - first_token_at, task)
+
+        return results
+
+
+def get_generation_scheduler() -> GenerationScheduler:
+    global _SCHEDULER
+
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            tokenizer, model = load_tcs_model()
+            warm_prefix_caches()
+            _SCHEDULER = GenerationScheduler(
+                tokenizer,
+                model,
+                prefix_cache=get_prefix_cache
+            )
+
+    return _SCHEDULER
@@ -0,0 +1,643 @@
+# app/models/json_schema_decoding.py
+#
+# Constrains greedy decoding to a small JSON-schema subset so the model can
+# only emit output that parses and has the expected shape:
+#
+#   {"type": "object", "properties": {...}}        keys emitted in order, all required
+#   {"type": "array", "items": {...}, "minItems": n, "maxItems": m}
+#   {"type": "string", "minLength": n, "maxLength": m}
+#   {"type": "integer", "minimum": a, "maximum": b}
+#   {"enum": ["A", "B"]}                             string enums
+#
+# The schema is frozen into nested tuples and run as a character-level
+# pushdown automaton whose states are hashable tuples, so the set of tokens
+# allowed in a state is computed once per (tokenizer, schema) and reused
+# across steps and calls.
+#
+# Given each row's max_new_tokens, the processor also keeps enough budget to
+# finish the document: once the shortest completion of the current state
+# (plus the most one free token can add to it) no longer fits in the
+# remaining tokens, only tokens along that completion are allowed. A long
+# reply is therefore closed early (short strings, minItems items) instead
+# of being cut mid-string.
+
+import functools
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import torch
+from transformers import LogitsProcessor
+
+SCHEMA_DECODING_ENABLED = os.getenv("LLM_SCHEMA_DECODING", "1") != "0"
+MAX_WHITESPACE = 12  # consecutive whitespace chars allowed between tokens
+DEFAULT_MAX_STRING = 400
+WHITESPACE = " \n\t\r"
+ESCAPES = '"\\/bfnrt'
+DONE = ()  # empty stack: the top-level value is complete
+
+_VOCAB_CACHE: Dict[int, "_VocabIndex"] = {}
+_SCHEMA_CACHE: Dict[Tuple[int, str], "CompiledJsonSchema"] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+# ---------------- automaton ----------------
+# Frozen nodes:
+#   ("object", (("key", node), ...))
+#   ("array", items_node, min_items, max_items)
+#   ("string", min_len, max_len)
+#   ("integer", minimum, maximum)
+#   ("enum", options)
+#
+# Frames (top of stack last):
+#   ("value", node, ws)                      expecting a value of schema node
+#   ("obj", node, key_index, phase, pos, ws) phase: start|before_key|key|colon|after_value
+#   ("arr", node, count, phase, ws)          phase: start|item|after_item|next
+#   ("str", min_len, max_len, length, escape)
+#   ("enum", options, prefix)
+#   ("int", minimum, maximum, text)
+
+def freeze_schema(schema: dict) -> tuple:
+    if "enum" in schema:
+        return ("enum", tuple(str(v) for v in schema["enum"]))
+
+    kind = schema.get("type")
+    if kind == "object":
+        props = schema.get("properties", {})
+        return ("object", tuple((key, freeze_schema(child)) for key, child in props.items()))
+    if kind == "array":
+        return (
+            "array",
+            freeze_schema(schema["items"]),
+            schema.get("minItems", 0),
+            schema.get("maxItems")
+        )
+    if kind == "string":
+        return ("string", schema.get("minLength", 0), schema.get("maxLength", DEFAULT_MAX_STRING))
+    if kind == "integer":
+        return ("integer", schema.get("minimum"), schema.get("maximum"))
+
+    raise ValueError(f"Unsupported schema node: {schema}")
+
+
+def _start_value(node: tuple, ch: str):
+    """Frame for a value of `node` whose first char is ch, or None."""
+    kind = node[0]
+    if kind == "enum":
+        return ("enum", node[1], "") if ch == '"' else None
+    if kind == "object" and ch == "{":
+        return ("obj", node, 0, "start", 0, 0)
+    if kind == "array" and ch == "[":
+        return ("arr", node, 0, "start", 0)
+    if kind == "string" and ch == '"':
+        return ("str", node[1], node[2], 0, False)
+    if kind == "integer":
+        minimum = node[1]
+        if ch.isdigit() or (ch == "-" and (minimum is None or minimum < 0)):
+            frame = ("int", node[1], node[2], ch)
+            return frame if _int_prefix_ok(frame) else None
+    return None
+
+
+def _int_prefix_ok(frame) -> bool:
+    _, minimum, maximum, text = frame
+    digits = text.lstrip("-")
+    if len(digits) > 1 and digits[0] == "0":
+        return False
+    if not digits:
+        return True
+    value = int(text)
+    if maximum is not None and value > maximum and not text.startswith("-"):
+        return False
+    if minimum is not None and text.startswith("-") and value < minimum:
+        return False
+    return True
+
+
+def _int_complete(frame) -> bool:
+    _, minimum, maximum, text = frame
+    if not text.lstrip("-"):
+        return False
+    value = int(text)
+    return (minimum is None or value >= minimum) and (maximum is None or value <= maximum)
+
+
+def _child_done(frame):
+    """Parent frame after its child value completed."""
+    if frame[0] == "obj":
+        _, node, i, _, _, _ = frame
+        return ("obj", node, i, "after_value", 0, 0)
+    _, node, count, _, _ = frame
+    return ("arr", node, count + 1, "after_item", 0)
+
+
+def _pop(stack: tuple) -> tuple:
+    rest = stack[:-1]
+    if not rest:
+        return DONE
+    return rest[:-1] + (_child_done(rest[-1]),)
+
+
+def step(stack: tuple, ch: str) -> Optional[tuple]:
+    """Advance the automaton by one character; None if ch is not allowed."""
+    if stack is DONE or not stack:
+        return None
+
+    top = stack[-1]
+    kind = top[0]
+    below = stack[:-1]
+
+    if kind == "value":
+        _, node, ws = top
+        if ch in WHITESPACE:
+            return below + (("value", node, ws + 1),) if ws < MAX_WHITESPACE else None
+        frame = _start_value(node, ch)
+        return below + (frame,) if frame is not None else None
+
+    if kind == "str":
+        _, min_len, max_len, length, escape = top
+        if escape:
+            if ch not in ESCAPES:
+                return None
+            return below + (("str", min_len, max_len, length + 1, False),)
+        if ch == '"':
+            return _pop(stack) if length >= min_len else None
+        if ch < " " or length >= max_len:
+            return None
+        if ch == "\\":
+            return below + (("str", min_len, max_len, length, True),)
+        return below + (("str", min_len, max_len, length + 1, False),)
+
+    if kind == "enum":
+        _, options, prefix = top
+        if ch == '"':
+            return _pop(stack) if prefix in options else None
+        prefix += ch
+        if any(opt.startswith(prefix) for opt in options):
+            return below + (("enum", options, prefix),)
+        return None
+
+    if kind == "int":
+        if ch.isdigit():
+            frame = top[:3] + (top[3] + ch,)
+            return below + (frame,) if _int_prefix_ok(frame) else None
+        if not _int_complete(top):
+            return None
+        # the number ends on a char that belongs to the parent
+        return step(_pop(stack), ch)
+
+    if kind == "obj":
+        _, node, i, phase, pos, ws = top
+        props = node[1]
+
+        if phase == "key":
+            key = props[i][0]
+            if pos == len(key):
+                return below + (("obj", node, i, "colon", 0, 0),) if ch == '"' else None
+            if ch == key[pos]:
+                return below + (("obj", node, i, "key", pos + 1, 0),)
+            return None
+
+        if ch in WHITESPACE:
+            if ws >= MAX_WHITESPACE:
+                return None
+            return below + (("obj", node, i, phase, pos, ws + 1),)
+
+        if phase in ("start", "before_key"):
+            if phase == "start" and not props:
+                return _pop(stack) if ch == "}" else None
+            if ch == '"':
+                return below + (("obj", node, i, "key", 0, 0),)
+            return None
+
+        if phase == "colon":
+            if ch != ":":
+                return None
+            child = props[i][1]
+            return below + (("obj", node, i, "value", 0, 0), ("value", child, 0))
+
+        if phase == "after_value":
+            if ch == "," and i + 1 < len(props):
+                return below + (("obj", node, i + 1, "before_key", 0, 0),)
+            if ch == "}" and i + 1 == len(props):
+                return _pop(stack)
+            return None
+
+        return None
+
+    if kind == "arr":
+        _, node, count, phase, ws = top
+        _, items, min_items, max_items = node
+
+        if ch in WHITESPACE:
+            if ws >= MAX_WHITESPACE:
+                return None
+            return below + (("arr", node, count, phase, ws + 1),)
+
+        if ch == "]" and phase in ("start", "after_item") and count >= min_items:
+            return _pop(stack)
+
+        if phase == "after_item":
+            if ch == "," and (max_items is None or count < max_items):
+                return below + (("arr", node, count, "next", 0),)
+            return None
+
+        if max_items is not None and count >= max_items:
+            return None
+
+        frame = _start_value(items, ch)
+        if frame is None:
+            return None
+        return below + (("arr", node, count, "item", 0), frame)
+
+    return None
+
+
+def consume(stack: Optional[tuple], text: str) -> Optional[tuple]:
+    for ch in text:
+        if stack is None:
+            return None
+        stack = step(stack, ch)
+    return stack
+
+
+def initial_state(schema: dict) -> tuple:
+    return (("value", freeze_schema(schema), 0),)
+
+
+# ---------------- closing ----------------
+
+FILLER = "-"  # content of strings forced to their minLength
+
+
+def _min_int(minimum, maximum) -> str:
+    value = 0
+    if minimum is not None and value < minimum:
+        value = minimum
+    if maximum is not None and value > maximum:
+        value = maximum
+    return str(value)
+
+
+def _min_value(node: tuple) -> str:
+    """Shortest text of a value of schema node."""
+    kind = node[0]
+    if kind == "enum":
+        return '"' + min(node[1], key=len) + '"'
+    if kind == "object":
+        return "{" + ",".join(f'"{key}":{_min_value(child)}' for key, child in node[1]) + "}"
+    if kind == "array":
+        return "[" + ",".join([_min_value(node[1])] * node[2]) + "]"
+    if kind == "string":
+        return '"' + FILLER * node[1] + '"'
+    return _min_int(node[1], node[2])
+
+
+def _rest_of_object(props: tuple, start: int) -> str:
+    return "".join(f',"{key}":{_min_value(child)}' for key, child in props[start:]) + "}"
+
+
+def _rest_of_array(node: tuple, count: int, first: bool) -> str:
+    _, items, min_items, _ = node
+    missing = [_min_value(items)] * max(min_items - count, 0)
+    if first:
+        return ",".join(missing) + "]"
+    return "".join("," + item for item in missing) + "]"
+
+
+def _finish(frame: tuple) -> str:
+    """Shortest text that completes frame (its open child, if any, is done)."""
+    kind = frame[0]
+
+    if kind == "value":
+        return _min_value(frame[1])
+
+    if kind == "str":
+        _, min_len, _, length, escape = frame
+        if escape:
+            return "n" + FILLER * max(min_len - length - 1, 0) + '"'
+        return FILLER * max(min_len - length, 0) + '"'
+
+    if kind == "enum":
+        _, options, prefix = frame
+        return min((o for o in options if o.startswith(prefix)), key=len)[len(prefix):] + '"'
+
+    if kind == "int":
+        if _int_complete(frame):
+            return ""  # the number ends with the parent's next char
+        text = frame[3]
+        target = _min_int(frame[1], frame[2])
+        if target.startswith(text):
+            return target[len(text):]
+        for digits in range(1, 20):
+            for value in range(10 ** (digits - 1) if digits > 1 else 0, 10 ** digits):
+                candidate = frame[:3] + (text + str(value).zfill(digits),)
+                if _int_prefix_ok(candidate) and _int_complete(candidate):
+                    return candidate[3][len(text):]
+        raise ValueError(f"Integer prefix {text!r} cannot be completed")
+
+    if kind == "obj":
+        _, node, i, phase, pos, _ = frame
+        props = node[1]
+        if phase == "start" and not props:
+            return "}"
+        if phase in ("start", "before_key"):
+            return f'"{props[i][0]}":{_min_value(props[i][1])}' + _rest_of_object(props, i + 1)
+        if phase == "key":
+            return props[i][0][pos:] + f'":{_min_value(props[i][1])}' + _rest_of_object(props, i + 1)
+        if phase == "colon":
+            return ":" + _min_value(props[i][1]) + _rest_of_object(props, i + 1)
+        return _rest_of_object(props, i + 1)  # after_value
+
+    _, node, count, phase, _ = frame
+    if phase == "next":
+        return _min_value(node[1]) + _rest_of_array(node, count + 1, False)
+    return _rest_of_array(node, count, phase == "start")  # start / after_item
+
+
+@functools.lru_cache(maxsize=8192)
+def completion(stack: tuple) -> str:
+    """Shortest text that takes the automaton from stack to DONE."""
+    if stack is DONE or not stack:
+        return ""
+    # frames below the top are waiting for their child to finish
+    return _finish(stack[-1]) + "".join(_finish(_child_done(f)) for f in reversed(stack[:-1]))
+
+
+def completion_growth(schema: dict) -> int:
+    """
+    An upper bound on how much one generated token can lengthen completion():
+    a ',' can open an array item (items the token also closes cost nothing,
+    they are already written), an escape or a sign needs one more char, and
+    an enum prefix can commit to its longest option.
+    """
+    def walk(node: tuple) -> Tuple[int, int]:
+        kind = node[0]
+        if kind == "object":
+            sizes = [walk(child) for _, child in node[1]]
+            return max((s[0] for s in sizes), default=0), max((s[1] for s in sizes), default=0)
+        if kind == "array":
+            item, enum = walk(node[1])
+            return max(item, len(_min_value(node[1])) + 1), enum
+        if kind == "enum":
+            return 0, max(map(len, node[1])) - min(map(len, node[1]))
+        return 0, 0
+
+    item, enum = walk(freeze_schema(schema))
+    # doubled for an item opened at two nesting levels by the same token
+    return 2 * item + enum + 2
+
+
+# ---------------- sizing ----------------
+
+def max_size(schema: dict) -> int:
+    """Length of the longest compact document of schema (escapes counted as one char)."""
+    if "enum" in schema:
+        return 2 + max(len(str(v)) for v in schema["enum"])
+
+    kind = schema.get("type")
+    if kind == "object":
+        props = schema.get("properties", {})
+        return 1 + sum(len(key) + 4 + max_size(child) for key, child in props.items()) - bool(props) + 1
+    if kind == "array":
+        count = schema.get("maxItems")
+        if count is None:
+            raise ValueError("Array without maxItems has no maximum size")
+        return 2 + count * (max_size(schema["items"]) + 1) - bool(count)
+    if kind == "string":
+        return 2 + schema.get("maxLength", DEFAULT_MAX_STRING)
+    if kind == "integer":
+        bounds = [schema.get("minimum"), schema.get("maximum")]
+        if None in bounds:
+            return 20
+        return max(len(str(b)) for b in bounds)
+    raise ValueError(f"Unsupported schema: {schema}")
+
+
+def _scale_schema(schema: dict, scale: float) -> dict:
+    kind = schema.get("type")
+    if kind == "object":
+        props = {key: _scale_schema(child, scale) for key, child in schema.get("properties", {}).items()}
+        return {**schema, "properties": props}
+    if kind == "array":
+        count = max(schema.get("minItems", 0), int(schema["maxItems"] * scale))
+        return {**schema, "items": _scale_schema(schema["items"], scale), "maxItems": count}
+    if kind == "string" and "enum" not in schema:
+        length = max(schema.get("minLength", 0), int(schema.get("maxLength", DEFAULT_MAX_STRING) * scale))
+        return {**schema, "maxLength": length}
+    return schema
+
+
+def fit_schema(schema: dict, max_chars: int) -> dict:
+    """
+    Copy of schema with every maxLength and maxItems scaled by the same
+    factor (never below minLength/minItems) so that max_size() fits in
+    max_chars, or the schema itself if it already does. When even the
+    minimums do not fit, the minimal schema is returned and the budget-aware
+    closing above has to cut the reply short.
+    """
+    if max_size(schema) <= max_chars:
+        return schema
+    low, high = 0.0, 1.0
+    for _ in range(20):
+        mid = (low + high) / 2
+        if max_size(_scale_schema(schema, mid)) <= max_chars:
+            low = mid
+        else:
+            high = mid
+    return _scale_schema(schema, low)
+
+
+# ---------------- token masks ----------------
+
+class _VocabIndex:
+    """Decoded text of every token plus lookups used to prune mask building."""
+
+    def __init__(self, tokenizer):
+        size = len(tokenizer)
+        special = set(tokenizer.all_special_ids)
+
+        self.size = size
+        self.texts: List[str] = []
+        self.by_first_char: Dict[str, List[int]] = {}
+        self.special_string_ids: List[int] = []  # contain '"', '\' or control chars
+
+        plain = torch.zeros(size, dtype=torch.bool)
+        lengths = torch.zeros(size, dtype=torch.long)
+
+        for token_id in range(size):
+            text = "" if token_id in special else tokenizer.decode([token_id])
+            self.texts.append(text)
+            if not text:
+                continue
+
+            lengths[token_id] = len(text)
+            self.by_first_char.setdefault(text[0], []).append(token_id)
+            if any(c == '"' or c == "\\" or c < " " for c in text):
+                self.special_string_ids.append(token_id)
+            else:
+                plain[token_id] = True
+
+        self.plain = plain
+        self.lengths = lengths
+
+
+class CompiledJsonSchema:
+    """
+    A schema bound to one tokenizer. allowed_tokens(state) returns a bool
+    mask over the vocabulary, memoised per automaton state.
+    """
+
+    def __init__(self, tokenizer, schema: dict):
+        self.schema = schema
+        self.eos_token_id = tokenizer.eos_token_id
+        self.vocab = _vocab_index(tokenizer)
+        self.growth = completion_growth(schema)
+        self._masks: Dict[tuple, torch.Tensor] = {}
+        self._lock = threading.Lock()
+
+    def initial_state(self) -> tuple:
+        return initial_state(self.schema)
+
+    def _scan(self, state: tuple, token_ids) -> torch.Tensor:
+        mask = torch.zeros(self.vocab.size, dtype=torch.bool)
+        texts = self.vocab.texts
+        for token_id in token_ids:
+            if consume(state, texts[token_id]) is not None:
+                mask[token_id] = True
+        return mask
+
+    def _structural_mask(self, state: tuple) -> torch.Tensor:
+        mask = torch.zeros(self.vocab.size, dtype=torch.bool)
+        for first, token_ids in self.vocab.by_first_char.items():
+            if step(state, first) is None:
+                continue
+            mask |= self._scan(state, token_ids)
+        return mask
+
+    def allowed_tokens(self, state: tuple) -> torch.Tensor:
+        if state is DONE:
+            mask = torch.zeros(self.vocab.size, dtype=torch.bool)
+            mask[self.eos_token_id] = True
+            return mask
+
+        top = state[-1]
+        if top[0] == "str" and not top[4]:
+            # Free text: every plain token that fits is allowed; only tokens
+            # containing quotes/escapes need simulating.
+            _, min_len, max_len, length, _ = top
+            remaining = max_len - length
+            key = (state[:-1], min(length, min_len), min_len, max_len, min(remaining, 64))
+            with self._lock:
+                special = self._masks.get(key)
+            if special is None:
+                special = self._scan(state, self.vocab.special_string_ids)
+                with self._lock:
+                    self._masks[key] = special
+            return (self.vocab.plain & (self.vocab.lengths <= remaining)) | special
+
+        with self._lock:
+            mask = self._masks.get(state)
+        if mask is None:
+            mask = self._structural_mask(state)
+            with self._lock:
+                self._masks[state] = mask
+        return mask
+
+    def closing_tokens(self, state: tuple) -> torch.Tensor:
+        """Tokens that follow the shortest completion of state."""
+        text = completion(state)
+        if not text:
+            return self.allowed_tokens(DONE)
+
+        key = ("close", text)
+        with self._lock:
+            mask = self._masks.get(key)
+        if mask is None:
+            mask = torch.zeros(self.vocab.size, dtype=torch.bool)
+            texts = self.vocab.texts
+            for token_id in self.vocab.by_first_char.get(text[0], ()):
+                if text.startswith(texts[token_id]):
+                    mask[token_id] = True
+            with self._lock:
+                self._masks[key] = mask
+        return mask
+
+
+def _vocab_index(tokenizer) -> _VocabIndex:
+    with _CACHE_LOCK:
+        index = _VOCAB_CACHE.get(id(tokenizer))
+    if index is None:
+        index = _VocabIndex(tokenizer)
+        with _CACHE_LOCK:
+            _VOCAB_CACHE[id(tokenizer)] = index
+    return index
+
+
+def compile_schema(tokenizer, schema: dict) -> CompiledJsonSchema:
+    key = (id(tokenizer), json.dumps(schema, sort_keys=True))
+    with _CACHE_LOCK:
+        compiled = _SCHEMA_CACHE.get(key)
+    if compiled is None:
+        compiled = CompiledJsonSchema(tokenizer, schema)
+        with _CACHE_LOCK:
+            _SCHEMA_CACHE[key] = compiled
+    return compiled
+
+
+class JsonSchemaLogitsProcessor(LogitsProcessor):
+    """
+    Per-row schema constraint for model.generate. Rows whose schema is None
+    are left untouched, so constrained and free prompts can share a batch.
+    budgets are the rows' max_new_tokens; a row with a budget is closed
+    along its shortest completion before the budget runs out.
+    """
+
+    def __init__(
+        self,
+        tokenizer,
+        prompt_len: int,
+        schemas: List[Optional[dict]],
+        budgets: Optional[List[Optional[int]]] = None
+    ):
+        self.prompt_len = prompt_len
+        self.compiled = [
+            compile_schema(tokenizer, schema) if schema is not None else None
+            for schema in schemas
+        ]
+        self.states = [c.initial_state() if c is not None else None for c in self.compiled]
+        self.budgets = budgets or [None] * len(schemas)
+        self._seen = prompt_len
+
+    def __call__(self, input_ids, scores):
+        cur_len = input_ids.shape[1]
+        new_tokens = input_ids[:, self._seen:cur_len].tolist()
+        self._seen = cur_len
+
+        for row, compiled in enumerate(self.compiled):
+            if compiled is None:
+                continue
+
+            state = self.states[row]
+            for token_id in new_tokens[row]:
+                if state is DONE or state is None:
+                    break
+                state = consume(state, compiled.vocab.texts[token_id])
+            self.states[row] = state = DONE if state is None else state
+
+            budget = self.budgets[row]
+            # tokens left including this one; each closing token covers at
+            # least one char of the completion
+            remaining = budget - (cur_len - self.prompt_len) if budget is not None else None
+            if remaining is not None and len(completion(state)) + compiled.growth >= remaining:
+                allowed = compiled.closing_tokens(state)
+            else:
+                allowed = compiled.allowed_tokens(state)
+            allowed = allowed.to(scores.device)
+            n = min(allowed.shape[0], scores.shape[-1])
+            row_scores = torch.full_like(scores[row], float("-inf"))
+            row_scores[:n] = torch.where(allowed[:n], scores[row, :n], row_scores[:n])
+            scores[row] = row_scores
+
+        return scores
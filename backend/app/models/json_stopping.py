@@ -0,0 +1,110 @@
+# app/models/json_stopping.py
+
+import threading
+from typing import Dict, List
+
+import torch
+from transformers import StoppingCriteria
+
+# Cumulative counters; tokens_saved is measured against each call's
+# max_new_tokens budget, i.e. the tokens generate() would otherwise allow.
+_STATS = {
+    "calls": 0,
+    "stopped_early": 0,
+    "tokens_saved": 0,
+    "last_tokens_saved": 0,
+}
+_STATS_LOCK = threading.Lock()
+
+
+def record_json_stop(max_new_tokens: int, generated: int | None):
+    saved = max(max_new_tokens - generated, 0) if generated is not None else 0
+
+    with _STATS_LOCK:
+        _STATS["calls"] += 1
+        _STATS["last_tokens_saved"] = saved
+        if generated is not None:
+            _STATS["stopped_early"] += 1
+            _STATS["tokens_saved"] += saved
+
+
+def get_json_stop_stats() -> Dict[str, int]:
+    with _STATS_LOCK:
+        return dict(_STATS)
+
+
+class JsonObjectStoppingCriteria(StoppingCriteria):
+    """
+    Stops a row as soon as the first top-level JSON object in its generated
+    text closes. Nesting, string and escape state are carried across steps,
+    so each step only inspects the newly generated token.
+    """
+
+    def __init__(self, tokenizer, prompt_len: int, active: List[bool]):
+        self.tokenizer = tokenizer
+        self.prompt_len = prompt_len
+        self.active = active
+
+        n = len(active)
+        self.depth = [0] * n
+        self.in_string = [False] * n
+        self.escape = [False] * n
+        self.done = [False] * n
+        # generated-token count at which each row's object closed
+        self.closed_at: List[int | None] = [None] * n
+
+        self._seen = prompt_len
+        self._text_cache: Dict[int, str] = {}
+
+    def _token_text(self, token_id: int) -> str:
+        text = self._text_cache.get(token_id)
+        if text is None:
+            text = self.tokenizer.decode([token_id], skip_special_tokens=True)
+            self._text_cache[token_id] = text
+        return text
+
+    def _feed(self, row: int, text: str) -> bool:
+        depth = self.depth[row]
+        in_string = self.in_string[row]
+        escape = self.escape[row]
+        closed = False
+
+        for ch in text:
+            if in_string:
+                if escape:
+                    escape = False
+                elif ch == "\\":
+                    escape = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                # quotes before the object starts are prose, not JSON
+                in_string = depth > 0
+            elif ch == "{":
+                depth += 1
+            elif ch == "}" and depth > 0:
+                depth -= 1
+                if depth == 0:
+                    closed = True
+                    break
+
+        self.depth[row] = depth
+        self.in_string[row] = in_string
+        self.escape[row] = escape
+        return closed
+
+    def __call__(self, input_ids, scores, **kwargs):
+        cur_len = input_ids.shape[1]
+        new_tokens = input_ids[:, self._seen:cur_len].tolist()
+        self._seen = cur_len
+
+        for row, tokens in enumerate(new_tokens):
+            if not self.active[row] or self.done[row]:
+                continue
+            for token_id in tokens:
+                if self._feed(row, self._token_text(token_id)):
+                    self.done[row] = True
+                    self.closed_at[row] = cur_len - self.prompt_len
+                    break
+
+        return torch.tensor(self.done, dtype=torch.bool, device=input_ids.device)
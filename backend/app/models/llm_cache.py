@@ -0,0 +1,151 @@
+# app/models/llm_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from app.utils.device import detect_device
+from app.utils.metrics import CACHE_LOOKUPS
+from app.utils.private_dir import default_private_dir, ensure_private_dir
+
+# Generation is greedy, so a reply is a pure function of the model, the
+# prompt and the generation parameters. Replies are kept in SQLite (shared
+# by the API process and the evaluation workers) so repeats of the same
+# request, e.g. regression runs, replays and retries, skip generation.
+# Prompts and replies contain transcripts and evaluations: the database
+# lives in a per-user directory (0o700, refused if someone else owns it)
+# and is itself 0o600. Callers store a reply only once they accepted it.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "1") == "1"
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH", os.path.join(default_private_dir("interview-llm-cache"), "replies.sqlite3")
+)
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+# Bump when prompt post-processing or decoding changes what a key produces.
+LLM_CACHE_VERSION = "2"
+
+_EVICT_EVERY = 50  # stores between eviction passes
+
+_local = threading.local()  # one connection per thread
+_STATS = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+_STATS_LOCK = threading.Lock()
+_stores_since_evict = 0
+
+
+def _connect() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != LLM_CACHE_PATH:
+        ensure_private_dir(os.path.dirname(os.path.abspath(LLM_CACHE_PATH)), "LLM_CACHE_PATH")
+        # created 0o600 before SQLite opens it; the -wal/-shm files copy its mode
+        os.close(os.open(LLM_CACHE_PATH, os.O_RDWR | os.O_CREAT, 0o600))
+        os.chmod(LLM_CACHE_PATH, 0o600)
+        conn = sqlite3.connect(LLM_CACHE_PATH, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        _local.conn, _local.path = conn, LLM_CACHE_PATH
+    return conn
+
+
+def _count(field: str, n: int = 1):
+    with _STATS_LOCK:
+        _STATS[field] += n
+
+
+def llm_cache_key(prompt: str, **params) -> str:
+    from app.models.json_schema_decoding import SCHEMA_DECODING_ENABLED
+    from app.models.llm_loader import LLM_CPU_PRECISION, TCS_MODEL_NAME
+
+    device = detect_device()
+    model = {
+        "name": TCS_MODEL_NAME,
+        "device": device,
+        "precision": LLM_CPU_PRECISION if device == "cpu" else "float16",
+    }
+    raw = json.dumps(
+        {
+            "version": LLM_CACHE_VERSION,
+            "model": model,
+            "prompt": prompt,
+            # unconstrained decoding can give a different reply for a schema
+            "schema_decoding": SCHEMA_DECODING_ENABLED,
+            "params": params,
+        },
+        sort_keys=True
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def get_cached_response(key: str) -> Optional[str]:
+    try:
+        conn = _connect()
+        row = conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+    except (sqlite3.Error, OSError, RuntimeError):
+        row = None  # a broken, locked or unusable cache only costs a regeneration
+
+    _count("misses" if row is None else "hits")
+    CACHE_LOOKUPS.inc("llm", "miss" if row is None else "hit")
+    return None if row is None else row[0]
+
+
+def store_response(key: str, response: str):
+    global _stores_since_evict
+
+    now = time.time()
+    try:
+        conn = _connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, response, created_at, last_used) VALUES (?, ?, ?, ?)",
+            (key, response, now, now)
+        )
+    except (sqlite3.Error, OSError, RuntimeError):
+        return
+    _count("stores")
+
+    with _STATS_LOCK:
+        _stores_since_evict += 1
+        if _stores_since_evict < _EVICT_EVERY:
+            return
+        _stores_since_evict = 0
+    _evict(conn)
+
+
+def _evict(conn: sqlite3.Connection):
+    # least recently used first
+    try:
+        deleted = conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (LLM_CACHE_MAX_ENTRIES,)
+        ).rowcount
+    except sqlite3.Error:
+        return
+    _count("evictions", max(deleted, 0))
+
+
+def get_llm_cache_stats() -> Dict[str, int]:
+    with _STATS_LOCK:
+        stats = dict(_STATS)
+    try:
+        stats["entries"] = _connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    except (sqlite3.Error, OSError, RuntimeError):
+        stats["entries"] = 0
+    return stats
+
+
+def clear_llm_cache():
+    _connect().execute("DELETE FROM responses")
+    with _STATS_LOCK:
+        for field in _STATS:
+            _STATS[field] = 0
@@ -1,16 +1,47 @@
 # app/models/llm_loader.py
 
 import os
+import threading
+from typing import Dict, List, Tuple
+
 import torch
-from transformers import AutoTokenizer, AutoModelForCausalLM
+import torch.nn.functional as F
+from transformers import AutoTokenizer, AutoModelForCausalLM, DynamicCache
 from app.utils.device import detect_device
+from app.prompts.tcs_prompt import TCS_PROMPT_PREFIX
+from app.prompts.placement_prompt import PLACEMENT_PROMPT_PREFIX
+from app.prompts.evaluation_prompt import FUSED_PROMPT_PREFIX
 from app.config import HF_TOKEN
 
 TCS_MODEL_NAME = "meta-llama/Llama-3.2-3B-Instruct"
 
+# Weight precision used when running on CPU. bfloat16 halves the weight
+# memory; int8 dynamically quantizes the decoder's Linear layers (weights
+# stored as int8, activations quantized per call). Check accuracy with
+# benchmarks.check_precision_accuracy before switching a deployment.
+CPU_PRECISIONS = ("float32", "bfloat16", "int8")
+LLM_CPU_PRECISION = os.getenv("LLM_CPU_PRECISION", "float32")
+
 _tokenizer = None
 _model = None
 
+# Per-layer (key, value) tensors, each shaped (batch, kv_heads, seq, head_dim)
+KVTensors = List[Tuple[torch.Tensor, torch.Tensor]]
+
+# prompt prefix -> (prefix token ids, KV tensors after prefilling it)
+_prefix_caches: Dict[str, Tuple[List[int], KVTensors]] = {}
+_prefix_lock = threading.Lock()
+
+# A fast tokenizer keeps its truncation setting on the shared Rust object
+# and every call rewrites it, so concurrent calls with different
+# max_length truncate each other's input. All encodes go through tokenize.
+_tokenizer_lock = threading.Lock()
+
+
+def tokenize(tokenizer, text: str, **kwargs) -> List[int]:
+    with _tokenizer_lock:
+        return tokenizer(text, **kwargs)["input_ids"]
+
 
 def load_tcs_model():
     global _tokenizer, _model
@@ -22,32 +53,151 @@ def load_tcs_model():
     if not hf_token:
         raise RuntimeError("HF_TOKEN environment variable not set")
 
+    _tokenizer, _model = build_tcs_model(hf_token)
+    torch.set_grad_enabled(False)
+
+    return _tokenizer, _model
+
+
+def build_tcs_model(hf_token: str, precision: str | None = None):
+    """
+    Load a fresh (uncached) tokenizer and model. precision only applies on
+    CPU and defaults to LLM_CPU_PRECISION; CUDA always uses float16.
+    """
+    precision = precision or LLM_CPU_PRECISION
+    # before the download / load, which takes minutes for the full model
+    _check_cpu_precision(precision)
     device = detect_device()
 
-    _tokenizer = AutoTokenizer.from_pretrained(
+    tokenizer = AutoTokenizer.from_pretrained(
         TCS_MODEL_NAME,
         use_fast=True,
         token=hf_token
     )
 
-    if _tokenizer.pad_token is None:
-        _tokenizer.pad_token = _tokenizer.eos_token
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
 
     if device == "cuda":
         dtype = torch.float16
         device_map = "auto"
     else:
-        dtype = torch.float32
+        # int8 quantizes from float32 weights
+        dtype = torch.bfloat16 if precision == "bfloat16" else torch.float32
         device_map = None
 
-    _model = AutoModelForCausalLM.from_pretrained(
+    model = AutoModelForCausalLM.from_pretrained(
         TCS_MODEL_NAME,
         torch_dtype=dtype,
         device_map=device_map,
         token=hf_token
     )
 
-    _model.eval()
-    torch.set_grad_enabled(False)
+    if device != "cuda":
+        model = apply_cpu_precision(model, precision)
 
-    return _tokenizer, _model
+    model.eval()
+    return tokenizer, model
+
+
+def _check_cpu_precision(precision: str):
+    if precision not in CPU_PRECISIONS:
+        raise RuntimeError(
+            f"Unknown LLM_CPU_PRECISION '{precision}'. Expected one of {CPU_PRECISIONS}"
+        )
+
+
+def apply_cpu_precision(model, precision: str):
+    _check_cpu_precision(precision)
+
+    if precision == "bfloat16":
+        return model.to(torch.bfloat16)
+
+    if precision == "int8":
+        try:
+            from torch.ao.quantization import quantize_dynamic
+        except ImportError:
+            raise RuntimeError("int8 CPU inference requires torch.ao.quantization")
+
+        # Only the decoder layers: the LM head shares its weight with the
+        # input embedding and dominates the score distribution.
+        quantize_dynamic(
+            model.model,
+            {torch.nn.Linear},
+            dtype=torch.qint8,
+            inplace=True
+        )
+
+    return model
+
+
+def _cache_to_tensors(cache) -> KVTensors:
+    if hasattr(cache, "layers"):
+        return [(layer.keys, layer.values) for layer in cache.layers]
+    return [tuple(kv[:2]) for kv in cache.to_legacy_cache()]
+
+
+def _tensors_to_cache(layers: KVTensors):
+    if hasattr(DynamicCache, "from_legacy_cache"):
+        return DynamicCache.from_legacy_cache(tuple(layers))
+    return DynamicCache(layers)
+
+
+def merge_prefix_caches(prefixes: List[KVTensors | None], length: int):
+    """
+    Stack per-row prefix caches into one batched past_key_values of `length`
+    positions. Shorter (or missing) prefixes are left-padded with zeros; the
+    caller masks those positions out through the attention mask.
+    """
+    template = next(kv for kv in prefixes if kv is not None)
+    layers = []
+
+    for layer_idx, (key, value) in enumerate(template):
+        keys, values = [], []
+        for kv in prefixes:
+            if kv is None:
+                shape = key.shape[:2] + (length,) + key.shape[3:]
+                keys.append(key.new_zeros(shape))
+                values.append(value.new_zeros(shape))
+                continue
+            k, v = kv[layer_idx]
+            pad = (0, 0, length - k.shape[2], 0)
+            keys.append(F.pad(k, pad))
+            values.append(F.pad(v, pad))
+        layers.append((torch.cat(keys), torch.cat(values)))
+
+    return _tensors_to_cache(layers)
+
+
+def compute_prefix_cache(tokenizer, model, prefix: str) -> Tuple[List[int], KVTensors]:
+    """
+    Prefill a constant prompt prefix once and return its token ids together
+    with the resulting per-layer key/value tensors.
+    """
+    prefix_ids = tokenize(tokenizer, prefix)
+
+    with torch.no_grad():
+        out = model(
+            input_ids=torch.tensor([prefix_ids], device=model.device),
+            use_cache=True
+        )
+
+    return prefix_ids, _cache_to_tensors(out.past_key_values)
+
+
+def get_prefix_cache(prefix: str) -> Tuple[List[int], KVTensors]:
+    """
+    Cached KV tensors for a prompt prefix of the loaded model. They are
+    never mutated: merge_prefix_caches always builds a fresh cache.
+    """
+    tokenizer, model = load_tcs_model()
+
+    with _prefix_lock:
+        if prefix not in _prefix_caches:
+            _prefix_caches[prefix] = compute_prefix_cache(tokenizer, model, prefix)
+        return _prefix_caches[prefix]
+
+
+def warm_prefix_caches():
+    for prefix in (TCS_PROMPT_PREFIX, PLACEMENT_PROMPT_PREFIX, FUSED_PROMPT_PREFIX):
+        get_prefix_cache(prefix)
@@ -1,39 +1,65 @@
 # app/models/llm_runner.py
 
-import torch
-from app.models.llm_loader import load_tcs_model
+from typing import Any, Callable, Optional
+from app.models import llm_cache
 from app.models.llm_utils import extract_valid_json_objects
+from app.utils.metrics import timed_stage
 
 
-def run_llm(prompt: str, max_new_tokens: int = 1600) -> dict:
-    tokenizer, model = load_tcs_model()
+def run_llm(
+    prompt: str,
+    max_new_tokens: int = 1600,
+    prefix: Optional[str] = None,
+    schema: Optional[dict] = None,
+    use_cache: Optional[bool] = None,
+    task: str = "llm",
+    validate: Optional[Callable[[dict], Any]] = None
+) -> dict:
+    # prefix: constant leading part of prompt whose KV cache can be reused
+    # schema: JSON schema the output is constrained to while decoding
+    # use_cache: False bypasses the response cache (default: LLM_CACHE)
+    # task: metrics label for the generation (tcs, placement, fused)
+    # validate: raises if the caller cannot use the reply; such replies are
+    #           not cached, so a retry generates again
+    if use_cache is None:
+        use_cache = llm_cache.LLM_CACHE_ENABLED
 
-    inputs = tokenizer(
-        prompt,
-        return_tensors="pt",
-        truncation=True,
-        max_length=2536
-    )
+    key = None
+    decoded = None
+    if use_cache:
+        # prefix only changes how the prompt is prefilled, not the reply
+        key = llm_cache.llm_cache_key(
+            prompt, runner="run_llm", max_new_tokens=max_new_tokens,
+            max_length=2536, stop_at_json=True, schema=schema
+        )
+        decoded = llm_cache.get_cached_response(key)
 
-    inputs = {k: v.to(model.device) for k, v in inputs.items()}
+    if decoded is None:
+        # imported here so torch / transformers load on first generation
+        from app.models.generation_scheduler import get_generation_scheduler
 
-    with torch.no_grad():
-        outputs = model.generate(
-            **inputs,
+        decoded = get_generation_scheduler().generate(
+            prompt,
             max_new_tokens=max_new_tokens,
-            do_sample=False,
-            eos_token_id=tokenizer.eos_token_id,
-            pad_token_id=tokenizer.pad_token_id
+            max_length=2536,
+            prefix=prefix,
+            stop_at_json=True,
+            schema=schema,
+            task=task
         )
+    else:
+        key = None  # already stored
 
-    decoded = tokenizer.decode(
-        outputs[0][inputs["input_ids"].shape[1]:],
-        skip_special_tokens=True
-    ).strip()
-
-    parsed_objects = extract_valid_json_objects(decoded)
+    with timed_stage("parse"):
+        parsed_objects = extract_valid_json_objects(decoded)
     if parsed_objects:
-        return parsed_objects[-1]
+        result = parsed_objects[-1]
+        if validate is not None:
+            validate(result)
+        # only replies the caller accepted are kept
+        if key is not None:
+            llm_cache.store_response(key, decoded)
+        return result
 
     raise RuntimeError(
         "LLM output could not be parsed into valid JSON.\n"
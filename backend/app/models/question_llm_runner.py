@@ -2,9 +2,8 @@
 
 import json
 import re
-import torch
-from typing import Dict
-from app.models.llm_loader import load_tcs_model
+from typing import Any, Callable, Dict, Optional
+from app.models import llm_cache
 
 
 def _fix_and_load(block: str) -> Dict:
@@ -22,33 +21,7 @@ def _fix_and_load(block: str) -> Dict:
     return json.loads(cleaned)
 
 
-def run_llm_question(prompt: str, max_new_tokens: int = 512) -> Dict:
-    tokenizer, model = load_tcs_model()
-
-    inputs = tokenizer(
-        prompt,
-        return_tensors="pt",
-        truncation=True,
-        max_length=1024
-    )
-
-    inputs = {k: v.to(model.device) for k, v in inputs.items()}
-
-    with torch.no_grad():
-        outputs = model.generate(
-            **inputs,
-            max_new_tokens=max_new_tokens,
-            do_sample=False,
-            eos_token_id=tokenizer.eos_token_id,
-            pad_token_id=tokenizer.pad_token_id
-        )
-
-    input_len = inputs["input_ids"].shape[1]
-    decoded = tokenizer.decode(
-        outputs[0][input_len:],
-        skip_special_tokens=True
-    ).strip()
-
+def _parse_question_output(decoded: str) -> Optional[Dict]:
     json_blocks = re.findall(r"\{[\s\S]*?\}", decoded)
     for block in reversed(json_blocks):
         try:
@@ -65,6 +38,54 @@ def run_llm_question(prompt: str, max_new_tokens: int = 512) -> Dict:
         except Exception:
             pass
 
+    return None
+
+
+def run_llm_question(
+    prompt: str,
+    max_new_tokens: int = 512,
+    schema: Optional[dict] = None,
+    use_cache: Optional[bool] = None,
+    validate: Optional[Callable[[Dict], Any]] = None
+) -> Dict:
+    # use_cache: False bypasses the response cache (default: LLM_CACHE)
+    # validate: raises if the caller cannot use the reply; such replies are
+    #           not cached
+    if use_cache is None:
+        use_cache = llm_cache.LLM_CACHE_ENABLED
+
+    key = None
+    decoded = None
+    if use_cache:
+        key = llm_cache.llm_cache_key(
+            prompt, runner="run_llm_question", max_new_tokens=max_new_tokens,
+            max_length=1024, stop_at_json=True, schema=schema
+        )
+        decoded = llm_cache.get_cached_response(key)
+
+    if decoded is None:
+        # imported here so torch / transformers load on first generation
+        from app.models.generation_scheduler import get_generation_scheduler
+
+        decoded = get_generation_scheduler().generate(
+            prompt,
+            max_new_tokens=max_new_tokens,
+            max_length=1024,
+            stop_at_json=True,
+            schema=schema,
+            task="questions"
+        )
+    else:
+        key = None  # already stored
+
+    parsed = _parse_question_output(decoded)
+    if parsed is not None:
+        if validate is not None:
+            validate(parsed)
+        if key is not None:
+            llm_cache.store_response(key, decoded)
+        return parsed
+
     raise RuntimeError(
         "Question LLM returned invalid JSON.\nRaw output:\n" + decoded
     )
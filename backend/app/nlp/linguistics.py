@@ -1,12 +1,30 @@
 # app/nlp/linguistics.py
 
+import threading
+
 nlp = None
 NLP_MODE = "regex"
 
-try:
-    import spacy
-    nlp = spacy.load("en_core_web_sm")
-    NLP_MODE = "spacy"
-except Exception:
-    nlp = None
-    NLP_MODE = "regex"
+_LOADED = False
+_LOCK = threading.Lock()
+
+
+def get_nlp():
+    """
+    The spaCy pipeline, loaded on first use (spaCy pulls in thinc and
+    torch); None, with NLP_MODE "regex", when the model is unavailable.
+    """
+    global nlp, NLP_MODE, _LOADED
+
+    with _LOCK:
+        if not _LOADED:
+            try:
+                import spacy
+                # signals only read POS, lemmas and dependency arcs
+                nlp = spacy.load("en_core_web_sm", exclude=["ner"])
+                NLP_MODE = "spacy"
+            except Exception:
+                nlp = None
+                NLP_MODE = "regex"
+            _LOADED = True
+    return nlp
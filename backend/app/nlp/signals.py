@@ -1,7 +1,8 @@
 # app/nlp/signals.py
 
+import re
 from typing import List, Dict
-from app.nlp.linguistics import nlp
+from app.nlp.linguistics import get_nlp
 
 FILLERS_SIMPLE = {"um", "uh", "umm", "uhh"}
 MULTI_FILLERS = ["you know", "i mean"]
@@ -15,17 +16,89 @@ HEDGE_PHRASES = [
 OWNERSHIP_VERBS = {"build", "design", "lead", "implement", "create", "manage", "solve", "drive"}
 APOLOGIES = ["sorry", "apologize", "i forgot", "i didn't prepare", "excuse me"]
 
+UNCERTAINTY_PATTERNS = [
+    "or maybe",
+    "not sure if",
+    "i think it was",
+    "can't remember"
+]
+
+
+class PhraseCounter:
+    """
+    Counts every phrase of several lists in one scan of the text, with the
+    same result as a text.count(phrase) per phrase (non-overlapping
+    occurrences of each phrase, counted independently of the others).
+
+    One compiled alternation finds each position where any phrase starts;
+    only the phrases sharing that first character are checked there.
+    """
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        self.groups = {name: list(phrases) for name, phrases in groups.items()}
+        phrases = sorted({p for ps in self.groups.values() for p in ps}, key=len, reverse=True)
+        self._starts = re.compile("(?=" + "|".join(re.escape(p) for p in phrases) + ")")
+        self._by_first: Dict[str, List[str]] = {}
+        for p in phrases:
+            self._by_first.setdefault(p[0], []).append(p)
+
+    def count(self, text: str) -> Dict[str, int]:
+        counts = {p: 0 for ps in self._by_first.values() for p in ps}
+        next_free = dict(counts)
+        for m in self._starts.finditer(text):
+            i = m.start()
+            for p in self._by_first[text[i]]:
+                if i >= next_free[p] and text.startswith(p, i):
+                    counts[p] += 1
+                    next_free[p] = i + len(p)
+
+        return {
+            name: sum(counts[p] for p in phrases)
+            for name, phrases in self.groups.items()
+        }
+
+
+_PHRASES = PhraseCounter({
+    "fillers": MULTI_FILLERS,
+    "fillers_simple": sorted(FILLERS_SIMPLE),
+    "hedges": HEDGE_PHRASES + UNCERTAINTY_PATTERNS,
+    "apologies": APOLOGIES,
+})
+
+
+def _first_person_subtrees(doc) -> List[bool]:
+    """
+    For every token, whether its dependency subtree contains "i". Each
+    "i" marks its ancestors up to the first already-marked one, so every
+    arc is followed at most once.
+    """
+    heads = [token.head.i for token in doc]
+    has_i = [False] * len(doc)
+    for token in doc:
+        if token.lower_ != "i":
+            continue
+        i = token.i
+        while not has_i[i]:
+            has_i[i] = True
+            if heads[i] == i:
+                break
+            i = heads[i]
+    return has_i
+
 
 def detect_signals(transcript: str, segments: List[Dict]) -> Dict:
     text_lower = transcript.lower()
+    phrases = _PHRASES.count(text_lower)
 
     filler_count = hedge_count = own_count = passive_count = apology_count = 0
 
+    nlp = get_nlp()
     if nlp:
         doc = nlp(transcript)
+        has_i = _first_person_subtrees(doc)
 
         for token in doc:
-            t = token.text.lower()
+            t = token.lower_
 
             if t in FILLERS_SIMPLE:
                 filler_count += 1
@@ -36,29 +109,23 @@ def detect_signals(transcript: str, segments: List[Dict]) -> Dict:
             if t in HEDGE_KEYWORDS:
                 hedge_count += 1
 
-            if t == "think" and token.head.text.lower() == "i":
+            if t == "think" and token.head.lower_ == "i":
                 hedge_count += 1
 
-            if token.lemma_ in OWNERSHIP_VERBS:
-                if any(tok.text.lower() == "i" for tok in token.subtree):
-                    own_count += 1
-
-            if token.dep_ == "auxpass":
-                if not any(tok.text.lower() == "i" for tok in token.head.subtree):
-                    passive_count += 1
+            # "I" in the verb's subtree: the speaker owns the action
+            if token.lemma_ in OWNERSHIP_VERBS and has_i[token.i]:
+                own_count += 1
 
-        for f in MULTI_FILLERS:
-            filler_count += text_lower.count(f)
+            if token.dep_ == "auxpass" and not has_i[token.head.i]:
+                passive_count += 1
 
-        for h in HEDGE_PHRASES:
-            hedge_count += text_lower.count(h)
+        filler_count += phrases["fillers"]
 
     else:
-        filler_count += sum(text_lower.count(f) for f in FILLERS_SIMPLE)
-        filler_count += sum(text_lower.count(f) for f in MULTI_FILLERS)
-        hedge_count += sum(text_lower.count(h) for h in HEDGE_PHRASES)
+        filler_count += phrases["fillers_simple"] + phrases["fillers"]
 
-    apology_count = sum(text_lower.count(a) for a in APOLOGIES)
+    hedge_count += phrases["hedges"]
+    apology_count = phrases["apologies"]
 
     long_pauses = 0
     long_speech_blocks = 0
@@ -75,14 +142,6 @@ def detect_signals(transcript: str, segments: List[Dict]) -> Dict:
         if (seg["end"] - seg["start"]) > 10.0:
             long_speech_blocks += 1
 
-    uncertainty_patterns = [
-        "or maybe",
-        "not sure if",
-        "i think it was",
-        "can't remember"
-    ]
-    hedge_count += sum(text_lower.count(p) for p in uncertainty_patterns)
-
     return {
         "filler_count": filler_count,
         "hedge_count": hedge_count,
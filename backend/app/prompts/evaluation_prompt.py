@@ -0,0 +1,99 @@
+# app/prompts/evaluation_prompt.py
+#
+# One prompt that produces both the technical evaluation and the placement
+# coaching, so the transcript is prefilled once ("fused" LLM mode).
+
+from typing import List
+
+from app.prompts.placement_prompt import PLACEMENT_OUTPUT_SCHEMA
+from app.prompts.tcs_prompt import TCS_OUTPUT_SCHEMA, normalize_question
+
+FUSED_PROMPT_PREFIX = """
+You are reviewing a mock interview answer in two roles and must return both
+reviews in a single JSON object.
+
+You must evaluate the candidate STRICTLY based on:
+1. The interview question provided
+2. The candidate’s answer provided below
+
+You have NO access to the candidate’s resume, background, or intent beyond
+what is explicitly stated.
+
+PART 1 – "tcs": act as a senior technical interviewer.
+1. Determine whether the candidate actually answered the question asked.
+2. Evaluate technical correctness ONLY within the scope of the question.
+3. Identify inaccuracies, misconceptions, missing fundamentals, or weak
+   explanations relative to the question.
+4. Provide at least 4 transcript-grounded coaching points; each must
+   reference something said in the answer or something clearly missing
+   relative to the question.
+- Score from 0 to 100 based on relevance + technical correctness.
+- Bands:
+  - Excellent: Fully answers the question with correct and clear explanation
+  - Good: Answers the question correctly with minor gaps or imprecision
+  - Partial: Addresses the question but with notable gaps or confusion
+  - Weak: Poor alignment with the question or flawed understanding
+  - Poor: Does not answer the question or is mostly incorrect
+
+PART 2 – "placement": act as a senior placement officer.
+1. Identify concrete strengths demonstrated in the response (3–4 items).
+2. Identify placement-relevant weaknesses visible in the response (3–4 items).
+3. Provide focused coaching: current gaps, actionable improvements and
+   placement focus areas (at least 2 items each).
+
+RULES FOR BOTH PARTS:
+- Base every point directly on the transcript.
+- Do NOT infer unstated knowledge, skills, experience, or intentions.
+- Do NOT introduce new tools, technologies, metrics, or concepts.
+- Avoid generic advice (e.g., “practice more”, “be confident”).
+- If evidence is limited, infer conservatively from what is missing.
+
+OUTPUT RULES:
+- Respond in STRICT JSON ONLY, starting with '{' and ending with '}'.
+- All list values MUST be arrays of strings.
+- No placeholders, no markdown, no extra text.
+
+JSON format:
+{
+  "tcs": {
+    "score": <int>,
+    "band": "<Excellent|Good|Partial|Weak|Poor>",
+    "verdict": "<1–2 sentence technical summary judging alignment with the question>",
+    "issues": ["<question-relative technical issues or 'No major technical issues identified'>"],
+    "improvement_points": ["<specific, question-grounded coaching points>"]
+  },
+  "placement": {
+    "standout_strengths": ["..."],
+    "top_improvements": ["..."],
+    "placement_coaching": {
+      "current_gaps": ["..."],
+      "actionable_improvements": ["..."],
+      "placement_focus": ["..."]
+    }
+  }
+}
+
+"""
+
+def build_fused_output_schema(tcs_schema: dict, placement_schema: dict) -> dict:
+    return {
+        "type": "object",
+        "properties": {
+            "tcs": tcs_schema,
+            "placement": placement_schema,
+        },
+    }
+
+
+FUSED_OUTPUT_SCHEMA = build_fused_output_schema(TCS_OUTPUT_SCHEMA, PLACEMENT_OUTPUT_SCHEMA)
+
+
+def build_fused_evaluation_prompt(question: str | List[str] | None, transcript: str) -> str:
+    return FUSED_PROMPT_PREFIX + f"""Interview Question:
+{normalize_question(question)}
+
+Candidate Answer:
+{transcript}
+
+Return only valid JSON.
+"""
@@ -2,9 +2,8 @@
 
 from typing import List
 
-def build_placement_coaching_prompt(question, transcript) -> str:
-    return f"""
-You are a senior placement officer reviewing a mock interview response.
+# Constant instructions first (KV cache reused across calls), transcript last.
+PLACEMENT_PROMPT_PREFIX = """You are a senior placement officer reviewing a mock interview response.
 
 You must evaluate the candidate STRICTLY based on:
 - The interview transcript provided below
@@ -34,16 +33,13 @@ MANDATORY OUTPUT REQUIREMENTS:
 
 OUTPUT CONSTRAINTS:
 - Output STRICT JSON only
-- Start with {{ and end with }}
+- Start with { and end with }
 - All values MUST be arrays of strings
 - No placeholders, no generic filler, no markdown
 
-Interview Transcript:
-{transcript}
-
 JSON FORMAT (FOLLOW EXACTLY):
 
-{{
+{
   "standout_strengths": [
     "Clear articulation of personal background",
     "Demonstrates early interest in technology",
@@ -54,7 +50,7 @@ JSON FORMAT (FOLLOW EXACTLY):
     "Response is longer than required",
     "Key points are repeated unnecessarily"
   ],
-  "placement_coaching": {{
+  "placement_coaching": {
     "current_gaps": [
       "Did not directly answer the interview question",
       "Missing concise summary of academic background"
@@ -67,8 +63,38 @@ JSON FORMAT (FOLLOW EXACTLY):
       "Answer relevance",
       "Concise communication"
     ]
-  }}
-}}
+  }
+}
+
+"""
+
+_COACHING_ITEM = {"type": "string", "minLength": 1, "maxLength": 200}
+
+
+def _items(min_items: int, max_items: int) -> dict:
+    return {"type": "array", "items": _COACHING_ITEM, "minItems": min_items, "maxItems": max_items}
+
+
+# Shape enforced at decode time (app.models.json_schema_decoding).
+PLACEMENT_OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "standout_strengths": _items(3, 4),
+        "top_improvements": _items(3, 4),
+        "placement_coaching": {
+            "type": "object",
+            "properties": {
+                "current_gaps": _items(2, 4),
+                "actionable_improvements": _items(2, 4),
+                "placement_focus": _items(2, 4),
+            },
+        },
+    },
+}
+
+
+def build_placement_coaching_prompt(question, transcript) -> str:
+    return PLACEMENT_PROMPT_PREFIX + f"""Interview Transcript:
+{transcript}
 
-Return only valid JSON.
-""".strip()
+Return only valid JSON."""
@@ -1,6 +1,34 @@
+from typing import Optional, Sequence
 from app.schemas.question import QuestionGenerationRequest
 
-def build_question_generation_prompt(req: QuestionGenerationRequest) -> str:
+
+def build_question_output_schema(count: Optional[int]) -> dict:
+    # Exactly `count` questions when the round is known, otherwise 1-10.
+    return {
+        "type": "object",
+        "properties": {
+            "questions": {
+                "type": "array",
+                "items": {"type": "string", "minLength": 1, "maxLength": 300},
+                "minItems": count or 1,
+                "maxItems": count or 10,
+            },
+        },
+    }
+
+
+def _avoid_section(avoid: Sequence[str]) -> str:
+    if not avoid:
+        return ""
+    listed = "\n".join(f"- {q}" for q in avoid)
+    return f"""ALREADY ASKED (ask different questions; do not repeat or rephrase these):
+{listed}
+
+"""
+
+
+def build_question_generation_prompt(req: QuestionGenerationRequest, avoid: Sequence[str] = ()) -> str:
+    # avoid: questions this key already has, so a new batch adds new ones
     return f"""
 You are a professional interviewer.
 
@@ -18,7 +46,7 @@ QUESTION COUNT RULES:
 - Coding Round: exactly 5 questions
 - Communication Round: exactly 5 questions
 
-
+{_avoid_section(avoid)}
 CRITICAL OUTPUT CONTRACT:
 - Output ONLY one valid JSON object.
 - Do NOT add any text before or after the JSON.
@@ -1,16 +1,8 @@
 from typing import List
 
-def build_tcs_prompt(question: str | List[str], transcript: str) -> str:
-    # Normalize question in case a list/array is passed
-    if isinstance(question, list):
-        question = next(
-            (str(q).strip() for q in question if str(q).strip()),
-            "Explain your approach to this problem."
-        )
-    else:
-        question = str(question).strip() or "Explain your approach to this problem."
-
-    return f"""
+# Constant instructions come first so their KV cache can be computed once
+# and reused; everything that varies per call is appended after them.
+TCS_PROMPT_PREFIX = """
 You are a senior technical interviewer conducting a mock interview.
 
 You must evaluate the candidate STRICTLY based on:
@@ -36,12 +28,6 @@ STRICT EVALUATION RULES:
 - Do NOT penalize for advanced topics unless the question explicitly requires them.
 - Avoid generic interview advice (e.g., “practice more”, “be confident”).
 
-Interview Question:
-{question}
-
-Candidate Answer:
-{transcript}
-
 SCORING GUIDELINES:
 - Score from 0 to 100 based on relevance + technical correctness.
 - Use these bands:
@@ -60,18 +46,56 @@ COACHING REQUIREMENTS:
   without adding new content.
 
 OUTPUT RULES:
-- Start the response with '{{' and end with '}}'.
+- Start the response with '{' and end with '}'.
 - Respond in STRICT JSON ONLY.
 - Do NOT include markdown, explanations, or extra text.
 
 JSON format:
-{{
+{
   "score": <int>,
   "band": "<Excellent|Good|Partial|Weak|Poor>",
   "verdict": "<1–2 sentence technical summary judging alignment with the question>",
   "issues": ["<question-relative technical issues or 'No major technical issues identified'>"],
   "improvement_points": ["<specific, question-grounded coaching points>"]
-}}
+}
+
+"""
+
+_COACHING_ITEM = {"type": "string", "minLength": 1, "maxLength": 300}
+
+# Shape enforced at decode time (app.models.json_schema_decoding).
+TCS_OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "integer", "minimum": 0, "maximum": 100},
+        "band": {"enum": ["Excellent", "Good", "Partial", "Weak", "Poor"]},
+        "verdict": {"type": "string", "minLength": 1, "maxLength": 400},
+        "issues": {"type": "array", "items": _COACHING_ITEM, "minItems": 1, "maxItems": 6},
+        "improvement_points": {"type": "array", "items": _COACHING_ITEM, "minItems": 4, "maxItems": 6},
+    },
+}
+
+
+def normalize_question(question: str | List[str] | None) -> str:
+    # Normalize question in case a list/array is passed
+    if isinstance(question, list):
+        return next(
+            (str(q).strip() for q in question if str(q).strip()),
+            "Explain your approach to this problem."
+        )
+    if question is None:
+        return "Explain your approach to this problem."
+    return str(question).strip() or "Explain your approach to this problem."
+
+
+def build_tcs_prompt(question: str | List[str], transcript: str) -> str:
+    question = normalize_question(question)
+
+    return TCS_PROMPT_PREFIX + f"""Interview Question:
+{question}
+
+Candidate Answer:
+{transcript}
 
 Return only valid JSON.
 """
@@ -0,0 +1,104 @@
+# app/services/evaluation_profiles.py
+
+import functools
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from app.audio.pitch_analysis import PITCH_BACKEND
+from app.audio.transcriber import WHISPER_MODEL_SIZE
+from app.prompts.placement_prompt import PLACEMENT_OUTPUT_SCHEMA
+from app.prompts.tcs_prompt import TCS_OUTPUT_SCHEMA
+
+# characters of output one token of budget is assumed to hold when a
+# profile's output schemas are fitted to it (English JSON averages ~4 on the
+# Llama 3 tokenizer; longer replies are still closed in time by the decoder)
+SCHEMA_CHARS_PER_TOKEN = float(os.getenv("SCHEMA_CHARS_PER_TOKEN", "3"))
+
+_OUTPUT_SCHEMAS = {"tcs": TCS_OUTPUT_SCHEMA, "placement": PLACEMENT_OUTPUT_SCHEMA}
+
+
+@functools.lru_cache(maxsize=32)
+def _fitted_schema(task: str, max_new_tokens: int) -> dict:
+    # imported here: json_schema_decoding pulls in torch and transformers
+    from app.models.json_schema_decoding import fit_schema
+
+    return fit_schema(_OUTPUT_SCHEMAS[task], int(max_new_tokens * SCHEMA_CHARS_PER_TOKEN))
+
+
+@dataclass(frozen=True)
+class EvaluationProfile:
+    name: str
+    whisper_model: str
+    whisper_beam_size: int
+    word_timestamps: bool       # needed for the long-pause signal
+    pitch_backend: str
+    tcs_max_new_tokens: int
+    placement_max_new_tokens: int  # 0 skips placement coaching
+    fit_schemas: bool = False   # shrink output length caps to the budgets
+
+    def tcs_schema(self) -> dict:
+        if not self.fit_schemas:
+            return TCS_OUTPUT_SCHEMA
+        return _fitted_schema("tcs", self.tcs_max_new_tokens)
+
+    def placement_schema(self) -> dict:
+        if not self.fit_schemas:
+            return PLACEMENT_OUTPUT_SCHEMA
+        return _fitted_schema("placement", self.placement_max_new_tokens)
+
+
+# Trade-offs (benchmarks.bench_profiles measures them per deployment):
+#   fast      practice sessions. Whisper base with greedy decoding and no
+#             word alignment (long pauses are not counted), YIN pitch, a
+#             short TCS budget whose schema caps the verdict, item lengths
+#             and list sizes to fit it, and no placement coaching.
+#   balanced  Whisper small, greedy, with word timestamps; smaller TCS and
+#             placement budgets with their schemas fitted the same way.
+#   accurate  the full pipeline: Whisper medium (WHISPER_MODEL_SIZE) with
+#             beam 5, PITCH_BACKEND (pyin unless configured otherwise), full
+#             TCS and placement budgets and schemas.
+EVALUATION_PROFILES: Dict[str, EvaluationProfile] = {
+    "fast": EvaluationProfile(
+        name="fast",
+        whisper_model="base",
+        whisper_beam_size=1,
+        word_timestamps=False,
+        pitch_backend="yin",
+        tcs_max_new_tokens=600,
+        placement_max_new_tokens=0,
+        fit_schemas=True,
+    ),
+    "balanced": EvaluationProfile(
+        name="balanced",
+        whisper_model="small",
+        whisper_beam_size=1,
+        word_timestamps=True,
+        pitch_backend="yin",
+        tcs_max_new_tokens=1000,
+        placement_max_new_tokens=900,
+        fit_schemas=True,
+    ),
+    "accurate": EvaluationProfile(
+        name="accurate",
+        whisper_model=WHISPER_MODEL_SIZE,
+        whisper_beam_size=5,
+        word_timestamps=True,
+        pitch_backend=PITCH_BACKEND,
+        tcs_max_new_tokens=1600,
+        placement_max_new_tokens=1200,
+    ),
+}
+
+DEFAULT_EVALUATION_PROFILE = os.getenv("EVALUATION_PROFILE", "accurate")
+
+
+def get_evaluation_profile(name: Optional[str | EvaluationProfile] = None) -> EvaluationProfile:
+    if isinstance(name, EvaluationProfile):
+        return name
+    name = name or DEFAULT_EVALUATION_PROFILE
+    if name not in EVALUATION_PROFILES:
+        raise ValueError(
+            f"Unknown evaluation profile '{name}'. Expected one of {list(EVALUATION_PROFILES)}"
+        )
+    return EVALUATION_PROFILES[name]
@@ -0,0 +1,211 @@
+# app/services/feature_cache.py
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+from app.schemas.transcription import TranscriptionResult
+from app.utils.metrics import CACHE_LOOKUPS
+from app.utils.private_dir import default_private_dir, ensure_private_dir
+
+# Disk cache of the expensive CS stage outputs (transcription, pitch,
+# signals), so re-evaluating the same recording (e.g. a retry after an LLM
+# failure) only reruns what is missing. Shared by the API process and the
+# evaluation workers; entries are addressed by content, so nothing needs
+# invalidating, and the least recently used are evicted past the size cap.
+# Entries are plain JSON (never unpickled), in a directory that must belong
+# to this user and be closed to everyone else; the default is per user.
+# Cache errors (a foreign directory, a full disk) are logged and treated as
+# misses, never failing the evaluation.
+FEATURE_CACHE_ENABLED = os.getenv("FEATURE_CACHE", "1") == "1"
+FEATURE_CACHE_DIR = os.getenv("FEATURE_CACHE_DIR", default_private_dir("interview-feature-cache"))
+FEATURE_CACHE_MAX_BYTES = int(os.getenv("FEATURE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Bump when a stage's output changes for the same input and config.
+FEATURE_CACHE_VERSION = "2"
+
+logger = logging.getLogger(__name__)
+
+_HASH_CHUNK = 1 << 20
+
+_STATS: Dict[str, Dict[str, int]] = {}  # per stage, this process only
+_STATS_LOCK = threading.Lock()
+_EVICT_LOCK = threading.Lock()
+_DIR_LOCK = threading.Lock()
+_DIR_READY: Optional[str] = None  # FEATURE_CACHE_DIR once created and checked
+
+
+def audio_content_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def transcript_digest(tr: TranscriptionResult) -> str:
+    # stages that only read the transcript are keyed on it, not the audio
+    return hashlib.sha256(
+        json.dumps([tr.text, tr.segments], sort_keys=True).encode()
+    ).hexdigest()
+
+
+def feature_key(stage: str, *parts) -> str:
+    raw = "|".join([FEATURE_CACHE_VERSION, stage, *(str(p) for p in parts)])
+    return f"{stage}-{hashlib.sha256(raw.encode()).hexdigest()}"
+
+
+def _path(key: str) -> str:
+    return os.path.join(FEATURE_CACHE_DIR, key + ".json")
+
+
+def _private_dir() -> str:
+    """FEATURE_CACHE_DIR, created 0o700 if missing and refused unless it is ours."""
+    global _DIR_READY
+    with _DIR_LOCK:
+        if _DIR_READY != FEATURE_CACHE_DIR:
+            _DIR_READY = ensure_private_dir(FEATURE_CACHE_DIR, "FEATURE_CACHE_DIR")
+        return _DIR_READY
+
+
+def _encode(value: Any) -> dict:
+    if isinstance(value, TranscriptionResult):
+        return {"type": "transcription", "value": dataclasses.asdict(value)}
+    return {"type": "json", "value": value}
+
+
+def _decode(data: dict) -> Any:
+    if data["type"] == "transcription":
+        return TranscriptionResult(**data["value"])
+    return data["value"]
+
+
+def _count(stage: str, field: str):
+    with _STATS_LOCK:
+        stats = _STATS.setdefault(
+            stage, {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "errors": 0}
+        )
+        stats[field] += 1
+    if field in ("hits", "misses"):
+        CACHE_LOOKUPS.inc(f"feature_{stage}", "hit" if field == "hits" else "miss")
+
+
+def get_features(key: str) -> Optional[Any]:
+    # The cache only saves work: an unusable directory is a miss, never an
+    # evaluation failure.
+    stage = key.split("-", 1)[0]
+    try:
+        _private_dir()
+    except (OSError, RuntimeError) as e:
+        logger.warning("feature cache unavailable, not reading %s: %s", key, e)
+        _count(stage, "errors")
+        _count(stage, "misses")
+        return None
+
+    path = _path(key)
+    try:
+        with open(path) as f:
+            value = _decode(json.load(f))
+        os.utime(path)  # mtime is the LRU clock
+    except FileNotFoundError:
+        _count(stage, "misses")
+        return None
+    except Exception:
+        # truncated or from an incompatible version: drop it
+        _count(stage, "misses")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+    _count(stage, "hits")
+    return value
+
+
+def put_features(key: str, value: Any):
+    # best effort: a directory that cannot be used, a full disk or a value
+    # that does not serialize skips the write
+    stage = key.split("-", 1)[0]
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=_private_dir(), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(_encode(value), f)
+        os.replace(tmp, _path(key))  # readers never see a partial entry
+    except (OSError, RuntimeError, TypeError, ValueError) as e:
+        logger.warning("feature cache write of %s skipped: %s", key, e)
+        _count(stage, "errors")
+        if tmp is not None:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+        return
+
+    _count(stage, "stores")
+    try:
+        _evict()
+    except OSError as e:
+        logger.warning("feature cache eviction failed: %s", e)
+
+
+def _entries():
+    try:
+        names = os.listdir(FEATURE_CACHE_DIR)
+    except FileNotFoundError:
+        return []
+
+    entries = []
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        try:
+            st = os.stat(os.path.join(FEATURE_CACHE_DIR, name))
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, name))
+    return entries
+
+
+def _evict():
+    with _EVICT_LOCK:
+        entries = _entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= FEATURE_CACHE_MAX_BYTES:
+                break
+            try:
+                os.remove(os.path.join(FEATURE_CACHE_DIR, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+            _count(name.split("-", 1)[0], "evictions")
+
+
+def get_feature_cache_stats() -> dict:
+    entries = _entries()
+    with _STATS_LOCK:
+        stages = {stage: dict(stats) for stage, stats in _STATS.items()}
+    return {
+        "enabled": FEATURE_CACHE_ENABLED,
+        "entries": len(entries),
+        "bytes": sum(size for _, size, _ in entries),
+        "max_bytes": FEATURE_CACHE_MAX_BYTES,
+        "stages": stages,
+    }
+
+
+def clear_feature_cache():
+    for _, _, name in _entries():
+        try:
+            os.remove(os.path.join(FEATURE_CACHE_DIR, name))
+        except FileNotFoundError:
+            pass
+    with _STATS_LOCK:
+        _STATS.clear()
@@ -1,11 +1,30 @@
 # app/services/interview_analysis.py
 
 from app.audio.audio_utils import load_audio_mono
-from app.audio.pitch_analysis import analyze_pitch_dynamics
-from app.audio.transcriber import transcribe_audio
+from app.audio.pitch_analysis import analyze_pitch_dynamics, pitch_settings
+from app.audio.transcriber import transcribe_audio, whisper_device
 from app.nlp.signals import detect_signals
 from app.scoring.cs_engine import calculate_score
-from transformers import pipeline
+from app.services.evaluation_profiles import EvaluationProfile, get_evaluation_profile
+from app.services.feature_cache import (
+    FEATURE_CACHE_ENABLED,
+    audio_content_hash,
+    feature_key,
+    get_features,
+    put_features,
+    transcript_digest,
+)
+from app.utils.stage_executor import StageExecutor
+from typing import Callable, Optional
+import os
+
+StageCallback = Callable[[str, dict], None]
+
+# Core allotment for the parallel CS stages: threads shared by
+# transcription, signals and sentiment, and whether pitch tracking (GIL-bound
+# numpy) runs in its own process instead of a thread.
+CS_STAGE_THREADS = int(os.getenv("CS_STAGE_THREADS", "3"))
+CS_PITCH_IN_PROCESS = os.getenv("CS_PITCH_IN_PROCESS", "0") == "1"
 
 _SENT_PIPE = None
 _PIPELINE_AVAILABLE = True
@@ -17,29 +36,152 @@ def _sample_text_for_sentiment(text: str, max_len: int = 512) -> str:
     return text[:part] + text[len(text)//2 - part//2 : len(text)//2 + part//2] + text[-part:]
 
 
-def run_cs_pipeline(audio_path: str):
-    audio, sr = load_audio_mono(audio_path)
-    pitch_data = analyze_pitch_dynamics(audio, sr)
+def _run_sentiment(text: str):
+    global _SENT_PIPE
+    if not _PIPELINE_AVAILABLE:
+        return None
+    if _SENT_PIPE is None:
+        from transformers import pipeline  # heavy; only needed once a model loads
 
-    tr = transcribe_audio(audio_path)
-    if not tr or not tr.text.strip():
-        raise RuntimeError("Transcription failed or empty")
+        _SENT_PIPE = pipeline(
+            "sentiment-analysis",
+            model="distilbert-base-uncased-finetuned-sst-2-english",
+            device=-1
+        )
+    return _SENT_PIPE(_sample_text_for_sentiment(text))
 
-    duration = tr.duration if tr.duration > 0 else len(audio) / sr
-    signals = detect_signals(tr.text, tr.segments)
 
-    sent_res = None
-    global _SENT_PIPE
-    if _PIPELINE_AVAILABLE:
-        if _SENT_PIPE is None:
-            _SENT_PIPE = pipeline(
-                "sentiment-analysis",
-                model="distilbert-base-uncased-finetuned-sst-2-english",
-                device=-1
+def run_cs_pipeline(
+    audio_path: str,
+    on_stage: Optional[StageCallback] = None,
+    precomputed: Optional[dict] = None,
+    profile: Optional[EvaluationProfile] = None
+):
+    """
+    Stage graph: decode -> transcribe -> {pitch, signals, sentiment};
+    everything joins at calculate_score. With the pyin backend, pitch
+    instead starts right after decode on the whole clip, overlapping
+    transcription.
+
+    precomputed may carry a "transcription" (TranscriptionResult) and
+    "signals" already produced elsewhere (live ingest); those stages are
+    then skipped. The profile picks the Whisper model and decoding options
+    and the pitch backend.
+
+    Transcription, pitch and signals are looked up in the feature cache
+    first (keyed on the audio content and the stage config), so a retry of
+    the same recording only recomputes what is missing; the result's
+    "cache" maps each looked-up stage to "hit" or "miss".
+    """
+    precomputed = precomputed or {}
+    profile = profile or get_evaluation_profile()
+    cache_status = {}
+
+    def lookup(stage: str, key: Optional[str]):
+        if key is None:
+            return None
+        value = get_features(key)
+        cache_status[stage] = "miss" if value is None else "hit"
+        return value
+
+    def pitch_key(audio_hash: Optional[str], tr) -> Optional[str]:
+        if audio_hash is None:
+            return None
+        settings = pitch_settings(profile.pitch_backend)
+        if profile.pitch_backend == "pyin":
+            return feature_key("pitch", audio_hash, *settings)
+        # YIN only tracks the transcript's speech regions
+        return feature_key("pitch", audio_hash, *settings, transcript_digest(tr))
+
+    with StageExecutor(max_workers=max(CS_STAGE_THREADS, 1)) as stages:
+        audio_hash = None
+        if FEATURE_CACHE_ENABLED:
+            audio_hash = stages.run("hash", audio_content_hash, audio_path)
+
+        tr = precomputed.get("transcription")
+        tr_key = None
+        if tr is None and audio_hash is not None:
+            tr_key = feature_key(
+                "transcription",
+                audio_hash,
+                profile.whisper_model,
+                profile.whisper_beam_size,
+                profile.word_timestamps,
+                *whisper_device()
             )
-        sent_res = _SENT_PIPE(_sample_text_for_sentiment(tr.text))
+            tr = lookup("transcription", tr_key)
+
+        pitch_data = None
+        if profile.pitch_backend == "pyin" or tr is not None:
+            pitch_data = lookup("pitch", pitch_key(audio_hash, tr))
+
+        # Decoded once; pitch analysis, Whisper and the duration fallback all
+        # share this 16 kHz float32 buffer. Not needed on a full cache hit.
+        audio, sr = None, 16000
+        if tr is None or pitch_data is None or tr.duration <= 0:
+            audio, sr = stages.run("decode", load_audio_mono, audio_path)
+
+        # pyin is slow enough to be worth overlapping with Whisper; the YIN
+        # tracker takes milliseconds, so it waits for Whisper's VAD segments
+        # and only tracks the speech regions.
+        pitch_future = None
+        if pitch_data is None and profile.pitch_backend == "pyin":
+            pitch_future = stages.submit(
+                "pitch", analyze_pitch_dynamics, audio, sr, None, "pyin",
+                in_process=CS_PITCH_IN_PROCESS
+            )
+
+        if tr is None:
+            tr = stages.run(
+                "transcribe",
+                transcribe_audio,
+                audio,
+                profile.whisper_model,
+                profile.whisper_beam_size,
+                profile.word_timestamps
+            )
+            if tr_key is not None and tr and tr.text.strip():
+                put_features(tr_key, tr)
+        if not tr or not tr.text.strip():
+            raise RuntimeError("Transcription failed or empty")
+
+        if pitch_data is None and pitch_future is None:
+            pitch_data = lookup("pitch", pitch_key(audio_hash, tr))
+            if pitch_data is None:
+                pitch_future = stages.submit(
+                    "pitch", analyze_pitch_dynamics, audio, sr, tr.segments, profile.pitch_backend,
+                    in_process=CS_PITCH_IN_PROCESS
+                )
+
+        if on_stage is not None:
+            on_stage("transcript", {"transcript": tr.text})
+
+        signals = precomputed.get("signals")
+        signals_key = None
+        signals_future = None
+        if signals is None:
+            if FEATURE_CACHE_ENABLED:
+                signals_key = feature_key("signals", transcript_digest(tr))
+            signals = lookup("signals", signals_key)
+            if signals is None:
+                signals_future = stages.submit("signals", detect_signals, tr.text, tr.segments)
+        sent_future = stages.submit("sentiment", _run_sentiment, tr.text)
+
+        duration = tr.duration if tr.duration > 0 else len(audio) / sr
+        if pitch_future is not None:
+            pitch_data = pitch_future.result()
+            # an all-zero result is also what a tracker exception returns
+            if audio_hash is not None and pitch_data["voiced_ratio"] > 0:
+                put_features(pitch_key(audio_hash, tr), pitch_data)
+        if signals_future is not None:
+            signals = signals_future.result()
+            if signals_key is not None:
+                put_features(signals_key, signals)
+        sent_res = sent_future.result()
 
-    cs_result = calculate_score(
+    cs_result = stages.run(
+        "score",
+        calculate_score,
         transcript=tr.text,
         duration=duration,
         signals=signals,
@@ -50,5 +192,7 @@ def run_cs_pipeline(audio_path: str):
     return {
         "transcript": tr.text,
         "cs_score": cs_result.total_score,
-        "cs_result": cs_result
+        "cs_result": cs_result,
+        "timings": stages.timings(),
+        "cache": cache_status
     }
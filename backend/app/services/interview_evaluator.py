@@ -1,19 +1,45 @@
 # app/services/interview_evaluator.py
 
-from typing import List
-from app.services.interview_analysis import run_cs_pipeline
-from app.services.tcs_service import compute_tcs
+import time
+from typing import List, Optional
+from app.services.interview_analysis import StageCallback, run_cs_pipeline
 from app.services.aggregation_service import combine_cs_tcs
-from app.services.placement_service import generate_placement_feedback
+from app.services.evaluation_profiles import EvaluationProfile, get_evaluation_profile
+from app.services.llm_evaluation_service import run_tcs_and_placement
+from app.utils.metrics import STAGE_SECONDS
 
 
 def evaluate_interview(
     audio_path: str,
-    questions: List[str]
+    questions: List[str],
+    on_stage: Optional[StageCallback] = None,
+    llm_mode: Optional[str] = None,
+    precomputed: Optional[dict] = None,
+    profile: Optional[str | EvaluationProfile] = None,
+    debug: bool = False
 ) -> dict:
+    """
+    Run the full evaluation. If on_stage is given it is called with
+    (stage, partial_result) as soon as each stage finishes; the partial
+    dicts use the same keys as the final response. llm_mode selects how the
+    TCS and placement generations run (see llm_evaluation_service).
+    precomputed is passed through to run_cs_pipeline. profile names the
+    evaluation profile (fast / balanced / accurate, see evaluation_profiles);
+    the fast profile skips placement and returns placement_feedback None.
+    debug adds "timings": seconds per stage, CS and LLM, for this request.
+    """
+    profile = get_evaluation_profile(profile)
+    start = time.perf_counter()
+
+    def emit(stage: str, payload: dict) -> dict:
+        if on_stage is not None:
+            on_stage(stage, payload)
+        return payload
 
     # 1. Communication Score
-    cs_out = run_cs_pipeline(audio_path)
+    cs_out = run_cs_pipeline(
+        audio_path, on_stage=on_stage, precomputed=precomputed, profile=profile
+    )
 
     transcript = cs_out["transcript"]
     cs_score = cs_out["cs_score"]
@@ -21,26 +47,58 @@ def evaluate_interview(
     cs_metrics = cs_result.metrics if cs_result else {}
     cs_feedback = cs_result.feedback if cs_result else []
 
-    # 2. Technical Correctness
-    tcs = compute_tcs(transcript, questions)
+    cs_part = emit("cs", {
+        "cs_score": cs_score,
+        "cs_metrics": cs_metrics,
+        "cs_feedback": cs_feedback,
+        # per-stage {start, seconds} of the CS pipeline, for the critical path
+        "cs_timings": cs_out.get("timings", {}),
+        # feature cache hit/miss per CS stage
+        "cs_cache": cs_out.get("cache", {}),
+    })
+
+    def tcs_payload(tcs) -> dict:
+        # 3. Final Score
+        final_score = combine_cs_tcs(cs_score, tcs)
 
-    # 3. Final Score
-    final_score = combine_cs_tcs(cs_score, tcs)
+        return {
+            "tcs_score": tcs.score,
+            "tcs_band": tcs.band,
+            "tcs_verdict": tcs.verdict,
+            "tcs_issues": tcs.issues,
+            "tcs_improvements": tcs.improvement_points,
+            "coaching_feedback": tcs.improvement_points,
+            "final_score": final_score,
+        }
 
-    # 4. Placement Coaching
-    placement = generate_placement_feedback(transcript, questions)
+    # 2. Technical Correctness + 4. Placement Coaching
+    llm_timings = {}
+    tcs, placement = run_tcs_and_placement(
+        transcript,
+        questions,
+        mode=llm_mode,
+        profile=profile,
+        on_tcs=lambda tcs: emit("tcs", tcs_payload(tcs)),
+        timings=llm_timings
+    )
+    tcs_part = tcs_payload(tcs)
 
-    return {
+    placement_part = emit("placement", {"placement_feedback": placement})
+
+    total = time.perf_counter() - start
+    STAGE_SECONDS.observe(total, "evaluation")
+
+    result = {
+        "profile": profile.name,
         "transcript": transcript,
-        "cs_score": cs_score,
-        "cs_metrics": cs_metrics,
-        "cs_feedback": cs_feedback,
-        "tcs_score": tcs.score,
-        "tcs_band": tcs.band,
-        "tcs_verdict": tcs.verdict,
-        "tcs_issues": tcs.issues,
-        "tcs_improvements": tcs.improvement_points,
-        "coaching_feedback": tcs.improvement_points,
-        "final_score": final_score,
-        "placement_feedback": placement
+        **cs_part,
+        **tcs_part,
+        **placement_part
     }
+    if debug:
+        result["timings"] = {
+            **{stage: t["seconds"] for stage, t in cs_part["cs_timings"].items() if stage != "total"},
+            **llm_timings,
+            "total": round(total, 4),
+        }
+    return result
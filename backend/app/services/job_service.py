@@ -0,0 +1,382 @@
+# app/services/job_service.py
+
+import asyncio
+import math
+import multiprocessing
+import os
+import queue
+import shutil
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Awaitable, Callable, Iterator, List, Optional, Tuple
+
+from app.services.interview_evaluator import evaluate_interview
+from app.services.warmup import STARTUP_MODE, WARMUP_MODELS, warm_worker, worker_warmup_report
+from app.store.job_store import create_job, get_job, update_job, purge_expired_jobs
+from app.utils.metrics import REGISTRY, Gauge
+from app.utils.profiling import run_profiled
+
+EVALUATION_WORKERS = max(1, int(os.getenv("EVALUATION_WORKERS", "1")))
+EVALUATION_QUEUE_SIZE = max(0, int(os.getenv("EVALUATION_QUEUE_SIZE", "4")))
+DEFAULT_RETRY_AFTER = int(os.getenv("EVALUATION_RETRY_AFTER", "60"))
+# how long warm_job_pool waits for every worker to start and warm up
+WORKER_WARMUP_TIMEOUT = float(os.getenv("WORKER_WARMUP_TIMEOUT", "900"))
+
+_POOL = None
+_MANAGER = None  # owns the cross-process queues used for stage events
+_POOL_LOCK = threading.Lock()
+_IN_FLIGHT = 0
+_AVG_DURATION = None  # exponential moving average of finished jobs (seconds)
+
+# worker -> API process: metric deltas recorded during each job
+_METRICS_QUEUE = None
+_METRICS_THREAD = None
+
+Gauge(
+    "evaluation_jobs_in_flight",
+    "Evaluation jobs running or waiting for a worker.",
+    fn=lambda: {(): _IN_FLIGHT}
+)
+Gauge(
+    "evaluation_queue_depth",
+    "Evaluation jobs waiting for a free worker.",
+    fn=lambda: {(): max(_IN_FLIGHT - EVALUATION_WORKERS, 0)}
+)
+
+
+class QueueFullError(RuntimeError):
+    def __init__(self, retry_after: int):
+        super().__init__(f"Evaluation queue is full. Retry in {retry_after}s.")
+        self.retry_after = retry_after
+
+
+class JobCancelledError(RuntimeError):
+    pass
+
+
+def _evaluate_with_events(
+    audio_path: str,
+    questions: List[str],
+    events,
+    llm_mode: Optional[str] = None,
+    precomputed: Optional[dict] = None,
+    profile: Optional[str] = None,
+    debug: bool = False
+) -> dict:
+    # Executed inside a worker process; events is a Manager queue proxy.
+    return evaluate_interview(
+        audio_path,
+        questions,
+        on_stage=lambda stage, data: events.put((stage, data)),
+        llm_mode=llm_mode,
+        precomputed=precomputed,
+        profile=profile,
+        debug=debug
+    )
+
+
+def _init_worker(metrics_queue, warm_models):
+    # ProcessPoolExecutor initializer
+    global _METRICS_QUEUE
+
+    _METRICS_QUEUE = metrics_queue
+    if warm_models:
+        warm_worker(warm_models)
+
+
+def _run_job(fn, *args, **kwargs):
+    # Executed inside a worker process: hand this job's metrics to the API
+    # process, whether or not it succeeded.
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _METRICS_QUEUE.put(REGISTRY.drain())
+
+
+def _merge_worker_metrics(metrics_queue):
+    while True:
+        deltas = metrics_queue.get()
+        if deltas is None:
+            break
+        REGISTRY.merge(deltas)
+
+
+def _get_manager():
+    global _MANAGER
+
+    if _MANAGER is None:
+        _MANAGER = multiprocessing.get_context("spawn").Manager()
+    return _MANAGER
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _POOL, _METRICS_QUEUE, _METRICS_THREAD
+
+    if _POOL is None:
+        ctx = multiprocessing.get_context("spawn")
+        if _METRICS_QUEUE is None:
+            _METRICS_QUEUE = ctx.SimpleQueue()
+            _METRICS_THREAD = threading.Thread(
+                target=_merge_worker_metrics, args=(_METRICS_QUEUE,),
+                name="worker-metrics", daemon=True
+            )
+            _METRICS_THREAD.start()
+
+        # spawn: forking a parent that already imported torch is not safe
+        _POOL = ProcessPoolExecutor(
+            max_workers=EVALUATION_WORKERS,
+            mp_context=ctx,
+            # in warm mode every worker (including replacements after a
+            # crash) loads its models before taking a job
+            initializer=_init_worker,
+            initargs=(_METRICS_QUEUE, WARMUP_MODELS if STARTUP_MODE == "warm" else ())
+        )
+    return _POOL
+
+
+def warm_job_pool() -> List[dict]:
+    """
+    Start every evaluation worker and wait until each has run its
+    initializer; returns their warm-up reports, one per worker.
+    """
+    with _POOL_LOCK:
+        pool = _get_pool()
+        # the barrier keeps each task's worker busy until all of them hold
+        # one, so every submit finds no idle worker and starts another
+        barrier = _get_manager().Barrier(EVALUATION_WORKERS)
+        futures = [
+            pool.submit(worker_warmup_report, barrier, WORKER_WARMUP_TIMEOUT)
+            for _ in range(EVALUATION_WORKERS)
+        ]
+    return [f.result() for f in futures]
+
+
+def retry_after_hint() -> int:
+    if _AVG_DURATION is None:
+        return DEFAULT_RETRY_AFTER
+
+    waiting = max(_IN_FLIGHT - EVALUATION_WORKERS + 1, 1)
+    return max(1, math.ceil(_AVG_DURATION * waiting / EVALUATION_WORKERS))
+
+
+def _on_job_done(job_id: str, pool: ProcessPoolExecutor, future: Future):
+    global _IN_FLIGHT, _AVG_DURATION
+
+    finished_at = time.time()
+
+    with _POOL_LOCK:
+        _IN_FLIGHT -= 1
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            # a worker died (e.g. OOM); start a fresh pool for the next job.
+            # Every job of the broken pool fails at once, so only the first
+            # callback resets: later ones must not tear down its replacement.
+            if _POOL is pool:
+                _reset_pool()
+
+    try:
+        job = get_job(job_id)
+    except KeyError:
+        return
+
+    shutil.rmtree(job["metadata"]["tmp_dir"], ignore_errors=True)
+
+    duration = finished_at - job["created_at"]
+    with _POOL_LOCK:
+        _AVG_DURATION = (
+            duration if _AVG_DURATION is None
+            else 0.8 * _AVG_DURATION + 0.2 * duration
+        )
+
+    update_job(job_id, {"finished_at": finished_at})
+
+
+def submit_evaluation(
+    audio_path: str,
+    tmp_dir: str,
+    questions: List[str],
+    stream: bool = False,
+    llm_mode: Optional[str] = None,
+    precomputed: Optional[dict] = None,
+    profile: Optional[str] = None,
+    debug: bool = False,
+    profiler: Optional[Tuple[str, str]] = None
+) -> str:
+    """
+    Queue an evaluation on the worker pool and return its job id.
+    With stream=True the job publishes per-stage events for iter_job_events.
+    precomputed (transcription/signals) skips those CS stages in the worker.
+    debug adds per-stage timings to the result. profiler is (mode, profile
+    id): the worker profiles the job and stores the artifact under that id.
+    Raises QueueFullError when the pool and its queue are saturated.
+    """
+    global _IN_FLIGHT
+
+    with _POOL_LOCK:
+        if _IN_FLIGHT >= EVALUATION_WORKERS + EVALUATION_QUEUE_SIZE:
+            raise QueueFullError(retry_after_hint())
+        _IN_FLIGHT += 1
+
+    purge_expired_jobs()
+    job_id = create_job({"num_questions": len(questions), "tmp_dir": tmp_dir})
+
+    try:
+        with _POOL_LOCK:
+            pool = _get_pool()
+            events = _get_manager().Queue() if stream else None
+        target = _evaluate_with_events if stream else evaluate_interview
+        if profiler is not None:
+            target = partial(run_profiled, *profiler, target)
+        args = (audio_path, questions, events) if stream else (audio_path, questions)
+        future = pool.submit(
+            _run_job, target, *args,
+            llm_mode=llm_mode, precomputed=precomputed, profile=profile, debug=debug
+        )
+    except Exception:
+        with _POOL_LOCK:
+            _IN_FLIGHT -= 1
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        update_job(job_id, {"finished_at": time.time(), "error": "Worker pool unavailable"})
+        raise
+
+    update_job(job_id, {"future": future, "events": events})
+    future.add_done_callback(lambda f: _on_job_done(job_id, pool, f))
+
+    return job_id
+
+
+def get_job_status(job_id: str) -> dict:
+    job = get_job(job_id)
+    future = job["future"]
+
+    out = {
+        "job_id": job_id,
+        "status": "queued",
+        "created_at": job["created_at"],
+        "finished_at": job["finished_at"],
+    }
+
+    if job["error"] is not None:
+        out["status"] = "failed"
+        out["error"] = job["error"]
+    elif future is None:
+        pass
+    elif future.cancelled():
+        out["status"] = "failed"
+        out["error"] = "Job was cancelled"
+    elif future.done():
+        if future.exception() is not None:
+            out["status"] = "failed"
+            out["error"] = str(future.exception())
+        else:
+            out["status"] = "completed"
+            out["result"] = future.result()
+    elif future.running():
+        out["status"] = "running"
+
+    return out
+
+
+async def run_evaluation(
+    audio_path: str,
+    tmp_dir: str,
+    questions: List[str],
+    llm_mode: Optional[str] = None,
+    profile: Optional[str] = None,
+    debug: bool = False,
+    profiler: Optional[Tuple[str, str]] = None,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    poll_interval: float = 1.0
+) -> dict:
+    """
+    Submit an evaluation and await its result. is_disconnected (e.g.
+    Request.is_disconnected) is polled while the job waits for a worker;
+    once it returns True the queued job is cancelled, its slot released,
+    and JobCancelledError raised. A job that has started runs to the end.
+    """
+    job_id = submit_evaluation(
+        audio_path, tmp_dir, questions, llm_mode=llm_mode, profile=profile, debug=debug,
+        profiler=profiler
+    )
+    future = get_job(job_id)["future"]
+    waiter = asyncio.wrap_future(future)
+
+    while is_disconnected is not None and not future.running():
+        done, _ = await asyncio.wait({waiter}, timeout=poll_interval)
+        if done:
+            break
+        if await is_disconnected() and future.cancel():
+            raise JobCancelledError(f"Job {job_id} was cancelled: the client disconnected")
+
+    return await waiter
+
+
+async def wait_for_job(job_id: str, timeout: float | None = None) -> dict:
+    """
+    Wait (without holding the event loop) until the job finishes or the
+    timeout elapses, then return its status.
+    """
+    future = get_job(job_id)["future"]
+
+    if future is not None and not future.done():
+        # asyncio.wait never cancels the wrapped future on timeout
+        waiter = asyncio.wrap_future(future)
+        done, _ = await asyncio.wait({waiter}, timeout=timeout)
+        if waiter in done and not waiter.cancelled():
+            waiter.exception()  # reported through the status payload instead
+
+    return get_job_status(job_id)
+
+
+def iter_job_events(job_id: str, poll_interval: float = 0.5) -> Iterator[dict]:
+    """
+    Yield {"stage": ..., "data": ...} events for a streaming job as the
+    worker publishes them, ending with a "result" or "error" event.
+    Blocking; meant to be iterated from a thread.
+    """
+    job = get_job(job_id)
+    events = job["events"]
+    future = job["future"]
+
+    if events is None:
+        raise RuntimeError(f"Job {job_id} was not submitted with streaming enabled")
+
+    while True:
+        try:
+            stage, data = events.get(timeout=poll_interval)
+            yield {"stage": stage, "data": data}
+            continue
+        except queue.Empty:
+            pass
+
+        if future.done() and events.empty():
+            break
+
+    status = get_job_status(job_id)
+    if status["status"] == "completed":
+        yield {"stage": "result", "data": status["result"]}
+    else:
+        yield {"stage": "error", "data": {"detail": status.get("error")}}
+
+
+def _reset_pool():
+    global _POOL
+
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
+
+
+def shutdown_job_pool():
+    global _MANAGER, _METRICS_QUEUE
+
+    with _POOL_LOCK:
+        _reset_pool()
+        if _MANAGER is not None:
+            _MANAGER.shutdown()
+            _MANAGER = None
+        if _METRICS_QUEUE is not None:
+            _METRICS_QUEUE.put(None)  # stops the merge thread
+            _METRICS_QUEUE = None
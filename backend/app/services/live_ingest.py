@@ -0,0 +1,278 @@
+# app/services/live_ingest.py
+
+import os
+import subprocess
+import threading
+from typing import Dict, List, Optional
+
+import imageio_ffmpeg
+import numpy as np
+
+from app.audio.transcriber import transcribe_audio
+from app.nlp.signals import detect_signals
+from app.schemas.transcription import TranscriptionResult
+from app.services.evaluation_profiles import EvaluationProfile, get_evaluation_profile
+
+SAMPLE_RATE = 16000
+LIVE_FORMATS = ("pcm_f32le", "pcm_s16le", "webm")
+
+# A VAD segment is final once this much silence follows it; only final
+# segments are transcribed while the candidate is still speaking.
+LIVE_MIN_SILENCE_MS = int(os.getenv("LIVE_MIN_SILENCE_MS", "700"))
+# Run VAD again only after this much new audio has arrived.
+LIVE_PROCESS_EVERY_S = float(os.getenv("LIVE_PROCESS_EVERY_S", "1.0"))
+LIVE_MAX_SECONDS = float(os.getenv("LIVE_MAX_SECONDS", "1800"))
+# Live sessions transcribe in the API process (outside the evaluation job
+# pool), so their number is capped to keep Whisper from starving the API.
+LIVE_MAX_SESSIONS = max(1, int(os.getenv("LIVE_MAX_SESSIONS", "2")))
+LIVE_RETRY_AFTER = int(os.getenv("LIVE_RETRY_AFTER", "30"))
+
+_SPEECH_PAD_MS = 200
+_LONG_PAUSE_S = 1.2  # same threshold detect_signals uses between words
+_SAMPLE_BYTES = {"pcm_f32le": 4, "pcm_s16le": 2}
+
+_ACTIVE_SESSIONS = 0
+_SESSIONS_LOCK = threading.Lock()
+
+
+class LiveSessionLimitError(RuntimeError):
+    def __init__(self, retry_after: int):
+        super().__init__(f"Too many live sessions. Retry in {retry_after}s.")
+        self.retry_after = retry_after
+
+
+class LiveDurationError(ValueError):
+    pass
+
+
+def acquire_live_slot():
+    """Reserve one of LIVE_MAX_SESSIONS; release it with release_live_slot."""
+    global _ACTIVE_SESSIONS
+
+    with _SESSIONS_LOCK:
+        if _ACTIVE_SESSIONS >= LIVE_MAX_SESSIONS:
+            raise LiveSessionLimitError(LIVE_RETRY_AFTER)
+        _ACTIVE_SESSIONS += 1
+
+
+def release_live_slot():
+    global _ACTIVE_SESSIONS
+
+    with _SESSIONS_LOCK:
+        _ACTIVE_SESSIONS = max(_ACTIVE_SESSIONS - 1, 0)
+
+
+def _merge_signals(total: Dict, part: Dict):
+    for key, value in part.items():
+        total[key] = total.get(key, 0) + value
+
+
+class _FfmpegStream:
+    """
+    A long-running ffmpeg that turns the MediaRecorder's webm/opus chunks
+    (which cannot be decoded on their own) into 16 kHz f32le PCM as they
+    arrive.
+    """
+
+    def __init__(self, on_pcm):
+        self.proc = subprocess.Popen(
+            [
+                imageio_ffmpeg.get_ffmpeg_exe(), "-loglevel", "error",
+                "-i", "pipe:0", "-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        self._reader = threading.Thread(target=self._read, args=(on_pcm,), daemon=True)
+        self._reader.start()
+
+    def _read(self, on_pcm):
+        pending = b""
+        while True:
+            chunk = self.proc.stdout.read1(1 << 16)
+            if not chunk:
+                break
+            pending += chunk
+            usable = len(pending) - len(pending) % 4
+            on_pcm(np.frombuffer(pending[:usable], dtype=np.float32))
+            pending = pending[usable:]
+
+    def write(self, data: bytes):
+        try:
+            self.proc.stdin.write(data)
+            self.proc.stdin.flush()
+        except BrokenPipeError:
+            # ffmpeg exits on input it cannot decode
+            raise ValueError("Could not decode the audio stream as webm")
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        self._reader.join()
+        self.proc.wait()
+
+
+class LiveTranscriptionSession:
+    """
+    Incremental ingest for one answer. Audio chunks are appended as they
+    arrive; whenever a VAD speech segment is followed by enough silence it
+    is transcribed and its CS signal counts are added to running totals, so
+    finish() only has to handle the tail after the last final segment.
+    """
+
+    def __init__(
+        self,
+        fmt: str,
+        sample_rate: int = SAMPLE_RATE,
+        profile: Optional[EvaluationProfile] = None
+    ):
+        if fmt not in LIVE_FORMATS:
+            raise ValueError(f"format must be one of {LIVE_FORMATS}")
+        if fmt != "webm" and sample_rate != SAMPLE_RATE:
+            raise ValueError(f"PCM audio must be {SAMPLE_RATE} Hz mono")
+
+        self.fmt = fmt
+        self.profile = profile or get_evaluation_profile()
+        self._lock = threading.Lock()
+        self._buf = np.empty(SAMPLE_RATE * 60, dtype=np.float32)
+        self._len = 0
+        self._cursor = 0          # samples before this are transcribed
+        self._checked_at = 0      # buffer length at the last VAD pass
+        # imported here so faster-whisper loads with the first live session
+        from faster_whisper.vad import VadOptions
+
+        self._vad = VadOptions(
+            min_silence_duration_ms=LIVE_MIN_SILENCE_MS,
+            speech_pad_ms=_SPEECH_PAD_MS
+        )
+
+        self.segments: List[Dict] = []
+        self.texts: List[str] = []
+        self.signals: Dict[str, int] = {}
+        self.language: Optional[str] = None
+
+        self._ffmpeg = _FfmpegStream(self._append) if fmt == "webm" else None
+
+    @property
+    def seconds(self) -> float:
+        return self._len / SAMPLE_RATE
+
+    def _append(self, pcm: np.ndarray):
+        with self._lock:
+            if self._len + len(pcm) > len(self._buf):
+                self._buf = np.resize(self._buf, max(len(self._buf) * 2, self._len + len(pcm)))
+            self._buf[self._len:self._len + len(pcm)] = pcm
+            self._len += len(pcm)
+
+    def _audio(self) -> np.ndarray:
+        with self._lock:
+            return self._buf[:self._len]
+
+    def feed(self, data: bytes) -> List[Dict]:
+        """
+        Add a chunk; returns the segments finalized by it (usually none).
+        """
+        if self.seconds > LIVE_MAX_SECONDS:
+            raise LiveDurationError(f"Live answers are limited to {LIVE_MAX_SECONDS:.0f}s")
+
+        width = _SAMPLE_BYTES.get(self.fmt)
+        if width and len(data) % width:
+            raise ValueError(
+                f"{self.fmt} chunks must hold whole {width}-byte samples; got {len(data)} bytes"
+            )
+
+        if self._ffmpeg is not None:
+            self._ffmpeg.write(data)
+        elif self.fmt == "pcm_s16le":
+            self._append(np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0)
+        else:
+            self._append(np.frombuffer(data, dtype="<f4"))
+
+        if self._len - self._checked_at < LIVE_PROCESS_EVERY_S * SAMPLE_RATE:
+            return []
+        self._checked_at = self._len
+        return self._process(final=False)
+
+    def _process(self, final: bool) -> List[Dict]:
+        audio = self._audio()
+        pending = audio[self._cursor:]
+        if not len(pending):
+            return []
+
+        if final:
+            end = len(pending)
+        else:
+            silence = LIVE_MIN_SILENCE_MS * SAMPLE_RATE // 1000
+            from faster_whisper.vad import get_speech_timestamps
+
+            speech = get_speech_timestamps(pending, self._vad)
+            closed = [s for s in speech if s["end"] + silence <= len(pending)]
+            if not closed:
+                return []
+            end = min(closed[-1]["end"] + _SPEECH_PAD_MS * SAMPLE_RATE // 1000, len(pending))
+
+        new_segments = self._transcribe(pending[:end], self._cursor / SAMPLE_RATE)
+        self._cursor += end
+        return new_segments
+
+    def _transcribe(self, chunk: np.ndarray, offset: float) -> List[Dict]:
+        tr = transcribe_audio(
+            chunk,
+            self.profile.whisper_model,
+            self.profile.whisper_beam_size,
+            self.profile.word_timestamps
+        )
+        self.language = self.language or tr.language
+
+        segments = []
+        for seg in tr.segments:
+            segments.append({
+                "start": seg["start"] + offset,
+                "end": seg["end"] + offset,
+                "text": seg["text"],
+                "words": [
+                    {**w, "start": w["start"] + offset, "end": w["end"] + offset}
+                    for w in seg["words"]
+                ],
+            })
+        if not segments:
+            return []
+
+        part = detect_signals(tr.text, segments)
+        # a long pause between the previous chunk's last word and this
+        # chunk's first word is only visible across the boundary
+        prev_words = [w for s in self.segments for w in s["words"]][-1:]
+        next_words = [w for s in segments for w in s["words"]][:1]
+        if prev_words and next_words and next_words[0]["start"] - prev_words[0]["end"] > _LONG_PAUSE_S:
+            part["long_pauses"] += 1
+
+        _merge_signals(self.signals, part)
+        self.segments.extend(segments)
+        self.texts.append(tr.text)
+        return segments
+
+    def finish(self):
+        """
+        Flush the decoder, transcribe the tail and return
+        (audio, TranscriptionResult, signals).
+        """
+        if self._ffmpeg is not None:
+            self._ffmpeg.close()
+        self._process(final=True)
+
+        words = [w for s in self.segments for w in s["words"]]
+        transcription = TranscriptionResult(
+            text=" ".join(t.strip() for t in self.texts if t.strip()),
+            segments=self.segments,
+            language=self.language or "",
+            duration=float(words[-1]["end"] - words[0]["start"]) if words else 0.0,
+            num_segments=len(self.segments)
+        )
+        return self._audio().copy(), transcription, dict(self.signals)
+
+    def close(self):
+        if self._ffmpeg is not None and self._ffmpeg.proc.poll() is None:
+            self._ffmpeg.proc.kill()
@@ -0,0 +1,87 @@
+# app/services/llm_evaluation_service.py
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.models.llm_runner import run_llm
+from app.prompts.evaluation_prompt import (
+    FUSED_PROMPT_PREFIX,
+    build_fused_evaluation_prompt,
+    build_fused_output_schema,
+)
+from app.schemas.tcs import TechnicalEvaluationResult
+from app.services.evaluation_profiles import EvaluationProfile, get_evaluation_profile
+from app.services.placement_service import generate_placement_feedback, parse_placement_output
+from app.services.tcs_service import compute_tcs, parse_tcs_output
+from app.utils.metrics import timed_stage
+
+# sequential: TCS generation, then placement generation (original behaviour)
+# batched:    both prompts submitted together so the scheduler runs them as
+#             one batched generate call
+# fused:      one prompt + schema returning both blocks; transcript prefilled once
+LLM_EVALUATION_MODES = ("sequential", "batched", "fused")
+LLM_EVALUATION_MODE = os.getenv("LLM_EVALUATION_MODE", "batched")
+
+
+def run_tcs_and_placement(
+    transcript: str,
+    questions: str | List[str] | None,
+    mode: Optional[str] = None,
+    on_tcs: Optional[Callable[[TechnicalEvaluationResult], None]] = None,
+    profile: Optional[EvaluationProfile] = None,
+    timings: Optional[Dict[str, float]] = None
+) -> Tuple[TechnicalEvaluationResult, Optional[dict]]:
+    """
+    Produce the TCS result and placement feedback with the selected mode.
+    on_tcs is called as soon as the TCS result is available. The profile
+    sets the token budgets and output schemas; profiles without placement return None for it.
+    If timings is given, the seconds of each generation (tcs, placement or
+    fused) are stored in it.
+    """
+    mode = mode or LLM_EVALUATION_MODE
+    if mode not in LLM_EVALUATION_MODES:
+        raise ValueError(f"Unknown LLM evaluation mode '{mode}'. Expected one of {LLM_EVALUATION_MODES}")
+    profile = profile or get_evaluation_profile()
+    tcs_tokens = profile.tcs_max_new_tokens
+    placement_tokens = profile.placement_max_new_tokens
+
+    def tcs_stage() -> TechnicalEvaluationResult:
+        with timed_stage("tcs", timings):
+            return compute_tcs(transcript, questions, tcs_tokens, profile.tcs_schema())
+
+    def placement_stage() -> dict:
+        with timed_stage("placement", timings):
+            return generate_placement_feedback(
+                transcript, questions, placement_tokens, profile.placement_schema()
+            )
+
+    if mode == "sequential" or not placement_tokens:
+        tcs = tcs_stage()
+        if on_tcs is not None:
+            on_tcs(tcs)
+        if not placement_tokens:
+            return tcs, None
+        return tcs, placement_stage()
+
+    if mode == "batched":
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            placement_future = pool.submit(placement_stage)
+            tcs = tcs_stage()
+            if on_tcs is not None:
+                on_tcs(tcs)
+            return tcs, placement_future.result()
+
+    with timed_stage("fused", timings):
+        raw = run_llm(
+            build_fused_evaluation_prompt(questions, transcript),
+            max_new_tokens=tcs_tokens + placement_tokens,
+            prefix=FUSED_PROMPT_PREFIX,
+            schema=build_fused_output_schema(profile.tcs_schema(), profile.placement_schema()),
+            task="fused",
+            validate=lambda raw: parse_tcs_output(raw.get("tcs") or {})
+        )
+    tcs = parse_tcs_output(raw.get("tcs") or {})
+    if on_tcs is not None:
+        on_tcs(tcs)
+    return tcs, parse_placement_output(raw.get("placement") or {})
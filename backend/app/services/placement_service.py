@@ -2,24 +2,42 @@
 
 from typing import List
 from app.models.llm_runner import run_llm
-from app.prompts.placement_prompt import build_placement_coaching_prompt
+from app.prompts.placement_prompt import (
+    PLACEMENT_OUTPUT_SCHEMA,
+    PLACEMENT_PROMPT_PREFIX,
+    build_placement_coaching_prompt,
+)
 
 
 def run_placement_coaching_llm(
     transcript: str,
-    question: str | List[str] | None = None
+    question: str | List[str] | None = None,
+    max_new_tokens: int = 1200,
+    schema: dict = PLACEMENT_OUTPUT_SCHEMA
 ) -> dict:
     prompt = build_placement_coaching_prompt(question, transcript)
-    return run_llm(prompt, max_new_tokens=1200)
+    return run_llm(
+        prompt,
+        max_new_tokens=max_new_tokens,
+        prefix=PLACEMENT_PROMPT_PREFIX,
+        schema=schema,
+        task="placement"
+    )
 
 
 def generate_placement_feedback(
     transcript: str,
-    question: str | List[str] | None = None
+    question: str | List[str] | None = None,
+    max_new_tokens: int = 1200,
+    schema: dict = PLACEMENT_OUTPUT_SCHEMA
 ) -> dict:
 
-    raw = run_placement_coaching_llm(transcript, question)
+    return parse_placement_output(
+        run_placement_coaching_llm(transcript, question, max_new_tokens, schema)
+    )
+
 
+def parse_placement_output(raw: dict) -> dict:
     # ---- Safe list extraction (NON-DESTRUCTIVE) ----
     def ensure_list(value, fallback):
         if isinstance(value, list) and len(value) > 0:
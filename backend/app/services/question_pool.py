@@ -0,0 +1,287 @@
+# app/services/question_pool.py
+
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.schemas.question import QuestionGenerationRequest
+from app.services.question_service import EXPECTED_COUNTS, generate_interview_questions
+from app.utils.metrics import CACHE_LOOKUPS
+
+QUESTION_CACHE_MAX_KEYS = int(os.getenv("QUESTION_CACHE_MAX_KEYS", "256"))
+QUESTION_CACHE_TTL = float(os.getenv("QUESTION_CACHE_TTL", "86400"))
+# A key becomes "popular" after this many requests; popular pools are
+# refilled in the background until they hold QUESTION_POOL_BATCHES
+# generations worth of distinct questions.
+QUESTION_POOL_POPULAR_HITS = int(os.getenv("QUESTION_POOL_POPULAR_HITS", "2"))
+QUESTION_POOL_BATCHES = int(os.getenv("QUESTION_POOL_BATCHES", "4"))
+QUESTION_SESSION_MAX = int(os.getenv("QUESTION_SESSION_MAX", "4096"))
+# Decoding is greedy, so the same prompt always yields the same batch.
+# Every generation for a key lists (up to this many of) the questions it
+# already has in the prompt, so each batch asks for new ones.
+QUESTION_AVOID_MAX = int(os.getenv("QUESTION_AVOID_MAX", "24"))
+# Generations tried for a session that has used up its pool before giving up
+QUESTION_FRESH_ATTEMPTS = max(1, int(os.getenv("QUESTION_FRESH_ATTEMPTS", "3")))
+
+PoolKey = Tuple[str, str, str, str]
+
+# -----------------------------
+# In-memory LRU + TTL question pools
+# -----------------------------
+_POOLS: "OrderedDict[PoolKey, Dict]" = OrderedDict()
+# session id -> questions already served to it (LRU bounded)
+_SESSIONS: "OrderedDict[str, Set[str]]" = OrderedDict()
+_LOCK = threading.Lock()
+
+_REFILL_POOL = None  # cached
+
+_STATS = {
+    "hits": 0,
+    "misses": 0,
+    "refills": 0,
+    "refill_errors": 0,
+    "exhausted": 0,
+}
+
+
+class QuestionPoolExhaustedError(RuntimeError):
+    pass
+
+
+def _normalize(value: str) -> str:
+    return " ".join(value.split()).lower()
+
+
+def pool_key(req: QuestionGenerationRequest) -> PoolKey:
+    return (
+        _normalize(req.role),
+        _normalize(req.experience),
+        _normalize(req.company_type),
+        _normalize(req.interview_round),
+    )
+
+
+def _canonical_round(interview_round: str) -> str:
+    for name in EXPECTED_COUNTS:
+        if name.lower() == _normalize(interview_round):
+            return name
+    return interview_round.strip()
+
+
+def _get_refill_pool() -> ThreadPoolExecutor:
+    global _REFILL_POOL
+
+    if _REFILL_POOL is None:
+        _REFILL_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="question-refill")
+    return _REFILL_POOL
+
+
+def _add_questions(entry: Dict, questions: List[str]):
+    # caller holds _LOCK
+    seen = {_normalize(q) for q in entry["questions"]}
+    for q in questions:
+        if _normalize(q) not in seen:
+            seen.add(_normalize(q))
+            entry["questions"].append(q)
+
+
+def _fresh(questions: List[str], seen: Set[str]) -> List[str]:
+    # questions not in seen (normalized), without duplicates, in order
+    out, taken = [], set(seen)
+    for q in questions:
+        if _normalize(q) not in taken:
+            taken.add(_normalize(q))
+            out.append(q)
+    return out
+
+
+def _avoid_list(entry: Optional[Dict], seen: Set[str], first: List[str] = ()) -> List[str]:
+    # caller holds _LOCK; `first`, then the session's questions, then the
+    # newest in the pool
+    pooled = entry["questions"] if entry is not None else []
+    served = [q for q in pooled if _normalize(q) in seen]
+    rest = [q for q in reversed(pooled) if _normalize(q) not in seen]
+    return _fresh(list(first) + served + rest, set())[:QUESTION_AVOID_MAX]
+
+
+def _lookup(key: PoolKey) -> Optional[Dict]:
+    # caller holds _LOCK
+    entry = _POOLS.get(key)
+    if entry is None:
+        return None
+    if time.time() - entry["created_at"] > QUESTION_CACHE_TTL:
+        del _POOLS[key]
+        return None
+    _POOLS.move_to_end(key)
+    return entry
+
+
+def _store(key: PoolKey, req: QuestionGenerationRequest, questions: List[str]) -> Dict:
+    # caller holds _LOCK
+    entry = _lookup(key)
+    if entry is None:
+        entry = {
+            "created_at": time.time(),
+            "request": req,
+            "questions": [],
+            "batch_size": len(questions),
+            "hits": 0,
+            "refilling": False,
+            "stalled": False,
+        }
+        _POOLS[key] = entry
+        while len(_POOLS) > QUESTION_CACHE_MAX_KEYS:
+            _POOLS.popitem(last=False)
+
+    _add_questions(entry, questions)
+    return entry
+
+
+def _refill(key: PoolKey, req: QuestionGenerationRequest):
+    with _LOCK:
+        avoid = _avoid_list(_POOLS.get(key), set())
+    try:
+        # a cached reply to this prompt is the batch the pool already holds
+        questions = generate_interview_questions(req, avoid=avoid, use_cache=False)
+    except Exception:
+        with _LOCK:
+            _STATS["refill_errors"] += 1
+            entry = _POOLS.get(key)
+            if entry is not None:
+                entry["refilling"] = False
+        return
+
+    with _LOCK:
+        _STATS["refills"] += 1
+        before = len(_POOLS[key]["questions"]) if key in _POOLS else 0
+        entry = _store(key, req, questions)
+        entry["refilling"] = False
+        # a refill that added nothing would run the same prompt (and get the
+        # same greedy batch) again, so stop refilling this key
+        if len(entry["questions"]) == before:
+            entry["stalled"] = True
+        if _needs_refill(entry, len(questions)):
+            _schedule_refill(key, entry)
+
+
+def _needs_refill(entry: Dict, count: int) -> bool:
+    return (
+        not entry["stalled"]
+        and entry["hits"] >= QUESTION_POOL_POPULAR_HITS
+        and len(entry["questions"]) < count * QUESTION_POOL_BATCHES
+    )
+
+
+def _schedule_refill(key: PoolKey, entry: Dict):
+    # caller holds _LOCK
+    if not entry["refilling"]:
+        entry["refilling"] = True
+        _get_refill_pool().submit(_refill, key, entry["request"])
+
+
+def _session_seen(session_id: Optional[str]) -> Set[str]:
+    # caller holds _LOCK
+    if session_id is None:
+        return set()
+    seen = _SESSIONS.get(session_id)
+    if seen is None:
+        seen = _SESSIONS[session_id] = set()
+        while len(_SESSIONS) > QUESTION_SESSION_MAX:
+            _SESSIONS.popitem(last=False)
+    _SESSIONS.move_to_end(session_id)
+    return seen
+
+
+def _sample(entry: Dict, count: int, seen: Set[str]) -> Optional[List[str]]:
+    # caller holds _LOCK; keeps pool order so questions still progress naturally
+    fresh = [q for q in entry["questions"] if _normalize(q) not in seen]
+    if len(fresh) < count:
+        return None
+    picked = set(random.sample(range(len(fresh)), count))
+    return [q for i, q in enumerate(fresh) if i in picked]
+
+
+def get_pooled_questions(
+    req: QuestionGenerationRequest,
+    session_id: Optional[str] = None
+) -> List[str]:
+    """
+    Serve interview questions from the pool for this request's normalized
+    key, generating only on a miss. Within a session no question repeats;
+    raises QuestionPoolExhaustedError when the model keeps returning
+    questions the session has already had.
+    """
+    req = req.model_copy(update={"interview_round": _canonical_round(req.interview_round)})
+    key = pool_key(req)
+    count = EXPECTED_COUNTS.get(req.interview_round)
+
+    with _LOCK:
+        entry = _lookup(key)
+        seen = _session_seen(session_id)
+        if entry is not None:
+            entry["hits"] += 1
+            picked = _sample(entry, count or entry["batch_size"], seen)
+            if picked is not None:
+                _STATS["hits"] += 1
+                CACHE_LOOKUPS.inc("question_pool", "hit")
+                if _needs_refill(entry, len(picked)):
+                    _schedule_refill(key, entry)
+                seen.update(_normalize(q) for q in picked)
+                return picked
+
+        _STATS["misses"] += 1
+        CACHE_LOOKUPS.inc("question_pool", "miss")
+
+    # Miss, or the session has used up the pool: generate synchronously,
+    # listing what the session (and the pool) already has in the prompt.
+    picked: List[str] = []
+    repeated: List[str] = []  # returned again by an earlier attempt; listed first
+    for _ in range(QUESTION_FRESH_ATTEMPTS):
+        with _LOCK:
+            avoid = _avoid_list(_lookup(key), seen, repeated + picked)
+        questions = generate_interview_questions(req, avoid=avoid)
+
+        with _LOCK:
+            entry = _store(key, req, questions)
+            entry["hits"] = max(entry["hits"], 1)
+            want = count or entry["batch_size"]
+            fresh = _fresh(questions, seen | {_normalize(q) for q in picked})
+            repeated += [q for q in questions if q not in fresh]
+            picked += fresh
+            if len(picked) < want:
+                # top up from the pool (a refill may have landed meanwhile)
+                taken = seen | {_normalize(q) for q in picked}
+                available = len(_fresh(entry["questions"], taken))
+                picked += _sample(entry, min(want - len(picked), available), taken)
+            if len(picked) >= want:
+                picked = picked[:want]
+                if _needs_refill(entry, want):
+                    _schedule_refill(key, entry)
+                _session_seen(session_id).update(_normalize(q) for q in picked)
+                return picked
+
+    with _LOCK:
+        _STATS["exhausted"] += 1
+    raise QuestionPoolExhaustedError(
+        f"Could not generate new {req.interview_round} questions for this session; "
+        "start a new session."
+    )
+
+
+def get_question_pool_stats() -> Dict[str, int]:
+    with _LOCK:
+        return dict(
+            _STATS,
+            keys=len(_POOLS),
+            pooled_questions=sum(len(e["questions"]) for e in _POOLS.values()),
+        )
+
+
+def clear_question_pool():
+    with _LOCK:
+        _POOLS.clear()
+        _SESSIONS.clear()
@@ -1,9 +1,13 @@
 # app/services/question_service.py
 
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence
 from app.schemas.question import QuestionGenerationRequest
-from app.prompts.question_prompt import build_question_generation_prompt
+from app.prompts.question_prompt import (
+    build_question_generation_prompt,
+    build_question_output_schema,
+)
 from app.models.question_llm_runner import run_llm_question
+from app.utils.metrics import timed_stage
 
 
 EXPECTED_COUNTS = {
@@ -15,12 +19,26 @@ EXPECTED_COUNTS = {
 }
 
 
-def generate_interview_questions(req: QuestionGenerationRequest) -> List[str]:
-    response: Dict = run_llm_question(
-        build_question_generation_prompt(req),
-        max_new_tokens=512
-    )
+def generate_interview_questions(
+    req: QuestionGenerationRequest,
+    avoid: Sequence[str] = (),
+    use_cache: Optional[bool] = None
+) -> List[str]:
+    # avoid: questions the model is asked not to repeat
+    # use_cache: False bypasses the LLM response cache (default: LLM_CACHE)
+    with timed_stage("questions"):
+        response: Dict = run_llm_question(
+            build_question_generation_prompt(req, avoid),
+            max_new_tokens=512,
+            schema=build_question_output_schema(EXPECTED_COUNTS.get(req.interview_round)),
+            use_cache=use_cache,
+            validate=lambda response: parse_questions(response, req.interview_round)
+        )
 
+    return parse_questions(response, req.interview_round)
+
+
+def parse_questions(response: Dict, interview_round: str) -> List[str]:
     if "questions" not in response:
         raise RuntimeError("LLM response missing 'questions' field")
 
@@ -29,13 +47,13 @@ def generate_interview_questions(req: QuestionGenerationRequest) -> List[str]:
 
     questions = [str(q).strip() for q in response["questions"] if str(q).strip()]
 
-    expected = EXPECTED_COUNTS.get(req.interview_round)
+    expected = EXPECTED_COUNTS.get(interview_round)
     if expected:
         if len(questions) > expected:
             questions = questions[:expected]
         elif len(questions) < expected:
             raise RuntimeError(
-                f"Expected {expected} questions for {req.interview_round} round, "
+                f"Expected {expected} questions for {interview_round} round, "
                 f"got {len(questions)}. Raw: {response}"
             )
 
@@ -1,7 +1,7 @@
 # app/services/tcs_service.py
 
 from typing import List
-from app.prompts.tcs_prompt import build_tcs_prompt
+from app.prompts.tcs_prompt import TCS_OUTPUT_SCHEMA, TCS_PROMPT_PREFIX, build_tcs_prompt
 from app.schemas.tcs import TechnicalEvaluationResult
 from app.models.llm_runner import run_llm
 
@@ -20,7 +20,9 @@ def bucket_tcs(score: int) -> str:
 
 def run_tcs_llm(
     transcript: str,
-    question: str | List[str] | None = None
+    question: str | List[str] | None = None,
+    max_new_tokens: int = 1600,
+    schema: dict = TCS_OUTPUT_SCHEMA
 ) -> dict:
 
     if question is None:
@@ -28,17 +30,25 @@ def run_tcs_llm(
 
     return run_llm(
         build_tcs_prompt(question, transcript),
-        max_new_tokens=1600
+        max_new_tokens=max_new_tokens,
+        prefix=TCS_PROMPT_PREFIX,
+        schema=schema,
+        task="tcs",
+        validate=parse_tcs_output
     )
 
 
 def compute_tcs(
     transcript: str,
-    question: str | List[str] | None = None
+    question: str | List[str] | None = None,
+    max_new_tokens: int = 1600,
+    schema: dict = TCS_OUTPUT_SCHEMA
 ) -> TechnicalEvaluationResult:
 
-    raw = run_tcs_llm(transcript, question)
+    return parse_tcs_output(run_tcs_llm(transcript, question, max_new_tokens, schema))
 
+
+def parse_tcs_output(raw: dict) -> TechnicalEvaluationResult:
     if "score" not in raw:
         raise RuntimeError(f"TCS output missing 'score'. Raw response: {raw}")
 
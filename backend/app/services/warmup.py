@@ -0,0 +1,160 @@
+# app/services/warmup.py
+
+import os
+import threading
+import time
+from contextlib import ExitStack
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+# lazy: heavy libraries and models load on first use; the process starts in
+#       about a second and is ready at once, but the first requests are slow
+# warm: the lifespan preloads WARMUP_MODELS in every evaluation worker, and
+#       those the API process uses itself (API_WARMUP_MODELS) here, and runs
+#       one dummy inference on each; /ready answers 503 until that has
+#       finished
+STARTUP_MODES = ("lazy", "warm")
+STARTUP_MODE = os.getenv("STARTUP_MODE", "lazy")
+WARMUP_MODEL_NAMES = ("whisper", "sentiment", "spacy", "llm")
+WARMUP_MODELS = tuple(
+    m.strip() for m in os.getenv("WARMUP_MODELS", ",".join(WARMUP_MODEL_NAMES)).split(",")
+    if m.strip()
+)
+# question generation runs the LLM in the API process, live ingest
+# (/ws/live) Whisper and the spaCy signals
+API_WARMUP_MODELS = ("llm", "whisper", "spacy")
+
+_STATE = {
+    "mode": STARTUP_MODE,
+    "status": "ready" if STARTUP_MODE != "warm" else "starting",
+    "seconds": None,
+    "api": {},
+    "workers": [],
+}
+_STATE_LOCK = threading.Lock()
+
+_WORKER_REPORT: Dict[str, dict] = {}  # set by warm_worker inside each worker
+
+
+def _warm_whisper() -> Optional[str]:
+    from app.audio.transcriber import SAMPLE_RATE, get_whisper_pool
+    from app.services.evaluation_profiles import get_evaluation_profile
+
+    profile = get_evaluation_profile()
+    pool = get_whisper_pool(profile.whisper_model)
+    # noise with the VAD off, so the encoder and decoder really run
+    audio = np.random.default_rng(0).normal(0, 0.05, SAMPLE_RATE).astype(np.float32)
+    with ExitStack() as stack:
+        for _ in range(pool.size):
+            model = stack.enter_context(pool.acquire())
+            segments, _ = model.transcribe(audio, beam_size=1, vad_filter=False)
+            list(segments)
+    return profile.whisper_model
+
+
+def _warm_sentiment() -> Optional[str]:
+    from app.services.interview_analysis import _run_sentiment
+
+    _run_sentiment("Thanks for having me today.")
+    return None
+
+
+def _warm_spacy() -> Optional[str]:
+    from app.nlp import linguistics
+    from app.nlp.signals import detect_signals
+
+    detect_signals("I built the service and it was deployed by the team.", [])
+    return linguistics.NLP_MODE
+
+
+def _warm_llm() -> Optional[str]:
+    from app.models.generation_scheduler import get_generation_scheduler
+
+    # loads the model and its prefix caches, then one decode step
+    get_generation_scheduler().generate("Hello", max_new_tokens=1, max_length=32)
+    return None
+
+
+_WARMERS = {
+    "whisper": _warm_whisper,
+    "sentiment": _warm_sentiment,
+    "spacy": _warm_spacy,
+    "llm": _warm_llm,
+}
+
+
+def warm_models(models: Iterable[str]) -> Dict[str, dict]:
+    """
+    Load each model and run a dummy inference. Returns per model
+    {"seconds": ...} plus "detail", or {"error": ...}; never raises.
+    """
+    report = {}
+    for name in models:
+        start = time.perf_counter()
+        try:
+            if name not in _WARMERS:
+                raise ValueError(f"Unknown warm-up model '{name}'. Expected one of {WARMUP_MODEL_NAMES}")
+            detail = _WARMERS[name]()
+            report[name] = {"seconds": round(time.perf_counter() - start, 3)}
+            if detail:
+                report[name]["detail"] = detail
+        except Exception as e:
+            report[name] = {"error": f"{type(e).__name__}: {e}"}
+    return report
+
+
+def warm_worker(models: Iterable[str]):
+    # ProcessPoolExecutor initializer; an exception here would break the pool
+    global _WORKER_REPORT
+    _WORKER_REPORT = warm_models(models)
+
+
+def worker_warmup_report(barrier=None, timeout: Optional[float] = None) -> dict:
+    """
+    This worker's warm-up report. With a barrier (for as many parties as
+    there are workers) the task holds its worker until every worker runs
+    one, so N such tasks are answered by N distinct workers.
+    """
+    report = {"pid": os.getpid(), "models": _WORKER_REPORT}
+    if barrier is not None:
+        try:
+            barrier.wait(timeout)
+        except Exception as e:
+            report["error"] = f"not every worker started: {type(e).__name__}"
+    return report
+
+
+def run_startup_warmup():
+    """
+    Warm the API process (API_WARMUP_MODELS) and every evaluation worker.
+    Called from the lifespan on a thread.
+    """
+    from app.services.job_service import warm_job_pool
+
+    start = time.perf_counter()
+    with _STATE_LOCK:
+        _STATE["status"] = "warming"
+
+    api = warm_models([m for m in WARMUP_MODELS if m in API_WARMUP_MODELS])
+    try:
+        workers = warm_job_pool()
+    except Exception as e:
+        workers = [{"error": f"{type(e).__name__}: {e}"}]
+
+    failed = any("error" in r for r in api.values()) or any(
+        "error" in w or any("error" in r for r in w["models"].values())
+        for w in workers
+    )
+    with _STATE_LOCK:
+        _STATE.update(
+            status="failed" if failed else "ready",
+            seconds=round(time.perf_counter() - start, 3),
+            api=api,
+            workers=workers,
+        )
+
+
+def get_readiness() -> dict:
+    with _STATE_LOCK:
+        return dict(_STATE)
@@ -0,0 +1,65 @@
+# app/store/job_store.py
+
+from typing import Dict, Any, List
+import os
+import threading
+import uuid
+import time
+
+JOB_TTL_SECONDS = float(os.getenv("EVALUATION_JOB_TTL", "3600"))
+
+# -----------------------------
+# In-memory evaluation job store
+# -----------------------------
+_JOBS: Dict[str, Dict[str, Any]] = {}
+_LOCK = threading.Lock()
+
+
+def create_job(metadata: Dict[str, Any]) -> str:
+    """
+    Register a new evaluation job and return its id.
+    """
+    job_id = str(uuid.uuid4())
+
+    with _LOCK:
+        _JOBS[job_id] = {
+            "created_at": time.time(),
+            "finished_at": None,
+            "metadata": metadata,
+            "future": None,
+            "events": None,
+            "error": None,
+        }
+
+    return job_id
+
+
+def get_job(job_id: str) -> Dict[str, Any]:
+    with _LOCK:
+        if job_id not in _JOBS:
+            raise KeyError(f"Job {job_id} not found")
+        return _JOBS[job_id]
+
+
+def update_job(job_id: str, updates: Dict[str, Any]):
+    with _LOCK:
+        if job_id not in _JOBS:
+            raise KeyError(f"Job {job_id} not found")
+        _JOBS[job_id].update(updates)
+
+
+def purge_expired_jobs() -> List[str]:
+    """
+    Drop finished jobs whose results have been kept longer than the TTL.
+    """
+    cutoff = time.time() - JOB_TTL_SECONDS
+
+    with _LOCK:
+        expired = [
+            job_id for job_id, job in _JOBS.items()
+            if job["finished_at"] is not None and job["finished_at"] < cutoff
+        ]
+        for job_id in expired:
+            _JOBS.pop(job_id, None)
+
+    return expired
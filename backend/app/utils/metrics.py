@@ -0,0 +1,256 @@
+# app/utils/metrics.py
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# A small in-process metrics registry rendered in the Prometheus text
+# format on /metrics. Label values are passed positionally, in labelnames
+# order, so recording one observation is a dict lookup, a bisect and a
+# few adds under a lock (about a microsecond).
+#
+# Evaluations run in worker processes: each worker drains its registry
+# after every job and the API process merges the deltas (see job_service),
+# so /metrics covers the whole pool.
+
+SECONDS_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1, 2.5, 5, 10, 30, 60, 120, 300, 600,
+)
+TOKENS_PER_SECOND_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+BATCH_SIZE_BUCKETS = (1, 2, 3, 4, 6, 8, 12, 16)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, "_Metric"] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: "_Metric"):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric '{metric.name}' is already registered")
+            self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def drain(self) -> Dict[str, dict]:
+        """
+        Counter and histogram values recorded since the last drain, reset
+        to zero. Gauges describe this process and are not included.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {m.name: delta for m in metrics if (delta := m.drain())}
+
+    def merge(self, deltas: Dict[str, dict]):
+        with self._lock:
+            metrics = dict(self._metrics)
+        for name, delta in deltas.items():
+            if name in metrics:
+                metrics[name].merge(delta)
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), registry: Registry = REGISTRY):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def drain(self) -> dict:
+        return {}
+
+    def merge(self, delta: dict):
+        pass
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in values]
+
+    def drain(self) -> dict:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, delta: dict):
+        with self._lock:
+            for labels, value in delta.items():
+                self._values[labels] = self._values.get(labels, 0) + value
+
+
+class Gauge(_Metric):
+    """
+    A value set directly, or read from fn (which returns
+    {label values: value}) whenever /metrics is scraped.
+    """
+
+    type = "gauge"
+
+    def __init__(self, *args, fn: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fn = fn
+
+    def set(self, value: float, *labels: str):
+        with self._lock:
+            self._values[labels] = value
+
+    def samples(self) -> List[str]:
+        if self._fn is not None:
+            values = sorted(self._fn().items())
+        else:
+            with self._lock:
+                values = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in values]
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, *args, buckets: Tuple[float, ...] = SECONDS_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str):
+        # per series: [count per bucket (last is +Inf), sum]
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][i] += 1
+            series[1] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((k, (list(v[0]), v[1])) for k, v in self._values.items())
+
+        lines = []
+        for labels, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = _labels(self.labelnames, labels, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+    def drain(self) -> dict:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, delta: dict):
+        with self._lock:
+            for labels, (counts, total) in delta.items():
+                series = self._values.get(labels)
+                if series is None:
+                    series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+                for i, count in enumerate(counts):
+                    series[0][i] += count
+                series[1] += total
+
+
+# -----------------------------
+# Application metrics
+# -----------------------------
+STAGE_SECONDS = Histogram(
+    "interview_stage_seconds",
+    "Wall time of each evaluation and question generation stage.",
+    ("stage",)
+)
+LLM_PREFILL_SECONDS = Histogram(
+    "llm_prefill_seconds",
+    "Time to the first generated token of a batch, per task in the batch.",
+    ("task",)
+)
+LLM_DECODE_SECONDS = Histogram(
+    "llm_decode_seconds",
+    "Time from the first to the last generated token of a batch, per task in the batch.",
+    ("task",)
+)
+LLM_GENERATED_TOKENS = Counter(
+    "llm_generated_tokens_total",
+    "Tokens generated, per task.",
+    ("task",)
+)
+LLM_TOKENS_PER_SECOND = Histogram(
+    "llm_tokens_per_second",
+    "Generated tokens per second of generate time, per request.",
+    ("task",),
+    buckets=TOKENS_PER_SECOND_BUCKETS
+)
+LLM_BATCH_SIZE = Histogram(
+    "llm_batch_size",
+    "Requests per batched generate call.",
+    buckets=BATCH_SIZE_BUCKETS
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ("cache", "result")
+)
+
+
+@contextmanager
+def timed_stage(stage: str, timings: Optional[Dict[str, float]] = None):
+    """
+    Observe the block's wall time in STAGE_SECONDS; if timings is given the
+    seconds are also stored there under the stage name.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        STAGE_SECONDS.observe(seconds, stage)
+        if timings is not None:
+            timings[stage] = round(seconds, 4)
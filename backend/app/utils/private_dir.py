@@ -0,0 +1,34 @@
+# app/utils/private_dir.py
+
+import os
+import stat
+import tempfile
+
+# Caches and profiles hold transcripts, model replies and stack frames, so
+# they live in per-user directories nobody else can read or write into.
+
+
+def default_private_dir(name: str) -> str:
+    """<tempdir>/<name>-<uid> (just <name> where there are no uids)."""
+    suffix = f"-{os.getuid()}" if hasattr(os, "getuid") else ""
+    return os.path.join(tempfile.gettempdir(), name + suffix)
+
+
+def ensure_private_dir(path: str, env_var: str) -> str:
+    """
+    Create path with mode 0o700 if missing and return it. Raises
+    RuntimeError if it is not a directory or belongs to another user; our
+    own directory is tightened to 0o700 if others can reach it.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        raise RuntimeError(f"{path} is not a directory; set {env_var} to a private directory")
+    if hasattr(os, "getuid"):
+        if st.st_uid != os.getuid():
+            raise RuntimeError(
+                f"{path} belongs to another user; set {env_var} to a private directory"
+            )
+        if stat.S_IMODE(st.st_mode) & 0o077:
+            os.chmod(path, 0o700)
+    return path
@@ -0,0 +1,195 @@
+# app/utils/profiling.py
+
+import collections
+import cProfile
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from typing import Callable, Optional, Tuple
+
+from app.utils.private_dir import default_private_dir, ensure_private_dir
+
+# Opt-in profiling of a single request (X-Profiler header or ?profiler=).
+# sample:   a thread that snapshots every thread's stack each
+#           PROFILE_SAMPLE_INTERVAL_MS; written as collapsed stacks
+#           ("thread;outer;...;inner count", flamegraph.pl / speedscope).
+#           Sees the stage threads and the generation scheduler too.
+# cprofile: deterministic, the calling thread only; written as pstats.
+#           Evaluations run on stage threads and the generation scheduler,
+#           so /evaluate only accepts sample (THREADED_PROFILE_MODES).
+# Profiling slows the request down, so it is off unless REQUEST_PROFILING=1
+# and rate limited: at most one profiled request at a time and
+# PROFILE_MAX_PER_WINDOW per window. Profiles show stack frames and request
+# data, so PROFILE_DIR is a private per-user directory (0o700, refused if
+# someone else owns it).
+PROFILING_ENABLED = os.getenv("REQUEST_PROFILING", "0") == "1"
+PROFILE_MODES = ("sample", "cprofile")
+THREADED_PROFILE_MODES = ("sample",)  # modes that see every thread
+PROFILE_DIR = os.getenv("PROFILE_DIR", default_private_dir("interview-profiles"))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+PROFILE_MAX_PER_WINDOW = int(os.getenv("PROFILE_MAX_PER_WINDOW", "3"))
+PROFILE_WINDOW_SECONDS = float(os.getenv("PROFILE_WINDOW_SECONDS", "300"))
+PROFILE_MAX_ARTIFACTS = int(os.getenv("PROFILE_MAX_ARTIFACTS", "50"))
+
+_EXTENSIONS = {"sample": ".collapsed", "cprofile": ".pstats"}
+_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+_RECENT = collections.deque()  # start times inside the window
+_ACTIVE = 0
+_LIMIT_LOCK = threading.Lock()
+
+
+class ProfileRateLimitError(RuntimeError):
+    def __init__(self, retry_after: int):
+        super().__init__(f"Profiling rate limit reached. Retry in {retry_after}s.")
+        self.retry_after = retry_after
+
+
+def acquire_profile_slot() -> str:
+    """
+    Reserve a profiling slot and return the new profile id; release it
+    with release_profile_slot. Raises ProfileRateLimitError when a profile
+    is already running or the window's quota is used up.
+    """
+    global _ACTIVE
+
+    if not PROFILING_ENABLED:
+        raise RuntimeError("Request profiling is disabled (REQUEST_PROFILING=0)")
+
+    now = time.monotonic()
+    with _LIMIT_LOCK:
+        while _RECENT and now - _RECENT[0] >= PROFILE_WINDOW_SECONDS:
+            _RECENT.popleft()
+        if _ACTIVE:
+            raise ProfileRateLimitError(1)
+        if len(_RECENT) >= PROFILE_MAX_PER_WINDOW:
+            raise ProfileRateLimitError(max(1, int(PROFILE_WINDOW_SECONDS - (now - _RECENT[0])) + 1))
+        _RECENT.append(now)
+        _ACTIVE += 1
+    return uuid.uuid4().hex
+
+
+def release_profile_slot():
+    global _ACTIVE
+
+    with _LIMIT_LOCK:
+        _ACTIVE = max(_ACTIVE - 1, 0)
+
+
+class StackSampler:
+    def __init__(self, interval_ms: float = PROFILE_SAMPLE_INTERVAL_MS):
+        self.interval = interval_ms / 1000.0
+        self.counts: "collections.Counter[str]" = collections.Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+def profile_path(profile_id: str) -> Optional[str]:
+    if not _ID_PATTERN.match(profile_id):
+        return None
+    try:
+        ensure_private_dir(PROFILE_DIR, "PROFILE_DIR")
+    except (OSError, RuntimeError):
+        return None
+    for ext in _EXTENSIONS.values():
+        path = os.path.join(PROFILE_DIR, profile_id + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _evict():
+    try:
+        names = [n for n in os.listdir(PROFILE_DIR) if n.endswith(tuple(_EXTENSIONS.values()))]
+    except FileNotFoundError:
+        return
+    paths = sorted((os.path.join(PROFILE_DIR, n) for n in names), key=os.path.getmtime)
+    for path in paths[:max(len(paths) - PROFILE_MAX_ARTIFACTS, 0)]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def run_profiled(mode: str, profile_id: str, fn: Callable, /, *args, **kwargs):
+    """
+    Call fn under the given profiler and store the artifact as
+    PROFILE_DIR/<profile_id>.collapsed or .pstats, also when fn raises.
+    Module level, so it can be sent to a worker with functools.partial.
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profiler '{mode}'. Expected one of {PROFILE_MODES}")
+
+    fd, tmp = tempfile.mkstemp(dir=ensure_private_dir(PROFILE_DIR, "PROFILE_DIR"), suffix=".tmp")
+    os.close(fd)
+
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.disable()
+            profiler.dump_stats(tmp)
+            os.replace(tmp, os.path.join(PROFILE_DIR, profile_id + _EXTENSIONS[mode]))
+            _evict()
+
+    sampler = StackSampler()
+    sampler.start()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        sampler.stop()
+        with open(tmp, "w") as f:
+            f.write(sampler.collapsed())
+        os.replace(tmp, os.path.join(PROFILE_DIR, profile_id + _EXTENSIONS[mode]))
+        _evict()
+
+
+def parse_profiler(value: Optional[str], modes: Tuple[str, ...] = PROFILE_MODES) -> Optional[str]:
+    # "1"/"true" pick the sampler; None or "" means no profiling. modes
+    # narrows what the endpoint accepts.
+    if not value:
+        return None
+    value = value.strip().lower()
+    if value in ("1", "true", "yes"):
+        return "sample"
+    if value not in PROFILE_MODES:
+        raise ValueError(f"profiler must be one of {list(PROFILE_MODES)}")
+    if value not in modes:
+        raise ValueError(
+            f"profiler={value} only sees the calling thread and would miss most of this "
+            f"request's work; use profiler=sample"
+        )
+    return value
@@ -0,0 +1,95 @@
+# app/utils/stage_executor.py
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from app.utils.metrics import STAGE_SECONDS
+
+_PROCESS_POOLS: Dict[int, ProcessPoolExecutor] = {}  # cached per size
+_PROCESS_LOCK = threading.Lock()
+
+
+def get_stage_process_pool(workers: int) -> ProcessPoolExecutor:
+    with _PROCESS_LOCK:
+        if workers not in _PROCESS_POOLS:
+            _PROCESS_POOLS[workers] = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _PROCESS_POOLS[workers]
+
+
+class StageExecutor:
+    """
+    Runs independent pipeline stages concurrently and records, per stage,
+    when it started (relative to the executor) and how long it ran. Stages
+    run on a thread pool unless submitted with in_process=True, which sends
+    them to a shared spawn process pool (for GIL-bound numpy/Python work).
+    """
+
+    def __init__(self, max_workers: int, process_workers: int = 1):
+        self._threads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stage")
+        self._process_workers = process_workers
+        self._t0 = time.perf_counter()
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._threads.shutdown(wait=True)
+
+    def _record(self, name: str, start: float):
+        end = time.perf_counter()
+        STAGE_SECONDS.observe(end - start, name)
+        with self._lock:
+            self._timings[name] = {
+                "start": round(start - self._t0, 4),
+                "seconds": round(end - start, 4),
+            }
+
+    def submit(self, name: str, fn: Callable, *args, in_process: bool = False, **kwargs) -> Future:
+        if in_process:
+            # timed from submission, so this includes pickling the arguments
+            start = time.perf_counter()
+            inner = get_stage_process_pool(self._process_workers).submit(fn, *args, **kwargs)
+            outer: Future = Future()
+
+            def done(f: Future):
+                # record before the waiter on `outer` can wake up
+                self._record(name, start)
+                if f.exception() is not None:
+                    outer.set_exception(f.exception())
+                else:
+                    outer.set_result(f.result())
+
+            inner.add_done_callback(done)
+            return outer
+
+        def timed():
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._record(name, start)
+
+        return self._threads.submit(timed)
+
+    def run(self, name: str, fn: Callable, *args, **kwargs):
+        # run a stage on the calling thread, timed like the others
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._record(name, start)
+
+    def timings(self, total: Optional[str] = "total") -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            out = dict(self._timings)
+        if total:
+            out[total] = {"start": 0.0, "seconds": round(time.perf_counter() - self._t0, 4)}
+        return out
@@ -0,0 +1,64 @@
+# benchmarks/audio_fixtures.py
+#
+# Synthetic speech-like recordings (voiced harmonic stretches with a gliding
+# pitch, separated by pauses) encoded the way the browser recorder sends
+# them, so audio benchmarks run without real uploads.
+
+import os
+import subprocess
+import tempfile
+
+import imageio_ffmpeg
+import numpy as np
+import soundfile as sf
+
+
+def speechlike_signal(
+    seconds: float,
+    sr: int = 16000,
+    f0: float = 140.0,
+    semitones: float = 3.0,
+    seed: int = 0
+) -> np.ndarray:
+    # pitch follows a sine of +-semitones, i.e. a std of semitones / sqrt(2)
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sr)
+    t = np.arange(n) / sr
+
+    # slow intonation contour around f0
+    contour = f0 * 2 ** (semitones * np.sin(2 * np.pi * 0.3 * t + rng.uniform(0, np.pi)) / 12)
+    phase = 2 * np.pi * np.cumsum(contour) / sr
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+
+    # ~1.5 s "words" separated by ~0.4 s pauses
+    envelope = (np.sin(2 * np.pi * t / 1.9) > -0.4).astype(np.float32)
+    ramp = np.hanning(int(0.05 * sr))  # soft onsets/offsets like real syllables
+    envelope = np.convolve(envelope, ramp / ramp.sum(), mode="same")
+    noise = 0.01 * rng.standard_normal(n)
+    return (0.3 * voiced * envelope + noise).astype(np.float32)
+
+
+def write_recording(path: str, seconds: float, sr: int = 16000, seed: int = 0) -> str:
+    """
+    Write a synthetic recording; the container follows the extension
+    (.webm is Opus at 48 kHz like MediaRecorder, .wav is 16-bit PCM).
+    """
+    audio = speechlike_signal(seconds, sr=sr, seed=seed)
+    if path.endswith(".wav"):
+        sf.write(path, audio, sr)
+        return path
+
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+        wav_path = tmp.name
+    try:
+        sf.write(wav_path, audio, sr)
+        subprocess.run(
+            [
+                imageio_ffmpeg.get_ffmpeg_exe(), "-y", "-loglevel", "error",
+                "-i", wav_path, "-ar", "48000", "-c:a", "libopus", "-b:a", "32k", path,
+            ],
+            check=True
+        )
+    finally:
+        os.unlink(wav_path)
+    return path
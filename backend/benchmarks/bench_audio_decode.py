@@ -0,0 +1,108 @@
+# benchmarks/bench_audio_decode.py
+#
+# CPU time and peak memory of getting an upload into the pitch tracker and
+# Whisper: decoding the file twice (load_audio_mono, then faster-whisper
+# decoding the path again) against decoding once and sharing the buffer,
+# and the previous librosa / temp-WAV decoder against the ffmpeg pipe.
+#
+#   cd backend && python -m benchmarks.bench_audio_decode
+
+import argparse
+import os
+import resource
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import imageio_ffmpeg
+import librosa
+import numpy as np
+from faster_whisper import decode_audio
+
+from app.audio.audio_utils import load_audio_mono
+from benchmarks.audio_fixtures import write_recording
+
+
+def previous_load_audio_mono(path: str, sr: int = 16000):
+    # load_audio_mono before the ffmpeg pipe: librosa first, then an ffmpeg
+    # transcode to a temp WAV that is read back and deleted
+    try:
+        audio, orig_sr = librosa.load(path, sr=None, mono=True)
+    except Exception:
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+            tmp_path = tmp.name
+        try:
+            subprocess.run(
+                [imageio_ffmpeg.get_ffmpeg_exe(), "-y", "-i", path, "-ac", "1", "-ar", str(sr), tmp_path],
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            audio, orig_sr = librosa.load(tmp_path, sr=sr, mono=True)
+        finally:
+            os.unlink(tmp_path)
+    if orig_sr != sr:
+        audio = librosa.resample(y=audio, orig_sr=orig_sr, target_sr=sr)
+    return audio.astype(np.float32), sr
+
+
+def previous_decode_once(path: str):
+    audio, sr = previous_load_audio_mono(path)
+    return audio, audio
+
+
+def decode_twice(path: str):
+    audio, sr = load_audio_mono(path)
+    return audio, decode_audio(path, sampling_rate=sr)
+
+
+def decode_once(path: str):
+    audio, sr = load_audio_mono(path)
+    return audio, audio
+
+
+def cpu_seconds() -> float:
+    # includes ffmpeg child processes spawned by the decoders
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def measure(fn, path: str, repeats: int):
+    wall, cpu, peak = [], [], []
+    for _ in range(repeats):
+        tracemalloc.start()
+        start_cpu, start = cpu_seconds(), time.perf_counter()
+        fn(path)
+        wall.append(time.perf_counter() - start)
+        cpu.append(cpu_seconds() - start_cpu)
+        peak.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return statistics.median(wall), statistics.median(cpu), max(peak) / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, nargs="+", default=[30, 120, 300])
+    parser.add_argument("--format", default="webm")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'audio s':>7} {'path':>12} {'wall s':>7} {'cpu s':>7} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for seconds in args.seconds:
+            path = write_recording(os.path.join(tmp, f"answer-{seconds:g}.{args.format}"), seconds)
+            decode_once(path)  # warm-up (imports, ffmpeg binary lookup)
+            for name, fn in (
+                ("decode twice", decode_twice),
+                ("prev decoder", previous_decode_once),
+                ("decode once", decode_once),
+            ):
+                wall, cpu, peak = measure(fn, path, args.repeats)
+                print(f"{seconds:>7g} {name:>12} {wall:>7.2f} {cpu:>7.2f} {peak:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# benchmarks/bench_cpu_precision.py
+#
+# Decode throughput and resident memory of the Llama loader's CPU precision
+# modes (LLM_CPU_PRECISION). Each mode runs in its own process so its RSS is
+# not inflated by the previous one.
+#
+#   cd backend && python -m benchmarks.bench_cpu_precision
+#   cd backend && HF_TOKEN=... python -m benchmarks.bench_cpu_precision --model llama
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import psutil
+import torch
+
+from app.models.llm_loader import CPU_PRECISIONS, apply_cpu_precision, build_tcs_model
+from app.prompts.tcs_prompt import build_tcs_prompt
+from benchmarks.tiny_lm import build_tiny_lm
+
+TRANSCRIPT = (
+    "So a hash map stores key value pairs. It hashes the key to find a bucket "
+    "and on collisions it chains entries in a list, so lookups are constant "
+    "time on average."
+)
+
+
+def load_model(model_name: str, precision: str, hidden_size: int = 1024, layers: int = 8):
+    if model_name == "llama":
+        return build_tcs_model(os.getenv("HF_TOKEN"), precision)
+    tokenizer, model = build_tiny_lm(hidden_size=hidden_size, num_layers=layers)
+    return tokenizer, apply_cpu_precision(model, precision)
+
+
+def measure(args) -> dict:
+    torch.set_grad_enabled(False)
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+
+    tokenizer, model = load_model(args.model, args.child, args.hidden_size, args.layers)
+    rss_loaded = process.memory_info().rss
+
+    input_ids = tokenizer(
+        build_tcs_prompt("Explain how a hash map works.", TRANSCRIPT),
+        return_tensors="pt"
+    )["input_ids"]
+
+    def generate(n: int):
+        # min_new_tokens pins the length so every mode decodes the same count
+        return model.generate(
+            input_ids,
+            attention_mask=torch.ones_like(input_ids),
+            max_new_tokens=n,
+            min_new_tokens=n,
+            do_sample=False,
+            pad_token_id=tokenizer.pad_token_id
+        )
+
+    generate(4)  # warm-up
+
+    # decode rate: subtract a prefill-only run so prompt length does not count
+    start = time.perf_counter()
+    generate(1)
+    prefill = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tokens = generate(args.max_new_tokens).shape[1] - input_ids.shape[1]
+    elapsed = time.perf_counter() - start - prefill
+
+    return {
+        "precision": args.child,
+        "tokens": tokens,
+        "tokens_per_s": (tokens - 1) / elapsed,
+        "model_mb": (rss_loaded - rss_before) / 2**20,
+        "peak_rss_mb": process.memory_info().rss / 2**20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", choices=["tiny", "llama"], default="tiny")
+    parser.add_argument("--precisions", nargs="+", choices=CPU_PRECISIONS, default=list(CPU_PRECISIONS))
+    parser.add_argument("--hidden-size", type=int, default=1024)
+    parser.add_argument("--layers", type=int, default=8)
+    parser.add_argument("--max-new-tokens", type=int, default=64)
+    parser.add_argument("--child", choices=CPU_PRECISIONS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args)))
+        return
+
+    print(f"{'precision':>9} {'tokens':>6} {'tokens/s':>8} {'speedup':>7} {'model MB':>8} {'RSS MB':>8}")
+    baseline = None
+    for precision in args.precisions:
+        out = subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.bench_cpu_precision",
+                "--model", args.model,
+                "--hidden-size", str(args.hidden_size),
+                "--layers", str(args.layers),
+                "--max-new-tokens", str(args.max_new_tokens),
+                "--child", precision,
+            ],
+            # a fixed mmap threshold lets freed float32 weights leave the RSS
+            env={**os.environ, "MALLOC_MMAP_THRESHOLD_": "65536"},
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        row = json.loads(out.stdout.strip().splitlines()[-1])
+        baseline = baseline or row["tokens_per_s"]
+        print(
+            f"{precision:>9} {row['tokens']:>6} {row['tokens_per_s']:>8.1f} "
+            f"{row['tokens_per_s'] / baseline:>6.2f}x {row['model_mb']:>8.0f} {row['peak_rss_mb']:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
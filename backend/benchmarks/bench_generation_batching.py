@@ -0,0 +1,62 @@
+# benchmarks/bench_generation_batching.py
+#
+# Throughput of GenerationScheduler against max batch size on CPU.
+#
+#   cd backend && python -m benchmarks.bench_generation_batching
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+
+from app.models.generation_scheduler import GenerationScheduler
+from benchmarks.tiny_lm import build_tiny_lm
+
+PROMPT = "Interview Question:\nExplain how a hash map works.\n\nCandidate Answer:\n"
+
+
+def run(tokenizer, model, batch_size: int, requests: int, max_new_tokens: int, window_ms: float):
+    scheduler = GenerationScheduler(tokenizer, model, window_ms=window_ms, max_batch=batch_size)
+    # varied prompt lengths and budgets, like TCS (1600) next to questions (512)
+    prompts = [PROMPT + "word " * (5 * i) for i in range(requests)]
+    budgets = [max_new_tokens if i % 2 == 0 else max_new_tokens // 2 for i in range(requests)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=requests) as pool:
+        outputs = list(pool.map(
+            lambda args: scheduler.generate(args[0], args[1], max_length=2536),
+            zip(prompts, budgets)
+        ))
+    elapsed = time.perf_counter() - start
+
+    tokens = sum(len(tokenizer(o)["input_ids"]) for o in outputs)
+    return elapsed, tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=8)
+    parser.add_argument("--max-new-tokens", type=int, default=64)
+    parser.add_argument("--window-ms", type=float, default=25.0)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--threads", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    tokenizer, model = build_tiny_lm()
+    run(tokenizer, model, 1, 1, 4, 0.0)  # warm-up
+
+    print(f"{'batch':>5} {'seconds':>8} {'tokens':>7} {'tok/s':>8} {'speedup':>8}")
+    base = None
+    for b in args.batch_sizes:
+        elapsed, tokens = run(tokenizer, model, b, args.requests, args.max_new_tokens, args.window_ms)
+        tps = tokens / elapsed
+        base = base or tps
+        print(f"{b:>5} {elapsed:>8.2f} {tokens:>7} {tps:>8.1f} {tps / base:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_metrics.py
+#
+# Cost of recording metrics: one histogram observation, one counter
+# increment and one timed_stage block (what a pipeline stage pays), single
+# threaded and with --threads recording at once, plus how long rendering
+# /metrics takes with a realistic number of series.
+#
+#   cd backend && python -m benchmarks.bench_metrics
+
+import argparse
+import threading
+import time
+
+from app.utils.metrics import Counter, Histogram, Registry, timed_stage
+
+STAGES = ("hash", "decode", "transcribe", "pitch", "signals", "sentiment", "score", "tcs", "placement", "parse")
+
+
+def per_call_us(fn, n: int, threads: int = 1) -> float:
+    def work():
+        for _ in range(n):
+            fn()
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return (time.perf_counter() - start) / (n * threads) * 1e6
+
+
+def _timed_block():
+    with timed_stage("bench"):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    registry = Registry()
+    hist = Histogram("bench_seconds", "bench", ("stage",), registry=registry)
+    counter = Counter("bench_total", "bench", ("cache", "result"), registry=registry)
+
+    cases = {
+        "histogram observe": lambda: hist.observe(0.42, "transcribe"),
+        "counter inc": lambda: counter.inc("llm", "hit"),
+        "timed_stage block": _timed_block,
+    }
+
+    print(f"{'operation':>18} {'1 thread us':>11} {f'{args.threads} threads us':>12}")
+    for name, fn in cases.items():
+        single = per_call_us(fn, args.calls)
+        contended = per_call_us(fn, args.calls // args.threads, args.threads)
+        print(f"{name:>18} {single:>11.2f} {contended:>12.2f}")
+
+    for stage in STAGES:
+        for i in range(100):
+            hist.observe(i / 10, stage)
+    start = time.perf_counter()
+    text = registry.render()
+    print(f"\nrender: {len(text.splitlines())} lines in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
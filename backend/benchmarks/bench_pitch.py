@@ -0,0 +1,78 @@
+# benchmarks/bench_pitch.py
+#
+# Speed and monotone_score agreement of the pitch backends. Synthetic clips
+# have a known intonation range, so each backend is also compared with the
+# true score; recorded clips (--files, any format load_audio_mono reads)
+# are compared with pyin only.
+#
+#   cd backend && python -m benchmarks.bench_pitch
+#   cd backend && python -m benchmarks.bench_pitch --files answer1.webm answer2.wav
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from app.audio.audio_utils import load_audio_mono
+from app.audio.pitch_analysis import analyze_pitch_dynamics
+from benchmarks.audio_fixtures import speechlike_signal
+
+SR = 16000
+
+
+def true_monotone_score(semitones: float) -> float:
+    return float(np.clip((2.5 - semitones / math.sqrt(2)) / 2.5, 0.0, 1.0))
+
+
+def run(audio: np.ndarray, backend: str):
+    start = time.perf_counter()
+    out = analyze_pitch_dynamics(audio, SR, backend=backend)
+    return float(out["monotone_score"]), out["is_monotone"], time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--semitones", type=float, nargs="+", default=[0.5, 1.5, 2.5, 4.0])
+    parser.add_argument("--f0", type=float, nargs="+", default=[100.0, 210.0])
+    parser.add_argument("--files", nargs="*", default=[])
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    cases = []
+    for f0 in args.f0:
+        for semitones in args.semitones:
+            audio = speechlike_signal(args.seconds, SR, f0=f0, semitones=semitones)
+            cases.append((f"synth f0={f0:g} +-{semitones:g}st", audio, true_monotone_score(semitones)))
+    for path in args.files:
+        cases.append((path, load_audio_mono(path, sr=SR)[0], None))
+
+    print(
+        f"{'clip':>28} {'truth':>5} {'pyin':>5} {'yin':>5} {'|diff|':>6} {'flag':>4} "
+        f"{'pyin s':>7} {'yin s':>6} {'speedup':>7}"
+    )
+    diffs = []
+    errors = {"pyin": [], "yin": []}
+    for name, audio, truth in cases:
+        p_score, p_flag, p_time = run(audio, "pyin")
+        y_score, y_flag, y_time = run(audio, "yin")
+        diffs.append(abs(p_score - y_score))
+        if truth is not None:
+            errors["pyin"].append(abs(p_score - truth))
+            errors["yin"].append(abs(y_score - truth))
+        truth_s = f"{truth:.2f}" if truth is not None else "-"
+        print(
+            f"{name[-28:]:>28} {truth_s:>5} {p_score:>5.2f} {y_score:>5.2f} {diffs[-1]:>6.2f} "
+            f"{'same' if p_flag == y_flag else 'DIFF':>4} {p_time:>7.2f} {y_time:>6.3f} {p_time / y_time:>6.0f}x"
+        )
+
+    agree = sum(d <= args.tolerance for d in diffs)
+    print(f"monotone_score within {args.tolerance} of pyin: {agree}/{len(diffs)}")
+    for backend, errs in errors.items():
+        if errs:
+            print(f"{backend} mean |error| vs synthetic truth: {sum(errs) / len(errs):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_prefix_cache.py
+#
+# Time-to-first-token for the TCS and placement prompts with and without the
+# cached KV state of their constant instruction prefix.
+#
+#   cd backend && python -m benchmarks.bench_prefix_cache
+
+import argparse
+import statistics
+import time
+
+from app.models.generation_scheduler import GenerationScheduler
+from app.prompts.placement_prompt import PLACEMENT_PROMPT_PREFIX, build_placement_coaching_prompt
+from app.prompts.tcs_prompt import TCS_PROMPT_PREFIX, build_tcs_prompt
+from benchmarks.tiny_lm import build_tiny_lm
+
+TRANSCRIPT = (
+    "So a hash map stores key value pairs. It hashes the key to find a bucket "
+    "and on collisions it chains entries in a list, so lookups are constant "
+    "time on average. "
+) * 3
+
+
+def ttft(scheduler, prompt: str, prefix, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        scheduler.generate(prompt, max_new_tokens=1, max_length=2536, prefix=prefix)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hidden-size", type=int, default=512)
+    parser.add_argument("--layers", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    tokenizer, model = build_tiny_lm(hidden_size=args.hidden_size, num_layers=args.layers)
+    scheduler = GenerationScheduler(tokenizer, model, window_ms=0)
+
+    cases = [
+        ("tcs", build_tcs_prompt("Explain how a hash map works.", TRANSCRIPT), TCS_PROMPT_PREFIX),
+        ("placement", build_placement_coaching_prompt(None, TRANSCRIPT), PLACEMENT_PROMPT_PREFIX),
+    ]
+
+    print(f"{'prompt':>10} {'prefix tok':>10} {'total tok':>9} {'ttft full':>10} {'ttft cached':>11} {'speedup':>8} {'same out':>8}")
+    for name, prompt, prefix in cases:
+        scheduler.generate(prompt, max_new_tokens=1, max_length=2536, prefix=prefix)  # fill cache
+
+        full = ttft(scheduler, prompt, None, args.repeats)
+        cached = ttft(scheduler, prompt, prefix, args.repeats)
+
+        same = (
+            scheduler.generate(prompt, 32, 2536, prefix=None)
+            == scheduler.generate(prompt, 32, 2536, prefix=prefix)
+        )
+        prefix_tokens = len(tokenizer(prefix)["input_ids"])
+        total_tokens = len(tokenizer(prompt)["input_ids"])
+        print(
+            f"{name:>10} {prefix_tokens:>10} {total_tokens:>9} {full * 1000:>8.1f}ms "
+            f"{cached * 1000:>9.1f}ms {full / cached:>7.2f}x {str(same):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
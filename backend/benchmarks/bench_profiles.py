@@ -0,0 +1,117 @@
+# benchmarks/bench_profiles.py
+#
+# End-to-end latency of each evaluation profile, and how far its results
+# drift from the accurate profile: transcript word error rate, CS and TCS
+# score differences, and whether placement feedback is produced.
+#
+# With --model real the production Whisper sizes and Llama are used (needs
+# the weights and HF_TOKEN) and the accuracy columns are meaningful. The
+# default --model tiny swaps in random tiny Whisper models (larger for
+# heavier profiles) and a tiny random Llama, so only the latency columns
+# carry information; sentiment is disabled since it needs a download, and
+# the LLM response cache so every run generates. The tiny Llama has a
+# byte-level tokenizer and fills every string to its schema cap, so its
+# token budgets are scaled up (--token-scale).
+#
+#   cd backend && python -m benchmarks.bench_profiles
+
+import argparse
+import dataclasses
+import os
+import statistics
+import tempfile
+import time
+
+import torch
+
+from app.models import generation_scheduler, llm_cache
+from app.models.generation_scheduler import GenerationScheduler
+from app.services import interview_analysis
+from app.services.evaluation_profiles import EVALUATION_PROFILES
+from app.services.interview_evaluator import evaluate_interview
+from benchmarks.audio_fixtures import write_recording
+from benchmarks.tiny_lm import build_tiny_lm
+from benchmarks.tiny_whisper import build_tiny_whisper
+
+QUESTIONS = ["Explain how a hash map works and when lookups degrade."]
+
+# tiny stand-ins for the Whisper sizes the profiles use
+TINY_WHISPER = {
+    "base": (128, 2),
+    "small": (256, 4),
+    "medium": (384, 6),
+}
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    ref, hyp = reference.split(), hypothesis.split()
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h))
+        prev = cur
+    return prev[-1] / max(len(ref), 1)
+
+
+def tiny_profiles(token_scale: int):
+    profiles = {}
+    for name, profile in EVALUATION_PROFILES.items():
+        d_model, layers = TINY_WHISPER.get(profile.whisper_model, TINY_WHISPER["medium"])
+        profiles[name] = dataclasses.replace(
+            profile,
+            whisper_model=build_tiny_whisper(d_model=d_model, layers=layers),
+            tcs_max_new_tokens=profile.tcs_max_new_tokens * token_scale,
+            placement_max_new_tokens=profile.placement_max_new_tokens * token_scale
+        )
+    return profiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", choices=["tiny", "real"], default="tiny")
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--llm-mode", choices=["sequential", "batched", "fused"], default="sequential")
+    parser.add_argument("--token-scale", type=int, default=8)
+    args = parser.parse_args()
+
+    torch.set_grad_enabled(False)
+
+    if args.model == "tiny":
+        profiles = tiny_profiles(args.token_scale)
+        tokenizer, model = build_tiny_lm(hidden_size=128, num_layers=2)
+        generation_scheduler._SCHEDULER = GenerationScheduler(tokenizer, model)
+        interview_analysis._PIPELINE_AVAILABLE = False
+        llm_cache.LLM_CACHE_ENABLED = False  # keys name the production model
+    else:
+        profiles = dict(EVALUATION_PROFILES)
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-profiles-"), "answer.wav")
+    write_recording(path, args.seconds)
+
+    results = {}
+    for name, profile in profiles.items():
+        evaluate_interview(path, QUESTIONS, llm_mode=args.llm_mode, profile=profile)  # warm-up
+        times = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            out = evaluate_interview(path, QUESTIONS, llm_mode=args.llm_mode, profile=profile)
+            times.append(time.perf_counter() - start)
+        results[name] = (statistics.median(times), out)
+
+    ref = results["accurate"][1]
+    print(f"{'profile':>9} {'median s':>9} {'transcribe s':>12} {'WER':>6} "
+          f"{'|dCS|':>6} {'|dTCS|':>6} {'placement':>9}")
+    for name, (seconds, out) in results.items():
+        print(
+            f"{name:>9} {seconds:>9.2f} {out['cs_timings']['transcribe']['seconds']:>12.2f} "
+            f"{word_error_rate(ref['transcript'], out['transcript']):>6.2f} "
+            f"{abs(out['cs_score'] - ref['cs_score']):>6.1f} "
+            f"{abs(out['tcs_score'] - ref['tcs_score']):>6} "
+            f"{'yes' if out['placement_feedback'] else 'no':>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
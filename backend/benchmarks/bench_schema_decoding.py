@@ -0,0 +1,95 @@
+# benchmarks/bench_schema_decoding.py
+#
+# Runs the TCS, placement, fused evaluation and question schemas through schema-constrained
+# greedy decoding on a tiny random model (which on its own never produces
+# JSON), checks every output parses with the expected shape, and reports the
+# per-token cost of the constraint.
+#
+#   cd backend && python -m benchmarks.bench_schema_decoding
+
+import argparse
+import json
+import time
+
+from app.models.generation_scheduler import GenerationScheduler
+from app.prompts.evaluation_prompt import FUSED_OUTPUT_SCHEMA
+from app.prompts.placement_prompt import PLACEMENT_OUTPUT_SCHEMA
+from app.prompts.question_prompt import build_question_output_schema
+from app.prompts.tcs_prompt import TCS_OUTPUT_SCHEMA
+from app.services.question_service import EXPECTED_COUNTS
+from benchmarks.tiny_lm import build_tiny_lm
+
+
+def check(value, schema) -> bool:
+    if "enum" in schema:
+        return value in schema["enum"]
+    kind = schema["type"]
+    if kind == "object":
+        return (
+            isinstance(value, dict)
+            and list(value) == list(schema["properties"])
+            and all(check(value[k], s) for k, s in schema["properties"].items())
+        )
+    if kind == "array":
+        return (
+            isinstance(value, list)
+            and schema.get("minItems", 0) <= len(value) <= schema.get("maxItems", len(value))
+            and all(check(v, schema["items"]) for v in value)
+        )
+    if kind == "string":
+        return isinstance(value, str) and schema.get("minLength", 0) <= len(value) <= schema.get("maxLength", len(value))
+    if kind == "integer":
+        return isinstance(value, int) and schema["minimum"] <= value <= schema["maximum"]
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seeds", type=int, default=3)
+    parser.add_argument("--max-new-tokens", type=int, default=4000)
+    args = parser.parse_args()
+
+    cases = [
+        ("tcs", TCS_OUTPUT_SCHEMA),
+        ("placement", PLACEMENT_OUTPUT_SCHEMA),
+        ("fused", FUSED_OUTPUT_SCHEMA),
+    ]
+    cases += [(f"questions/{r}", build_question_output_schema(n)) for r, n in EXPECTED_COUNTS.items()]
+
+    print(f"{'schema':>24} {'seed':>4} {'valid':>5} {'tokens':>6} {'ms/token':>8} {'free ms/token':>13}")
+    for seed in range(args.seeds):
+        tokenizer, model = build_tiny_lm(hidden_size=128, num_layers=2, seed=seed)
+        scheduler = GenerationScheduler(tokenizer, model, window_ms=0)
+
+        start = time.perf_counter()
+        free = scheduler.generate("Evaluate:", 64, 512)
+        free_ms = (time.perf_counter() - start) * 1000 / max(len(tokenizer(free)["input_ids"]), 1)
+
+        for name, schema in cases:
+            start = time.perf_counter()
+            text = scheduler.generate(
+                f"Evaluate ({name}):",
+                # the fused schema holds both blocks, so it gets both budgets
+                args.max_new_tokens * (2 if name == "fused" else 1),
+                512,
+                stop_at_json=True,
+                schema=schema
+            )
+            elapsed = time.perf_counter() - start
+            tokens = len(tokenizer(text)["input_ids"])
+
+            try:
+                valid = check(json.loads(text), schema)
+            except json.JSONDecodeError:
+                valid = False
+
+            print(
+                f"{name:>24} {seed:>4} {str(valid):>5} {tokens:>6} "
+                f"{elapsed * 1000 / max(tokens, 1):>8.2f} {free_ms:>13.2f}"
+            )
+            if not valid:
+                print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# benchmarks/bench_signals.py
+#
+# CS signal extraction time against transcript length, for the previous
+# detect_signals (a subtree walk per ownership verb / passive auxiliary
+# and a str.count pass per phrase) and the current one-pass version, with
+# a check that both return identical counts. Parsing is done up front and
+# excluded from the timings.
+#
+# --parser spacy uses en_core_web_sm. The default --parser synthetic builds
+# the Docs directly: every clause of a run-on answer hangs off the previous
+# clause's verb, the deep tree a parser produces for a transcript without
+# sentence breaks, so it needs no model download. --style team rewrites
+# "i" as "we": with no "i" to stop at, every old subtree walk runs to the
+# end of the answer, which is its quadratic worst case.
+#
+#   cd backend && python -m benchmarks.bench_signals
+
+import argparse
+import random
+import time
+
+import spacy
+from spacy.tokens import Doc
+
+from app.nlp import signals
+from app.nlp.signals import (
+    APOLOGIES,
+    FILLERS_SIMPLE,
+    HEDGE_KEYWORDS,
+    HEDGE_PHRASES,
+    MULTI_FILLERS,
+    OWNERSHIP_VERBS,
+    UNCERTAINTY_PATTERNS,
+)
+
+# "*" marks the clause's verb; every other word attaches to it
+CLAUSES = [
+    "i *built the cache layer",
+    "the service was *designed by the platform team",
+    "um you know we kind of *managed the rollout",
+    "i think it was probably the index that i *created",
+    "like the api was *implemented before i joined",
+    "maybe it might be *fine for now",
+    "i mean i *led the migration myself",
+    "sorry i forgot whether the outage was *solved",
+    "uh the queue was sort of *drained by a cron job",
+    "not sure if i *drove that decision or i guess the lead did",
+    "we *decided to move on and can't remember why",
+]
+
+LEMMAS = {
+    "built": "build", "designed": "design", "managed": "manage", "created": "create",
+    "implemented": "implement", "led": "lead", "solved": "solve", "drove": "drive",
+    "drained": "drain", "decided": "decide",
+}
+
+
+def synthetic_doc(vocab, n_words: int, style: str = "mixed", seed: int = 0) -> Doc:
+    rng = random.Random(seed)
+    words, heads, deps, lemmas, pos = [], [], [], [], []
+    prev_verb = None
+
+    while len(words) < n_words:
+        clause = rng.choice(CLAUSES).split()
+        if style == "team":
+            clause = ["we" if w == "i" else w for w in clause]
+        start = len(words)
+        verb = start + next(i for i, w in enumerate(clause) if w.startswith("*"))
+
+        for i, word in enumerate(clause):
+            word = word.lstrip("*")
+            idx = start + i
+            words.append(word)
+            lemmas.append(LEMMAS.get(word, word))
+            if idx == verb:
+                heads.append(prev_verb if prev_verb is not None else idx)
+                deps.append("conj" if prev_verb is not None else "ROOT")
+                pos.append("VERB")
+                continue
+            heads.append(verb)
+            if word in ("was", "were") and idx == verb - 1:
+                deps.append("auxpass")
+            elif word in ("i", "we", "it") and idx < verb:
+                deps.append("nsubj")
+            else:
+                deps.append("dep")
+            pos.append("INTJ" if word == "like" else "X")
+
+        prev_verb = verb
+
+    return Doc(vocab, words=words, heads=heads, deps=deps, lemmas=lemmas, pos=pos)
+
+
+def reference_signals(nlp, transcript: str) -> dict:
+    # detect_signals before the one-pass rewrite (transcript part only)
+    text_lower = transcript.lower()
+    filler_count = hedge_count = own_count = passive_count = 0
+
+    doc = nlp(transcript)
+    for token in doc:
+        t = token.text.lower()
+        if t in FILLERS_SIMPLE:
+            filler_count += 1
+        if t == "like" and token.pos_ == "INTJ":
+            filler_count += 1
+        if t in HEDGE_KEYWORDS:
+            hedge_count += 1
+        if t == "think" and token.head.text.lower() == "i":
+            hedge_count += 1
+        if token.lemma_ in OWNERSHIP_VERBS:
+            if any(tok.text.lower() == "i" for tok in token.subtree):
+                own_count += 1
+        if token.dep_ == "auxpass":
+            if not any(tok.text.lower() == "i" for tok in token.head.subtree):
+                passive_count += 1
+
+    for f in MULTI_FILLERS:
+        filler_count += text_lower.count(f)
+    for h in HEDGE_PHRASES:
+        hedge_count += text_lower.count(h)
+    hedge_count += sum(text_lower.count(p) for p in UNCERTAINTY_PATTERNS)
+
+    return {
+        "filler_count": filler_count,
+        "hedge_count": hedge_count,
+        "own_count": own_count,
+        "passive_count": passive_count,
+        "apology_count": sum(text_lower.count(a) for a in APOLOGIES),
+    }
+
+
+def best_of(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--parser", choices=["synthetic", "spacy"], default="synthetic")
+    parser.add_argument("--style", choices=["mixed", "team"], default="team")
+    parser.add_argument("--words", type=int, nargs="+", default=[1000, 2500, 5000, 10000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.parser == "spacy":
+        model = spacy.load("en_core_web_sm", exclude=["ner"])
+    else:
+        model = spacy.blank("en")
+
+    print(f"{'words':>6} {'previous ms':>11} {'one-pass ms':>11} {'speedup':>8}  counts")
+    for n in args.words:
+        if args.parser == "spacy":
+            text = synthetic_doc(model.vocab, n, args.style).text
+            doc = model(text)
+        else:
+            doc = synthetic_doc(model.vocab, n, args.style)
+            text = doc.text
+        parsed = {text: doc}
+        signals.get_nlp = lambda: parsed.__getitem__  # parsing excluded from the timings
+
+        ref = reference_signals(parsed.__getitem__, text)
+        new = signals.detect_signals(text, [])
+        same = all(new[k] == v for k, v in ref.items())
+
+        old_s = best_of(lambda: reference_signals(parsed.__getitem__, text), args.repeats)
+        new_s = best_of(lambda: signals.detect_signals(text, []), args.repeats)
+        print(
+            f"{len(doc):>6} {old_s * 1000:>11.1f} {new_s * 1000:>11.1f} {old_s / new_s:>7.0f}x  "
+            f"{'identical' if same else f'DIFFER {ref} vs {new}'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
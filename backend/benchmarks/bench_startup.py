@@ -0,0 +1,116 @@
+# benchmarks/bench_startup.py
+#
+# Cold-start cost of the API: how long `import app.main` takes (and
+# whether torch / transformers / spaCy come with it), then, for each
+# STARTUP_MODE, how long a fresh uvicorn takes to answer /health and to
+# report ready on /ready, with the per-model warm-up times. In lazy mode
+# those warm-up costs are paid by the first requests instead.
+#
+# --models defaults to the ones that load offline; --whisper-model
+# defaults to a tiny random Whisper (pass e.g. "medium" for the real one).
+#
+#   cd backend && python -m benchmarks.bench_startup
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+HEAVY = ("torch", "transformers", "spacy")
+
+IMPORT_PROBE = (
+    "import sys, time; t = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - t, ','.join(m for m in %r if m in sys.modules))" % (HEAVY,)
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_import(repeats: int):
+    times, heavy = [], ""
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c", IMPORT_PROBE], capture_output=True, text=True, check=True
+        ).stdout.split()
+        times.append(float(out[0]))
+        heavy = out[1] if len(out) > 1 else ""
+    return statistics.median(times), heavy or "none"
+
+
+def measure_startup(mode: str, env: dict, timeout: float) -> dict:
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, **env, "STARTUP_MODE": mode}
+    )
+    listening = ready = None
+    state = {}
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                if listening is None:
+                    httpx.get(f"{url}/health").raise_for_status()
+                    listening = time.perf_counter() - start
+                r = httpx.get(f"{url}/ready")
+                state = r.json()
+                if state["status"] in ("ready", "failed"):
+                    ready = time.perf_counter() - start
+                    break
+            except httpx.TransportError:
+                pass
+            time.sleep(0.05)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return {"listening": listening, "ready": ready, "state": state}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--models", default="whisper,spacy")
+    parser.add_argument("--whisper-model", default=None)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=600)
+    args = parser.parse_args()
+
+    whisper_model = args.whisper_model
+    if whisper_model is None:
+        from benchmarks.tiny_whisper import build_tiny_whisper
+        whisper_model = build_tiny_whisper()
+
+    seconds, heavy = measure_import(args.repeats)
+    print(f"import app.main: {seconds:.2f}s (heavy modules loaded: {heavy})\n")
+
+    env = {
+        "WARMUP_MODELS": args.models,
+        "WHISPER_MODEL_SIZE": whisper_model,
+        "EVALUATION_WORKERS": str(args.workers),
+    }
+    print(f"{'mode':>5} {'/health s':>9} {'/ready s':>9} {'status':>8}")
+    reports = {}
+    for mode in ("lazy", "warm"):
+        result = measure_startup(mode, env, args.timeout)
+        fmt = lambda v: f"{v:>9.2f}" if v is not None else f"{'-':>9}"
+        print(f"{mode:>5} {fmt(result['listening'])} {fmt(result['ready'])} "
+              f"{result['state'].get('status', 'timeout'):>8}")
+        reports[mode] = result["state"]
+
+    print("\nwarm-up report:")
+    print(json.dumps({k: reports["warm"].get(k) for k in ("api", "workers")}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
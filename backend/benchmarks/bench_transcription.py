@@ -0,0 +1,56 @@
+# benchmarks/bench_transcription.py
+#
+# Transcription throughput (seconds of audio per wall second) against the
+# number of concurrent recordings, for one shared model, a WhisperPool with
+# one instance per request, and batched transcription of all recordings in
+# one pass. Uses a tiny random Whisper, so absolute numbers are not those of
+# the production model and its (random) transcripts differ between modes.
+#
+#   cd backend && python -m benchmarks.bench_transcription
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.audio import transcriber
+from benchmarks.audio_fixtures import speechlike_signal
+from benchmarks.tiny_whisper import build_tiny_whisper
+
+
+def run(model_path: str, audios, mode: str, pool_size: int) -> float:
+    transcriber._POOLS[model_path] = transcriber.WhisperPool(
+        model_path,
+        size=pool_size,
+        cpu_threads=max((os.cpu_count() or 1) // pool_size, 1)
+    )
+
+    start = time.perf_counter()
+    if mode == "batched":
+        transcriber.transcribe_batch(audios, model_path)
+    else:
+        with ThreadPoolExecutor(max_workers=len(audios)) as pool:
+            list(pool.map(lambda a: transcriber.transcribe_audio(a, model_path), audios))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--d-model", type=int, default=256)
+    parser.add_argument("--layers", type=int, default=4)
+    args = parser.parse_args()
+
+    model_path = build_tiny_whisper(d_model=args.d_model, layers=args.layers)
+    print(f"{'requests':>8} {'mode':>14} {'wall s':>7} {'audio s/s':>9}")
+
+    for n in args.concurrency:
+        audios = [speechlike_signal(args.seconds, seed=i) for i in range(n)]
+        for mode, pool_size in (("shared model", 1), ("pool", n), ("batched", 1)):
+            elapsed = run(model_path, audios, mode, pool_size)
+            print(f"{n:>8} {mode:>14} {elapsed:>7.2f} {n * args.seconds / elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/bench_upload_memory.py
+#
+# Peak RSS of the API process while it saves a large multipart upload,
+# for the previous whole-body read and the chunked copy _save_upload now
+# does, plus how quickly an over-limit upload is refused. Each mode runs in
+# its own uvicorn subprocess, since peak RSS only ever grows.
+#
+#   cd backend && python -m benchmarks.bench_upload_memory
+
+import argparse
+import os
+import resource
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import psutil
+from fastapi import FastAPI, File, UploadFile
+
+from app.api.interview import _save_upload
+from app.utils.upload_limit import UploadLimitMiddleware
+
+app = FastAPI()
+app.add_middleware(UploadLimitMiddleware)
+
+
+def _peak_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@app.post("/legacy")
+async def legacy(audio: UploadFile = File(...)):
+    tmp_dir = tempfile.mkdtemp(prefix="interview-")
+    with open(os.path.join(tmp_dir, "answer.webm"), "wb") as f:
+        f.write(await audio.read())
+    shutil.rmtree(tmp_dir)
+    return {"peak_mb": _peak_mb()}
+
+
+@app.post("/chunked")
+async def chunked(audio: UploadFile = File(...)):
+    _, tmp_dir = await _save_upload(audio)
+    shutil.rmtree(tmp_dir)
+    return {"peak_mb": _peak_mb()}
+
+
+@app.get("/peak")
+async def peak():
+    return {"peak_mb": _peak_mb()}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve(max_bytes: int):
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.bench_upload_memory:app",
+         "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, "MAX_UPLOAD_BYTES": str(max_bytes)}
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        try:
+            httpx.get(f"{url}/peak")
+            return proc, url
+        except httpx.TransportError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("benchmark server did not start")
+
+
+def upload(url: str, path: str) -> httpx.Response:
+    with open(path, "rb") as f:
+        # httpx streams file parts, so the client side does not buffer them
+        return httpx.post(url, files={"audio": ("answer.webm", f, "audio/webm")}, timeout=600)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[64, 256])
+    parser.add_argument("--limit-mb", type=int, default=100)
+    args = parser.parse_args()
+
+    src_dir = tempfile.mkdtemp(prefix="bench-upload-")
+    try:
+        print(f"{'upload MB':>9} {'mode':>8} {'idle MB':>8} {'peak MB':>8} {'delta MB':>8}")
+        for size in args.sizes_mb:
+            path = os.path.join(src_dir, f"{size}.bin")
+            with open(path, "wb") as f:
+                for _ in range(size):
+                    f.write(os.urandom(1024 * 1024))
+
+            for mode in ("legacy", "chunked"):
+                proc, url = serve(max_bytes=(size + 1) * 1024 * 1024)
+                try:
+                    idle = psutil.Process(proc.pid).memory_info().rss / (1024 * 1024)
+                    peak = upload(f"{url}/{mode}", path).json()["peak_mb"]
+                finally:
+                    proc.terminate()
+                    proc.wait()
+                print(f"{size:>9} {mode:>8} {idle:>8.0f} {peak:>8.0f} {peak - idle:>8.0f}")
+
+        size = args.limit_mb * 2
+        path = os.path.join(src_dir, "over.bin")
+        with open(path, "wb") as f:
+            f.truncate(size * 1024 * 1024)
+        proc, url = serve(max_bytes=args.limit_mb * 1024 * 1024)
+        try:
+            start = time.perf_counter()
+            status = upload(f"{url}/chunked", path).status_code
+            elapsed = time.perf_counter() - start
+            peak = httpx.get(f"{url}/peak").json()["peak_mb"]
+        finally:
+            proc.terminate()
+            proc.wait()
+        print(f"\n{size} MB upload with a {args.limit_mb} MB limit: "
+              f"HTTP {status} after {elapsed:.2f}s, server peak {peak:.0f} MB")
+    finally:
+        shutil.rmtree(src_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/check_precision_accuracy.py
+#
+# Accuracy guard for LLM_CPU_PRECISION: scores the fixed transcripts in
+# benchmarks/data/tcs_transcripts.json with the float32 model and with each
+# reduced-precision mode, and fails if any TCS score moves by more than
+# --tolerance points or lands in a different band.
+#
+#   cd backend && HF_TOKEN=... python -m benchmarks.check_precision_accuracy
+#   cd backend && python -m benchmarks.check_precision_accuracy --model tiny --max-new-tokens 8000   # smoke test
+
+import argparse
+import gc
+import json
+import os
+import sys
+
+import torch
+
+from app.models.generation_scheduler import GenerationScheduler
+from app.models.llm_utils import extract_valid_json_objects
+from app.prompts.tcs_prompt import TCS_OUTPUT_SCHEMA, TCS_PROMPT_PREFIX, build_tcs_prompt
+from app.services.tcs_service import parse_tcs_output
+from benchmarks.bench_cpu_precision import load_model
+
+TRANSCRIPTS = os.path.join(os.path.dirname(__file__), "data", "tcs_transcripts.json")
+
+
+def score_all(model_name: str, precision: str, cases: list, max_new_tokens: int) -> list:
+    tokenizer, model = load_model(model_name, precision, hidden_size=256, layers=4)
+    scheduler = GenerationScheduler(tokenizer, model, window_ms=0, max_batch=1)
+
+    results = []
+    for case in cases:
+        text = scheduler.generate(
+            build_tcs_prompt(case["question"], case["transcript"]),
+            max_new_tokens=max_new_tokens,
+            max_length=2536,
+            prefix=TCS_PROMPT_PREFIX,
+            stop_at_json=True,
+            schema=TCS_OUTPUT_SCHEMA
+        )
+        parsed = extract_valid_json_objects(text)
+        results.append(parse_tcs_output(parsed[-1]) if parsed else None)
+
+    del scheduler, model
+    gc.collect()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", choices=["tiny", "llama"], default="llama")
+    parser.add_argument("--precisions", nargs="+", choices=["bfloat16", "int8"], default=["bfloat16", "int8"])
+    parser.add_argument("--tolerance", type=int, default=5)
+    # the random tiny model fills every string to its length cap, so it needs more
+    parser.add_argument("--max-new-tokens", type=int, default=1600)
+    args = parser.parse_args()
+
+    torch.set_grad_enabled(False)
+    with open(TRANSCRIPTS) as f:
+        cases = json.load(f)
+
+    reference = score_all(args.model, "float32", cases, args.max_new_tokens)
+    ok = True
+
+    for precision in args.precisions:
+        results = score_all(args.model, precision, cases, args.max_new_tokens)
+        diffs = []
+        for i, (ref, res) in enumerate(zip(reference, results)):
+            if ref is None or res is None:
+                print(f"{precision:>9} case {i}: unparseable output")
+                ok = False
+                continue
+            diff = abs(res.score - ref.score)
+            diffs.append(diff)
+            flag = ""
+            if diff > args.tolerance or res.band != ref.band:
+                flag = "  <-- outside tolerance"
+                ok = False
+            print(
+                f"{precision:>9} case {i}: float32 {ref.score:>3} ({ref.band:<9}) "
+                f"{precision} {res.score:>3} ({res.band:<9}){flag}"
+            )
+        if diffs:
+            print(f"{precision:>9} max |diff| {max(diffs)}, mean |diff| {sum(diffs) / len(diffs):.1f}")
+
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
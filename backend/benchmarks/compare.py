@@ -0,0 +1,104 @@
+# benchmarks/compare.py
+#
+# Compare two benchmark result files written by benchmarks.suite. A case
+# regresses when both its median and its fastest run are slower than the
+# baseline's by more than --threshold (relative) and by more than --min-ms
+# (absolute, so sub-millisecond cases are not flagged for noise). A few
+# slow runs from a busy machine move the median but not the minimum, so a
+# real slowdown has to show in both. Exits 1 on any regression.
+#
+#   cd backend && python -m benchmarks.compare baseline.json current.json
+
+import argparse
+import json
+import sys
+from typing import List, Tuple
+
+# results from different machines or NLP backends are not comparable
+_META_KEYS = ("machine", "cpu_count", "torch_threads", "nlp_mode", "llm")
+
+
+def load_results(path: str) -> dict:
+    with open(path) as f:
+        data = json.load(f)
+    if "results" not in data:
+        raise ValueError(f"{path} is not a benchmark result file")
+    return data
+
+
+def _slower(before: float, after: float, threshold: float, min_seconds: float) -> bool:
+    return after - before > max(threshold * before, min_seconds)
+
+
+def compare(
+    baseline: dict,
+    current: dict,
+    threshold: float = 0.2,
+    min_seconds: float = 0.002
+) -> Tuple[List[tuple], List[str]]:
+    """
+    Returns (rows, warnings); each row is (case, baseline s, current s,
+    relative change, status) with status ok, faster, REGRESSION, new or
+    missing.
+    """
+    warnings = [
+        f"meta {key} differs: {baseline['meta'].get(key)} vs {current['meta'].get(key)}"
+        for key in _META_KEYS
+        if baseline["meta"].get(key) != current["meta"].get(key)
+    ]
+
+    base, cur = baseline["results"], current["results"]
+    rows = []
+    for case in sorted(set(base) | set(cur)):
+        if case not in cur:
+            rows.append((case, base[case]["median"], None, None, "missing"))
+            continue
+        if case not in base:
+            rows.append((case, None, cur[case]["median"], None, "new"))
+            continue
+
+        b, c = base[case]["median"], cur[case]["median"]
+        # files without "min" fall back to the median alone
+        b_min, c_min = base[case].get("min", b), cur[case].get("min", c)
+        change = (c - b) / b if b > 0 else 0.0
+        if _slower(b, c, threshold, min_seconds) and _slower(b_min, c_min, threshold, min_seconds):
+            status = "REGRESSION"
+        elif _slower(c, b, threshold, min_seconds) and _slower(c_min, b_min, threshold, min_seconds):
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((case, b, c, change, status))
+    return rows, warnings
+
+
+def print_report(rows: List[tuple], warnings: List[str]):
+    for warning in warnings:
+        print(f"warning: {warning}")
+
+    fmt = lambda v: f"{v * 1000:>11.2f}" if v is not None else f"{'-':>11}"
+    print(f"{'case':<48} {'baseline ms':>11} {'current ms':>11} {'change':>8}  status")
+    for case, b, c, change, status in rows:
+        pct = f"{change * 100:>+7.1f}%" if change is not None else f"{'':>8}"
+        print(f"{case:<48} {fmt(b)} {fmt(c)} {pct}  {status}")
+
+    regressions = sum(1 for row in rows if row[4] == "REGRESSION")
+    print(f"\n{regressions} regression(s) in {len(rows)} case(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--min-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    rows, warnings = compare(
+        load_results(args.baseline), load_results(args.current), args.threshold, args.min_ms / 1000
+    )
+    print_report(rows, warnings)
+    sys.exit(1 if any(row[4] == "REGRESSION" for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
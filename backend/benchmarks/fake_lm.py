@@ -0,0 +1,100 @@
+# benchmarks/fake_lm.py
+#
+# A deterministic stand-in for the generation scheduler: returns a fixed
+# reply per task, valid against that task's output schema (tcs, placement, fused, questions) without a
+# model, optionally after a fixed per-token delay. Install it with
+# install_fake_scheduler() to run evaluations and question generation with
+# everything but the LLM real.
+
+import json
+import threading
+import time
+from concurrent.futures import Future
+
+TCS_REPLY = {
+    "score": 72,
+    "band": "Partial",
+    "verdict": "Correct overall idea with gaps in the complexity analysis.",
+    "issues": ["Does not explain how collisions degrade lookups."],
+    "improvement_points": [
+        "State the worst-case complexity and when it happens.",
+        "Explain how the load factor triggers a resize.",
+        "Compare chaining with open addressing.",
+        "Give a concrete example of a good hash function.",
+    ],
+}
+
+PLACEMENT_REPLY = {
+    "standout_strengths": [
+        "Explains the hashing step clearly.",
+        "Keeps the answer structured.",
+        "Uses correct terminology.",
+    ],
+    "top_improvements": [
+        "Quantify trade-offs.",
+        "Cover failure cases.",
+        "Close with a short summary.",
+    ],
+    "placement_coaching": {
+        "current_gaps": ["Little depth on resizing.", "No complexity analysis."],
+        "actionable_improvements": [
+            "Walk through a resize with numbers.",
+            "State best and worst cases explicitly.",
+        ],
+        "placement_focus": ["Data structure internals.", "Complexity analysis."],
+    },
+}
+
+QUESTION_REPLY = {
+    "questions": [f"Sample interview question number {i}?" for i in range(1, 9)],
+}
+
+REPLIES = {
+    "tcs": TCS_REPLY,
+    "placement": PLACEMENT_REPLY,
+    "fused": {"tcs": TCS_REPLY, "placement": PLACEMENT_REPLY},
+    "questions": QUESTION_REPLY,
+}
+
+
+class FakeScheduler:
+    """
+    Same generate/submit interface as GenerationScheduler. ms_per_token
+    simulates decode time (the reply's length in characters stands in for
+    its token count, capped at max_new_tokens).
+    """
+
+    def __init__(self, ms_per_token: float = 0.0):
+        self.ms_per_token = ms_per_token
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(
+        self,
+        prompt: str,
+        max_new_tokens: int,
+        max_length: int,
+        prefix=None,
+        stop_at_json: bool = False,
+        schema=None,
+        task: str = "generate"
+    ) -> str:
+        with self._lock:
+            self.calls += 1
+        reply = json.dumps(REPLIES.get(task, TCS_REPLY))
+        if self.ms_per_token:
+            time.sleep(min(len(reply), max_new_tokens) * self.ms_per_token / 1000.0)
+        return reply
+
+    def submit(self, *args, **kwargs) -> Future:
+        future: Future = Future()
+        future.set_result(self.generate(*args, **kwargs))
+        return future
+
+
+def install_fake_scheduler(ms_per_token: float = 0.0) -> FakeScheduler:
+    from app.models import generation_scheduler
+
+    scheduler = FakeScheduler(ms_per_token)
+    generation_scheduler._SCHEDULER = scheduler
+    return scheduler
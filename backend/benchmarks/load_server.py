@@ -0,0 +1,66 @@
+# benchmarks/load_server.py
+#
+# The interview API with fake models, for load tests: the LLM is the
+# deterministic benchmarks.fake_lm scheduler (LOAD_FAKE_MS_PER_TOKEN of
+# simulated decode time per output character), every evaluation profile
+# uses a tiny random Whisper, and sentiment is disabled. The fakes are
+# installed in this process (question generation) and in every
+# evaluation worker (through the pool initializer). Feature and LLM
+# caches are off so repeated uploads do real work; the question pool
+# stays on, as in production.
+#
+#   cd backend && python -m benchmarks.load_server --port 8000
+
+import argparse
+import os
+
+
+def install_fakes():
+    from app.models import llm_cache
+    from app.services import evaluation_profiles, interview_analysis
+    from benchmarks.bench_profiles import tiny_profiles
+    from benchmarks.fake_lm import install_fake_scheduler
+
+    install_fake_scheduler(float(os.getenv("LOAD_FAKE_MS_PER_TOKEN", "0")))
+    evaluation_profiles.EVALUATION_PROFILES.update(tiny_profiles(1))
+    interview_analysis._PIPELINE_AVAILABLE = False
+    interview_analysis.FEATURE_CACHE_ENABLED = False
+    llm_cache.LLM_CACHE_ENABLED = False
+
+
+def init_fake_worker(metrics_queue, warm_models):
+    # evaluation pool initializer; job_service is freshly imported in the
+    # worker, so _init_worker there is the real one
+    from app.services import job_service
+
+    install_fakes()
+    job_service._init_worker(metrics_queue, warm_models)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--ms-per-token", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, default=None, help="EVALUATION_WORKERS")
+    args = parser.parse_args()
+
+    # read at import time here and by the spawned workers
+    os.environ["LOAD_FAKE_MS_PER_TOKEN"] = str(args.ms_per_token)
+    if args.workers is not None:
+        os.environ["EVALUATION_WORKERS"] = str(args.workers)
+
+    import uvicorn
+
+    from app.main import app
+    from app.services import job_service
+    from benchmarks import load_server
+
+    install_fakes()
+    job_service._init_worker = load_server.init_fake_worker
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+# benchmarks/load_test.py
+#
+# Load generator for the interview API and the code editor's /api/run.
+# --concurrency virtual users each loop for --duration seconds, picking
+# the next request from --mix (weights per operation):
+#   questions  POST /api/interview/generate-questions (varied roles/rounds,
+#              one session id per user, so pools are hit and exhausted)
+#   evaluate   POST /api/interview/evaluate with a synthetic recording
+#   run        POST /api/run with a small Python program
+# Reports throughput, p50/p95/p99 latency, error rates and status codes
+# per operation, and the RSS of each server (including the evaluation
+# workers) over time. --json writes everything to a file.
+#
+# By default both servers are started locally with fake models
+# (benchmarks.load_server, and the code editor app); pass --url / --run-url
+# to target running instances instead (RSS is then not sampled).
+#
+#   cd backend && python -m benchmarks.load_test --concurrency 8 --duration 60
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+import httpx
+import psutil
+
+from benchmarks.audio_fixtures import write_recording
+
+ROLES = ["Backend Engineer", "Data Scientist", "Frontend Engineer", "SRE", "ML Engineer"]
+ROUNDS = ["HR", "Technical", "DSA", "Communication"]
+PROGRAM = "total = 0\nfor i in range(100000):\n    total += i\nprint(total)\n"
+
+
+@dataclass
+class Sample:
+    op: str
+    start: float  # seconds since the run started
+    seconds: float
+    status: str  # HTTP status code, or the transport error's name
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        op, _, weight = part.partition("=")
+        if op not in ("questions", "evaluate", "run"):
+            raise ValueError(f"Unknown operation '{op}' in --mix")
+        mix[op] = float(weight or 1)
+    return {op: w for op, w in mix.items() if w > 0}
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    # nearest rank
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, math.ceil(q / 100 * len(values)) - 1))]
+
+
+class RssSampler:
+    """Summed RSS (MB) of each named process and its descendants."""
+
+    def __init__(self, pids: Dict[str, int], interval: float = 0.5):
+        self.pids = pids
+        self.interval = interval
+        self.timeline: List[dict] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._t0 = time.perf_counter()
+
+    def _rss(self, pid: int) -> float:
+        try:
+            proc = psutil.Process(pid)
+            procs = [proc] + proc.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return 0.0
+        total = 0
+        for p in procs:
+            try:
+                total += p.memory_info().rss
+            except psutil.NoSuchProcess:
+                pass
+        return total / (1024 * 1024)
+
+    def _run(self):
+        while not self._stop.is_set():
+            row = {"t": round(time.perf_counter() - self._t0, 2)}
+            row.update({name: round(self._rss(pid), 1) for name, pid in self.pids.items()})
+            self.timeline.append(row)
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._t0 = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+async def run_load(args, mix: Dict[str, float], audio: bytes) -> List[Sample]:
+    samples: List[Sample] = []
+    ops, weights = list(mix), list(mix.values())
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+
+    async def request(client: httpx.AsyncClient, op: str, rng: random.Random, session: str):
+        if op == "questions":
+            return await client.post(f"{args.url}/api/interview/generate-questions", json={
+                "role": rng.choice(ROLES),
+                "experience": f"{rng.randint(0, 8)} years",
+                "company_type": rng.choice(["startup", "enterprise"]),
+                "interview_round": rng.choice(ROUNDS),
+                "session_id": session,
+            })
+        if op == "evaluate":
+            return await client.post(
+                f"{args.url}/api/interview/evaluate",
+                files={"audio": ("answer.webm", audio, "audio/webm")},
+                data={"questions": json.dumps(["Explain how a hash map works."]), "profile": args.profile},
+            )
+        return await client.post(f"{args.run_url}/api/run", json={"language": "python", "code": PROGRAM})
+
+    async def user(client: httpx.AsyncClient, index: int, t0: float, end: float):
+        rng = random.Random(args.seed + index)
+        session = f"load-{index}"
+        while time.perf_counter() < end:
+            op = rng.choices(ops, weights)[0]
+            start = time.perf_counter()
+            try:
+                status = str((await request(client, op, rng, session)).status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            samples.append(Sample(op, round(start - t0, 3), time.perf_counter() - start, status))
+
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        # one of each first, so model loads are not in the numbers
+        for op in ops:
+            await request(client, op, random.Random(args.seed), "warmup")
+
+        t0 = time.perf_counter()
+        end = t0 + args.duration
+        await asyncio.gather(*(user(client, i, t0, end) for i in range(args.concurrency)))
+    return samples
+
+
+def summarize(samples: List[Sample]) -> Dict[str, dict]:
+    # throughput over the measured window, including requests that were
+    # still in flight when the duration ran out
+    elapsed = max((s.start + s.seconds for s in samples), default=0.0)
+    groups: Dict[str, List[Sample]] = {}
+    for s in samples:
+        groups.setdefault(s.op, []).append(s)
+    groups["all"] = samples
+
+    summary = {}
+    for op, group in groups.items():
+        ok = [s.seconds for s in group if s.status.startswith("2")]
+        statuses: Dict[str, int] = {}
+        for s in group:
+            statuses[s.status] = statuses.get(s.status, 0) + 1
+        summary[op] = {
+            "requests": len(group),
+            "throughput_rps": len(ok) / elapsed if elapsed else 0.0,
+            "error_rate": 1 - len(ok) / len(group) if group else 0.0,
+            "p50_ms": (percentile(ok, 50) or 0) * 1000,
+            "p95_ms": (percentile(ok, 95) or 0) * 1000,
+            "p99_ms": (percentile(ok, 99) or 0) * 1000,
+            "statuses": statuses,
+        }
+    return summary
+
+
+def wait_until_up(url: str, timeout: float):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if httpx.get(url).status_code < 500:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mix", default="questions=4,evaluate=1,run=4")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--url", default=None, help="interview API; started locally when omitted")
+    parser.add_argument("--run-url", default=None, help="code editor API; started locally when omitted")
+    parser.add_argument("--workers", type=int, default=2, help="EVALUATION_WORKERS of the local server")
+    parser.add_argument("--ms-per-token", type=float, default=2.0, help="fake LLM decode time")
+    parser.add_argument("--profile", default="fast")
+    parser.add_argument("--audio-seconds", type=float, default=20)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None)
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+
+    procs: Dict[str, subprocess.Popen] = {}
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        if args.url is None:
+            port = _free_port()
+            procs["api"] = subprocess.Popen(
+                [sys.executable, "-m", "benchmarks.load_server", "--port", str(port),
+                 "--workers", str(args.workers), "--ms-per-token", str(args.ms_per_token)],
+                cwd=backend
+            )
+            args.url = f"http://127.0.0.1:{port}"
+            wait_until_up(f"{args.url}/health", 120)
+        if args.run_url is None and "run" in mix:
+            port = _free_port()
+            # the code editor imports its modules relative to app/
+            procs["run"] = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "codeeditor.main:app", "--app-dir", "app",
+                 "--port", str(port), "--log-level", "warning"],
+                cwd=backend
+            )
+            args.run_url = f"http://127.0.0.1:{port}"
+            wait_until_up(f"{args.run_url}/openapi.json", 60)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_recording(os.path.join(tmp, "answer.webm"), args.audio_seconds)
+            with open(path, "rb") as f:
+                audio = f.read()
+
+        sampler = RssSampler({name: p.pid for name, p in procs.items()})
+        sampler.start()
+        start = time.perf_counter()
+        samples = asyncio.run(run_load(args, mix, audio))
+        elapsed = time.perf_counter() - start
+        sampler.stop()
+    finally:
+        for p in procs.values():
+            p.terminate()
+        for p in procs.values():
+            p.wait()
+
+    summary = summarize(samples)
+    print(f"\n{args.concurrency} users for {args.duration:g}s (wall {elapsed:.1f}s incl. warm-up), mix {args.mix}\n")
+    print(f"{'op':>9} {'requests':>8} {'req/s':>7} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  statuses")
+    for op, s in summary.items():
+        print(
+            f"{op:>9} {s['requests']:>8} {s['throughput_rps']:>7.2f} {s['error_rate'] * 100:>6.1f}% "
+            f"{s['p50_ms']:>8.0f} {s['p95_ms']:>8.0f} {s['p99_ms']:>8.0f}  {s['statuses']}"
+        )
+
+    timeline = sampler.timeline
+    if timeline and sampler.pids:
+        names = list(sampler.pids)
+        print(f"\nRSS MB (server and its workers)\n{'t s':>7} " + " ".join(f"{n:>8}" for n in names))
+        step = max(1, len(timeline) // 10)
+        for row in timeline[::step] + ([timeline[-1]] if (len(timeline) - 1) % step else []):
+            print(f"{row['t']:>7.1f} " + " ".join(f"{row[n]:>8.1f}" for n in names))
+        print(f"{'peak':>7} " + " ".join(f"{max(r[n] for r in timeline):>8.1f}" for n in names))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "config": {k: v for k, v in vars(args).items() if k != "json"},
+                "summary": summary,
+                "rss": timeline,
+                "samples": [asdict(s) for s in samples],
+            }, f, indent=2)
+        print(f"\nwrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
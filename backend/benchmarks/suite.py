@@ -0,0 +1,249 @@
+# benchmarks/suite.py
+#
+# Offline regression suite: times the CS pipeline stage by stage and the
+# full evaluate_interview on synthetic speech-like recordings of several
+# lengths, plus detect_signals, calculate_score, extract_valid_json_objects,
+# a tiny-LM generate call and run_code, and writes the medians to a JSON
+# file. With --baseline the run is compared against a saved result file
+# (see benchmarks.compare) and the exit status is 1 on a regression.
+#
+# Everything runs on CPU without downloads: Whisper is a tiny random model,
+# the LLM in the evaluation cases is a deterministic fake (benchmarks.fake_lm)
+# so the cases measure everything around generation, and generation itself
+# is timed separately on a tiny random Llama. Sentiment is disabled (its
+# model needs a download); the feature and LLM caches are off so every
+# repeat does the work. signals need spaCy's en_core_web_sm: without it
+# detect_signals falls back to regex matching, which times something else,
+# so the suite refuses to run unless --allow-regex-nlp is given.
+#
+#   cd backend && python -m benchmarks.suite --out baseline.json
+#   ... change code ...
+#   cd backend && python -m benchmarks.suite --out current.json --baseline baseline.json
+
+import argparse
+import dataclasses
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import torch
+
+from app.audio.pitch_analysis import analyze_pitch_dynamics
+from app.codeeditor.executor import run_code
+from app.models import llm_cache
+from app.models.generation_scheduler import GenerationScheduler
+from app.models.llm_utils import extract_valid_json_objects
+from app.nlp import linguistics
+from app.nlp.signals import detect_signals
+from app.scoring.cs_engine import calculate_score
+from app.services import interview_analysis
+from app.services.interview_analysis import run_cs_pipeline
+from app.services.evaluation_profiles import EVALUATION_PROFILES
+from app.services.interview_evaluator import evaluate_interview
+from benchmarks.audio_fixtures import speechlike_signal, write_recording
+from benchmarks.bench_profiles import QUESTIONS, tiny_profiles
+from benchmarks.bench_signals import CLAUSES
+from benchmarks.compare import compare, load_results, print_report
+from benchmarks.fake_lm import TCS_REPLY, install_fake_scheduler
+from benchmarks.tiny_lm import build_tiny_lm
+
+PROGRAMS = {
+    "python": ("python3", "total = 0\nfor i in range(200000):\n    total += i * i\nprint(total)\n"),
+    "javascript": ("node", "let t = 0;\nfor (let i = 0; i < 200000; i++) t += i * i;\nconsole.log(t);\n"),
+    "cpp": (
+        "g++",
+        "#include <iostream>\nint main() {\n    long long t = 0;\n"
+        "    for (long long i = 0; i < 200000; i++) t += i * i;\n"
+        "    std::cout << t << std::endl;\n}\n"
+    ),
+}
+
+# a typical reply: prose around the JSON object, then a long noisy one
+TCS_TEXT = "Here is the evaluation:\n" + json.dumps(TCS_REPLY, indent=2) + "\nDone."
+NOISY_TEXT = ("{ partial: " + "x" * 200 + " } ") * 20 + json.dumps(TCS_REPLY) * 5
+
+
+def transcript_of(words: int) -> str:
+    out, i = [], 0
+    while sum(len(s.split()) for s in out) < words:
+        out.append(CLAUSES[i % len(CLAUSES)].replace("*", "") + ".")
+        i += 1
+    return " ".join(out)
+
+
+def measure(fn: Callable, repeats: int) -> Dict[str, float]:
+    fn()  # warm-up: model loads, first-call caches
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"median": statistics.median(times), "min": min(times), "n": repeats}
+
+
+def measure_stages(fn: Callable[[], Dict[str, float]], repeats: int) -> Dict[str, Dict[str, float]]:
+    # fn returns seconds per stage; each stage is reported like a case
+    fn()
+    per_stage: Dict[str, List[float]] = {}
+    for _ in range(repeats):
+        for stage, seconds in fn().items():
+            per_stage.setdefault(stage, []).append(seconds)
+    return {
+        stage: {"median": statistics.median(times), "min": min(times), "n": len(times)}
+        for stage, times in per_stage.items()
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", default="benchmark-results.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--min-ms", type=float, default=2.0)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--lengths", type=float, nargs="+", default=[10, 30, 90])
+    parser.add_argument("--words", type=int, nargs="+", default=[250, 1000, 4000])
+    parser.add_argument("--profile", default="fast")
+    parser.add_argument("--allow-regex-nlp", action="store_true",
+                        help="run even if spaCy's model is missing (signals cases then time regex)")
+    parser.add_argument(
+        "--cases", default="cs_pipeline,evaluate_interview,detect_signals,calculate_score,"
+                           "extract_valid_json_objects,llm_generate,run_code"
+    )
+    args = parser.parse_args()
+    cases = set(args.cases.split(","))
+
+    interview_analysis._PIPELINE_AVAILABLE = False
+    interview_analysis.FEATURE_CACHE_ENABLED = False
+    llm_cache.LLM_CACHE_ENABLED = False
+    install_fake_scheduler()
+    profile = tiny_profiles(1)[args.profile]
+    if not profile.placement_max_new_tokens:
+        # the fake LLM costs nothing, so keep placement in the timed path
+        profile = dataclasses.replace(
+            profile, placement_max_new_tokens=EVALUATION_PROFILES["balanced"].placement_max_new_tokens
+        )
+    linguistics.get_nlp()
+    if linguistics.NLP_MODE != "spacy":
+        message = (
+            f"NLP mode is '{linguistics.NLP_MODE}', not spacy: en_core_web_sm is not installed, so "
+            "detect_signals and the pipelines time the regex fallback "
+            "(python -m spacy download en_core_web_sm)"
+        )
+        if not args.allow_regex_nlp:
+            sys.exit(f"error: {message}; pass --allow-regex-nlp to run anyway")
+        print(f"WARNING: {message}", file=sys.stderr)
+
+    tmp = tempfile.mkdtemp(prefix="bench-suite-")
+    results: Dict[str, Dict[str, float]] = {}
+
+    def record(name: str, result: Dict[str, float]):
+        results[name] = result
+        print(f"{name:<48} {result['median'] * 1000:>10.2f} ms")
+
+    for seconds in args.lengths if cases & {"cs_pipeline", "evaluate_interview"} else []:
+        path = write_recording(os.path.join(tmp, f"answer-{seconds:g}s.webm"), seconds)
+        if "cs_pipeline" in cases:
+            stages = measure_stages(
+                lambda: {
+                    stage: t["seconds"]
+                    for stage, t in run_cs_pipeline(path, profile=profile)["timings"].items()
+                },
+                args.repeats
+            )
+            for stage, result in stages.items():
+                record(f"cs_pipeline/{seconds:g}s/{stage}", result)
+        if "evaluate_interview" in cases:
+            stages = measure_stages(
+                lambda: evaluate_interview(path, QUESTIONS, profile=profile, debug=True)["timings"],
+                args.repeats
+            )
+            for stage in ("tcs", "placement", "total"):
+                if stage in stages:
+                    record(f"evaluate_interview/{seconds:g}s/{stage}", stages[stage])
+
+    if "detect_signals" in cases:
+        for words in args.words:
+            text = transcript_of(words)
+            record(f"detect_signals/{words}w", measure(lambda: detect_signals(text, []), args.repeats))
+
+    if "calculate_score" in cases:
+        text = transcript_of(1000)
+        signals = detect_signals(text, [])
+        pitch = analyze_pitch_dynamics(speechlike_signal(30), 16000)
+        record("calculate_score", measure(
+            lambda: calculate_score(
+                transcript=text, duration=300.0, signals=signals, pitch_data=pitch, sentiment_res=None
+            ),
+            args.repeats * 10
+        ))
+
+    if "extract_valid_json_objects" in cases:
+        record("extract_valid_json_objects/reply",
+               measure(lambda: extract_valid_json_objects(TCS_TEXT), args.repeats * 10))
+        record("extract_valid_json_objects/noisy",
+               measure(lambda: extract_valid_json_objects(NOISY_TEXT), args.repeats * 10))
+
+    if "llm_generate" in cases:
+        tokenizer, model = build_tiny_lm(hidden_size=128, num_layers=2)
+        scheduler = GenerationScheduler(tokenizer, model)
+        prompt = "Interview Question:\n" + QUESTIONS[0] + "\n\nCandidate Answer:\n" + transcript_of(100)
+        record("llm_generate/tiny/64t", measure(
+            lambda: scheduler.generate(prompt, max_new_tokens=64, max_length=512), args.repeats
+        ))
+
+    if "run_code" in cases:
+        for language, (tool, code) in PROGRAMS.items():
+            if shutil.which(tool) is None:
+                print(f"run_code/{language}: skipped ({tool} not installed)")
+                continue
+            record(f"run_code/{language}", measure(lambda: run_code(language, code), args.repeats))
+
+    shutil.rmtree(tmp, ignore_errors=True)
+
+    out = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "torch_threads": torch.get_num_threads(),
+            "nlp_mode": linguistics.NLP_MODE,
+            "llm": "fake",
+            "profile": args.profile,
+            "repeats": args.repeats,
+        },
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(out, f, indent=2, sort_keys=True)
+    print(f"\nwrote {len(results)} results to {args.out}")
+
+    if args.baseline:
+        print()
+        rows, warnings = compare(load_results(args.baseline), out, args.threshold, args.min_ms / 1000)
+        print_report(rows, warnings)
+        if any(row[4] == "REGRESSION" for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
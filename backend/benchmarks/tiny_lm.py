@@ -0,0 +1,53 @@
+# benchmarks/tiny_lm.py
+#
+# A tiny randomly initialised Llama + byte-level tokenizer built entirely
+# offline, so generation benchmarks run on CPU without downloading weights.
+
+import torch
+from tokenizers import Tokenizer, decoders, models, pre_tokenizers
+from transformers import LlamaConfig, LlamaForCausalLM, PreTrainedTokenizerFast
+
+SPECIAL_TOKENS = ["<|begin_of_text|>", "<|eot_id|>"]
+
+
+def build_tiny_tokenizer() -> PreTrainedTokenizerFast:
+    byte_vocab = pre_tokenizers.ByteLevel.alphabet()
+    vocab = {tok: i for i, tok in enumerate(SPECIAL_TOKENS + sorted(byte_vocab))}
+
+    tok = Tokenizer(models.BPE(vocab=vocab, merges=[]))
+    tok.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    tok.decoder = decoders.ByteLevel()
+
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=tok,
+        bos_token=SPECIAL_TOKENS[0],
+        eos_token=SPECIAL_TOKENS[1],
+    )
+    tokenizer.pad_token = tokenizer.eos_token
+    return tokenizer
+
+
+def build_tiny_lm(
+    hidden_size: int = 256,
+    num_layers: int = 4,
+    seed: int = 0
+):
+    torch.manual_seed(seed)
+    tokenizer = build_tiny_tokenizer()
+
+    config = LlamaConfig(
+        vocab_size=len(tokenizer),
+        hidden_size=hidden_size,
+        intermediate_size=hidden_size * 4,
+        num_hidden_layers=num_layers,
+        num_attention_heads=8,
+        num_key_value_heads=4,
+        max_position_embeddings=8192,
+        bos_token_id=tokenizer.bos_token_id,
+        eos_token_id=tokenizer.eos_token_id,
+        pad_token_id=tokenizer.pad_token_id,
+    )
+
+    model = LlamaForCausalLM(config)
+    model.eval()
+    return tokenizer, model
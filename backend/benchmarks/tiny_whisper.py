@@ -0,0 +1,104 @@
+# benchmarks/tiny_whisper.py
+#
+# A tiny randomly initialised Whisper converted to CTranslate2, with a
+# byte-level tokenizer carrying Whisper's special tokens, so transcription
+# benchmarks run with faster-whisper offline. Its output is noise; only
+# throughput and plumbing are meaningful.
+
+import json
+import os
+import tempfile
+
+import torch
+from faster_whisper.tokenizer import _LANGUAGE_CODES
+from tokenizers import Tokenizer, decoders, models, pre_tokenizers
+from transformers import (
+    GenerationConfig,
+    PreTrainedTokenizerFast,
+    WhisperConfig,
+    WhisperForConditionalGeneration,
+)
+
+_CACHE_DIR = os.path.join(tempfile.gettempdir(), "tiny-whisper-ct2")
+
+
+def _special_tokens():
+    return (
+        ["<|endoftext|>", "<|startoftranscript|>"]
+        + [f"<|{code}|>" for code in _LANGUAGE_CODES]
+        + ["<|translate|>", "<|transcribe|>", "<|startoflm|>", "<|startofprev|>",
+           "<|nospeech|>", "<|notimestamps|>"]
+        + [f"<|{i * 0.02:.2f}|>" for i in range(1501)]
+    )
+
+
+def _build_tokenizer() -> Tokenizer:
+    byte_vocab = sorted(pre_tokenizers.ByteLevel.alphabet())
+    specials = _special_tokens()
+    vocab = {tok: i for i, tok in enumerate(byte_vocab + specials)}
+
+    tok = Tokenizer(models.BPE(vocab=vocab, merges=[]))
+    tok.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    tok.decoder = decoders.ByteLevel()
+    tok.add_special_tokens(specials)
+    return tok
+
+
+def build_tiny_whisper(d_model: int = 128, layers: int = 2, seed: int = 0) -> str:
+    """
+    Returns a model directory usable as WhisperModel(path). Built once per
+    shape and cached under the temp dir.
+    """
+    out_dir = os.path.join(_CACHE_DIR, f"d{d_model}-l{layers}-s{seed}")
+    if os.path.isfile(os.path.join(out_dir, "model.bin")):
+        return out_dir
+
+    import ctranslate2
+
+    torch.manual_seed(seed)
+    tokenizer = _build_tokenizer()
+    ids = {tok: tokenizer.token_to_id(tok) for tok in _special_tokens()[:112]}
+    eot, sot = ids["<|endoftext|>"], ids["<|startoftranscript|>"]
+
+    config = WhisperConfig(
+        vocab_size=tokenizer.get_vocab_size(),
+        num_mel_bins=80,
+        d_model=d_model,
+        encoder_layers=layers,
+        decoder_layers=layers,
+        encoder_attention_heads=4,
+        decoder_attention_heads=4,
+        encoder_ffn_dim=d_model * 4,
+        decoder_ffn_dim=d_model * 4,
+        max_source_positions=1500,
+        max_target_positions=448,
+        bos_token_id=eot,
+        eos_token_id=eot,
+        pad_token_id=eot,
+        decoder_start_token_id=sot,
+        suppress_tokens=[],
+        begin_suppress_tokens=[eot],
+    )
+    model = WhisperForConditionalGeneration(config).eval()
+    model.generation_config = GenerationConfig(
+        decoder_start_token_id=sot,
+        eos_token_id=eot,
+        pad_token_id=eot,
+        no_timestamps_token_id=ids["<|notimestamps|>"],
+        alignment_heads=[[layers - 1, h] for h in range(4)],
+        is_multilingual=True,
+        lang_to_id={f"<|{c}|>": ids[f"<|{c}|>"] for c in _LANGUAGE_CODES},
+        task_to_id={"transcribe": ids["<|transcribe|>"], "translate": ids["<|translate|>"]},
+    )
+
+    with tempfile.TemporaryDirectory() as hf_dir:
+        model.save_pretrained(hf_dir)
+        # the converter reads the vocabulary from the saved tokenizer
+        PreTrainedTokenizerFast(tokenizer_object=tokenizer).save_pretrained(hf_dir)
+        ctranslate2.converters.TransformersConverter(hf_dir).convert(out_dir, force=True)
+
+    tokenizer.save(os.path.join(out_dir, "tokenizer.json"))
+    with open(os.path.join(out_dir, "preprocessor_config.json"), "w") as f:
+        json.dump({"feature_size": 80, "sampling_rate": 16000, "hop_length": 160,
+                   "chunk_length": 30, "n_fft": 400}, f)
+    return out_dir
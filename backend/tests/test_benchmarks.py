@@ -0,0 +1,36 @@
+# tests/test_benchmarks.py
+
+import pytest
+
+from app.prompts.evaluation_prompt import FUSED_OUTPUT_SCHEMA
+from app.prompts.placement_prompt import PLACEMENT_OUTPUT_SCHEMA
+from app.prompts.question_prompt import build_question_output_schema
+from app.prompts.tcs_prompt import TCS_OUTPUT_SCHEMA
+from benchmarks.bench_schema_decoding import check
+from benchmarks.compare import compare
+from benchmarks.fake_lm import REPLIES
+
+
+@pytest.mark.parametrize("task, schema", [
+    ("tcs", TCS_OUTPUT_SCHEMA),
+    ("placement", PLACEMENT_OUTPUT_SCHEMA),
+    ("fused", FUSED_OUTPUT_SCHEMA),
+    ("questions", build_question_output_schema(8)),
+])
+def test_fake_replies_match_the_output_schemas(task, schema):
+    assert check(REPLIES[task], schema)
+    if "properties" in schema:
+        assert list(REPLIES[task]) == list(schema["properties"])
+
+
+def _results(**cases):
+    return {"meta": {}, "results": {
+        name: {"median": median, "min": fastest} for name, (median, fastest) in cases.items()
+    }}
+
+
+def test_compare_needs_median_and_min_to_regress():
+    baseline = _results(noisy=(0.100, 0.090), slow=(0.100, 0.090), fast=(0.100, 0.090))
+    current = _results(noisy=(0.130, 0.092), slow=(0.130, 0.120), fast=(0.070, 0.060))
+    rows, _ = compare(baseline, current, threshold=0.2, min_seconds=0.002)
+    assert {row[0]: row[4] for row in rows} == {"noisy": "ok", "slow": "REGRESSION", "fast": "faster"}
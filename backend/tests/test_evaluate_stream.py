@@ -0,0 +1,136 @@
+# tests/test_evaluate_stream.py
+
+import asyncio
+import json
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import job_service
+from app.store.job_store import get_job
+
+STAGES = ["transcript", "cs", "tcs", "placement"]
+UPLOAD = {
+    "files": {"audio": ("answer.webm", b"x", "audio/webm")},
+    "data": {"questions": '["Explain how a hash map works."]'},
+}
+
+
+class FakePipeline:
+    """Stands in for evaluate_interview: reports each stage, then returns."""
+
+    def __init__(self, fail_after: str = None):
+        self.fail_after = fail_after
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, audio_path, questions, on_stage=None, **kwargs):
+        for stage in STAGES:
+            on_stage(stage, {"stage": stage})
+            if stage == self.fail_after:
+                raise RuntimeError(f"{stage} failed")
+            if stage == "transcript":
+                self.release.wait(5)
+        return {"questions": questions, "placement": {"ready": True}}
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # in-process worker and plain queues instead of spawned workers and a
+    # Manager; iter_job_events reads them the same way
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(job_service, "_IN_FLIGHT", 0)
+    monkeypatch.setattr(job_service, "_METRICS_QUEUE", queue.SimpleQueue())
+    monkeypatch.setattr(job_service, "_get_pool", lambda: executor)
+    monkeypatch.setattr(job_service, "_get_manager", lambda: SimpleNamespace(Queue=queue.Queue))
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def _pipeline(monkeypatch, **kwargs) -> FakePipeline:
+    pipeline = FakePipeline(**kwargs)
+    monkeypatch.setattr(job_service, "evaluate_interview", pipeline)
+    return pipeline
+
+
+def _frames(body: str) -> list:
+    return [json.loads(line) for line in body.splitlines()]
+
+
+def test_stages_stream_in_order_then_the_result(pool, monkeypatch):
+    _pipeline(monkeypatch)
+    response = TestClient(app).post("/api/interview/evaluate/stream", **UPLOAD)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    frames = _frames(response.text)
+    assert [f["stage"] for f in frames] == ["queued", *STAGES, "result"]
+    assert frames[1]["data"] == {"stage": "transcript"}
+    assert frames[-1]["data"] == {
+        "questions": ["Explain how a hash map works."], "placement": {"ready": True}
+    }
+
+
+def test_failed_stage_ends_with_an_error_frame(pool, monkeypatch):
+    _pipeline(monkeypatch, fail_after="cs")
+    response = TestClient(app).post("/api/interview/evaluate/stream", **UPLOAD)
+
+    frames = _frames(response.text)
+    assert [f["stage"] for f in frames] == ["queued", "transcript", "cs", "error"]
+    assert frames[-1]["data"] == {"detail": "cs failed"}
+
+
+def test_client_disconnecting_mid_stream(pool, monkeypatch):
+    pipeline = _pipeline(monkeypatch)
+    pipeline.release.clear()
+    request = httpx.Request("POST", "http://testserver/api/interview/evaluate/stream", **UPLOAD)
+    bodies = [request.read()]
+    sent = []
+    seen_transcript = asyncio.Event()
+
+    async def receive():
+        if bodies:
+            return {"type": "http.request", "body": bodies.pop(), "more_body": False}
+        await seen_transcript.wait()
+        pipeline.release.set()  # the job carries on without a listener
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+        if b'"transcript"' in message.get("body", b""):
+            seen_transcript.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+        "root_path": "",
+        "path": "/api/interview/evaluate/stream",
+        "raw_path": b"/api/interview/evaluate/stream",
+        "query_string": b"",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in request.headers.items()],
+    }
+    asyncio.run(asyncio.wait_for(app(scope, receive, send), timeout=10))
+
+    chunks = [m for m in sent if m["type"] == "http.response.body"]
+    frames = _frames(b"".join(m["body"] for m in chunks).decode())
+    assert [f["stage"] for f in frames] == ["queued", "transcript"]
+    assert all(m.get("more_body") for m in chunks)  # never finished
+
+    # the job still runs to the end and releases its slot and upload
+    pool.shutdown(wait=True)
+    job = get_job(frames[0]["data"]["job_id"])
+    assert job["future"].result()["placement"] == {"ready": True}
+    assert job_service._IN_FLIGHT == 0
+    assert not os.path.exists(job["metadata"]["tmp_dir"])
@@ -0,0 +1,86 @@
+# tests/test_feature_cache.py
+
+import os
+import stat
+
+import pytest
+
+from app.audio import pitch_analysis
+from app.schemas.transcription import TranscriptionResult
+from app.services import feature_cache
+from app.services.feature_cache import feature_key, get_features, put_features
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = str(tmp_path / "features")
+    monkeypatch.setattr(feature_cache, "FEATURE_CACHE_DIR", path)
+    return path
+
+
+def test_entries_round_trip_as_json(cache_dir):
+    tr = TranscriptionResult(
+        text="hello there",
+        segments=[{"start": 0.0, "end": 1.5, "text": "hello there", "words": []}],
+        language="en",
+        duration=1.5,
+        num_segments=1,
+    )
+    put_features("transcription-a", tr)
+    put_features("signals-b", {"filler_count": 2, "hedge_count": 0})
+
+    assert get_features("transcription-a") == tr
+    assert get_features("signals-b") == {"filler_count": 2, "hedge_count": 0}
+    assert sorted(os.listdir(cache_dir)) == ["signals-b.json", "transcription-a.json"]
+
+
+def test_unreadable_entry_is_a_miss_and_dropped(cache_dir):
+    put_features("pitch-a", {"voiced_ratio": 0.5})
+    with open(os.path.join(cache_dir, "pitch-a.json"), "w") as f:
+        f.write("\x80garbage")
+    assert get_features("pitch-a") is None
+    assert not os.path.exists(os.path.join(cache_dir, "pitch-a.json"))
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_cache_dir_is_private(cache_dir):
+    put_features("signals-a", {})
+    assert stat.S_IMODE(os.stat(cache_dir).st_mode) == 0o700
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_loose_permissions_are_tightened(cache_dir):
+    os.makedirs(cache_dir)
+    os.chmod(cache_dir, 0o777)
+    put_features("signals-a", {})
+    assert stat.S_IMODE(os.stat(cache_dir).st_mode) == 0o700
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_foreign_cache_dir_is_a_miss_and_not_written(cache_dir, monkeypatch, caplog):
+    os.makedirs(cache_dir)
+    monkeypatch.setattr(os, "getuid", lambda: os.stat(cache_dir).st_uid + 1)
+    assert get_features("signals-a") is None
+    put_features("signals-a", {})
+    assert os.listdir(cache_dir) == []
+    assert "another user" in caplog.text
+
+
+def test_failed_write_is_skipped(cache_dir, monkeypatch, caplog):
+    def disk_full(*args):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(feature_cache.os, "replace", disk_full)
+    put_features("signals-a", {"filler_count": 1})
+    assert os.listdir(cache_dir) == []
+    assert "No space left" in caplog.text
+    assert feature_cache.get_feature_cache_stats()["stages"]["signals"]["errors"] >= 1
+
+
+def test_pitch_settings_change_the_key(monkeypatch):
+    before = {b: feature_key("pitch", "audio", *pitch_analysis.pitch_settings(b)) for b in ("pyin", "yin")}
+    monkeypatch.setattr(pitch_analysis, "YIN_THRESHOLD", 0.2)
+    monkeypatch.setattr(pitch_analysis, "PYIN_FRAME_LENGTH", 1024)
+    after = {b: feature_key("pitch", "audio", *pitch_analysis.pitch_settings(b)) for b in ("pyin", "yin")}
+    assert before["yin"] != after["yin"]
+    assert before["pyin"] != after["pyin"]
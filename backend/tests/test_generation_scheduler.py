@@ -0,0 +1,56 @@
+# tests/test_generation_scheduler.py
+
+import threading
+
+import pytest
+
+from app.models.generation_scheduler import GenerationScheduler
+from benchmarks.tiny_lm import build_tiny_lm
+
+PREFIX = "You are an interviewer. Score the answer below.\n\n"
+PROMPT = PREFIX + "Interview Question:\nWhat is a hash map?\n\nCandidate Answer:\n" + "word " * 400
+
+
+@pytest.fixture(scope="module")
+def scheduler():
+    tokenizer, model = build_tiny_lm(hidden_size=64, num_layers=1)
+    return GenerationScheduler(tokenizer, model)
+
+
+def test_encode_truncates_to_max_length(scheduler):
+    input_ids, prefix = scheduler.encode(PROMPT, max_length=100)
+    assert prefix is None
+    assert len(input_ids) == 100
+
+    prefix_len = len(scheduler.tokenizer(PREFIX)["input_ids"])
+    input_ids, prefix = scheduler.encode(PROMPT, max_length=300, prefix=PREFIX)
+    assert prefix == PREFIX
+    assert len(input_ids) == 300 - prefix_len
+
+
+def test_concurrent_encodes_keep_their_own_truncation(scheduler):
+    # the fast tokenizer's truncation setting is shared state, so callers
+    # with different max_length must not see each other's
+    cases = [(PROMPT, 120, None), (PROMPT, 250, PREFIX), (PROMPT, 400, None)]
+    expected = [scheduler.encode(*case) for case in cases]
+    wrong = []
+
+    def worker(case, want):
+        for _ in range(300):
+            if scheduler.encode(*case) != want:
+                wrong.append(case[1])
+
+    threads = [threading.Thread(target=worker, args=pair) for pair in zip(cases, expected)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert wrong == []
+
+
+def test_batched_requests_match_single_requests(scheduler):
+    prompts = [PROMPT[:200], PROMPT[:320]]
+    single = [scheduler.generate(p, max_new_tokens=8, max_length=512) for p in prompts]
+    futures = [scheduler.submit(p, max_new_tokens=8, max_length=512) for p in prompts]
+    assert [f.result() for f in futures] == single
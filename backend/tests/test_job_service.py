@@ -0,0 +1,178 @@
+# tests/test_job_service.py
+
+import asyncio
+import os
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import interview
+from app.main import app
+from app.services import job_service
+from app.services.job_service import JobCancelledError, run_evaluation, submit_evaluation
+from app.utils.metrics import REGISTRY, Counter
+
+JOBS = Counter("test_worker_jobs_total", "Jobs run by the stub worker.", ("outcome",))
+
+
+class StubEvaluation:
+    """Stands in for evaluate_interview; holds its worker until released."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def __call__(self, audio_path, questions, **kwargs):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        JOBS.inc("ok")
+        return {"questions": questions}
+
+
+class FakePool:
+    def __init__(self):
+        self.shut_down = False
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    # one in-process worker and one queue slot instead of spawned workers;
+    # the stub job's metric deltas still go through the merge thread
+    evaluation = StubEvaluation()
+    pool = ThreadPoolExecutor(max_workers=1)
+    metrics = queue.SimpleQueue()
+    merger = threading.Thread(target=job_service._merge_worker_metrics, args=(metrics,), daemon=True)
+    merger.start()
+
+    monkeypatch.setattr(job_service, "EVALUATION_WORKERS", 1)
+    monkeypatch.setattr(job_service, "EVALUATION_QUEUE_SIZE", 1)
+    monkeypatch.setattr(job_service, "_IN_FLIGHT", 0)
+    monkeypatch.setattr(job_service, "_AVG_DURATION", None)
+    monkeypatch.setattr(job_service, "_METRICS_QUEUE", metrics)
+    monkeypatch.setattr(job_service, "_get_pool", lambda: pool)
+    monkeypatch.setattr(job_service, "evaluate_interview", evaluation)
+    yield evaluation
+
+    evaluation.release.set()
+    pool.shutdown(wait=True)
+    metrics.put(None)
+    merger.join(5)
+
+
+def _submit(tmp_path, name: str) -> str:
+    tmp_dir = tmp_path / name
+    tmp_dir.mkdir()
+    return submit_evaluation(str(tmp_dir / "answer.webm"), str(tmp_dir), ["Q1"])
+
+
+def test_full_queue_gets_429_with_retry_after(stub, tmp_path):
+    _submit(tmp_path, "running")
+    _submit(tmp_path, "queued")
+
+    response = TestClient(app).post(
+        "/api/interview/evaluate",
+        files={"audio": ("answer.webm", b"x", "audio/webm")},
+        data={"questions": '["Explain how a hash map works."]'},
+    )
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(job_service.DEFAULT_RETRY_AFTER)
+    assert job_service._IN_FLIGHT == 2
+
+
+def test_disconnect_cancels_a_queued_job(stub, tmp_path):
+    _submit(tmp_path, "running")
+    assert stub.started.wait(5)
+    tmp_dir = tmp_path / "queued"
+    tmp_dir.mkdir()
+
+    async def gone():
+        return True
+
+    with pytest.raises(JobCancelledError):
+        asyncio.run(run_evaluation(
+            str(tmp_dir / "answer.webm"), str(tmp_dir), ["Q1"], is_disconnected=gone, poll_interval=0.01
+        ))
+
+    # the slot and the upload are released without the job ever running
+    assert job_service._IN_FLIGHT == 1
+    assert not os.path.exists(tmp_dir)
+    stub.release.set()
+    assert stub.calls == 1
+
+
+def test_connected_client_gets_the_result(stub, tmp_path):
+    stub.release.set()
+    tmp_dir = tmp_path / "job"
+    tmp_dir.mkdir()
+
+    async def connected():
+        return False
+
+    result = asyncio.run(run_evaluation(
+        str(tmp_dir / "answer.webm"), str(tmp_dir), ["Q1"], is_disconnected=connected, poll_interval=0.01
+    ))
+    assert result == {"questions": ["Q1"]}
+
+
+def test_cancelled_job_gets_499(monkeypatch):
+    async def cancelled(*args, **kwargs):
+        raise JobCancelledError("Job x was cancelled: the client disconnected")
+
+    monkeypatch.setattr(interview, "run_evaluation", cancelled)
+    response = TestClient(app).post(
+        "/api/interview/evaluate",
+        files={"audio": ("answer.webm", b"x", "audio/webm")},
+        data={"questions": '["Explain how a hash map works."]'},
+    )
+    assert response.status_code == 499
+
+
+def test_broken_pool_is_reset_once(monkeypatch):
+    old, current = FakePool(), FakePool()
+    monkeypatch.setattr(job_service, "_POOL", current)
+    monkeypatch.setattr(job_service, "_IN_FLIGHT", 2)
+    failed = Future()
+    failed.set_exception(BrokenProcessPool("A worker died"))
+
+    # a late callback from the pool that was already replaced
+    job_service._on_job_done("missing", old, failed)
+    assert job_service._POOL is current
+    assert not current.shut_down
+
+    job_service._on_job_done("missing", current, failed)
+    assert job_service._POOL is None
+    assert current.shut_down
+    assert job_service._IN_FLIGHT == 0
+
+
+def test_worker_metrics_are_merged(monkeypatch):
+    drained = queue.SimpleQueue()
+    monkeypatch.setattr(job_service, "_METRICS_QUEUE", drained)
+    JOBS.drain()  # the stub jobs of earlier tests
+
+    def fails():
+        JOBS.inc("error")
+        raise ValueError("bad audio")
+
+    with pytest.raises(ValueError):
+        job_service._run_job(fails)
+    deltas = drained.get_nowait()
+    assert deltas[JOBS.name] == {("error",): 1}
+    # _run_job drained the whole registry: give the other metrics back
+    REGISTRY.merge({name: d for name, d in deltas.items() if name != JOBS.name})
+
+    # two workers report the same job outcome
+    for _ in range(2):
+        drained.put({JOBS.name: deltas[JOBS.name]})
+    drained.put(None)
+    job_service._merge_worker_metrics(drained)
+    assert 'test_worker_jobs_total{outcome="error"} 2' in REGISTRY.render()
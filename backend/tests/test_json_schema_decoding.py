@@ -0,0 +1,129 @@
+# tests/test_json_schema_decoding.py
+
+import functools
+import json
+import random
+
+import pytest
+
+from app.models.generation_scheduler import GenerationScheduler
+from app.models.json_schema_decoding import (
+    DONE,
+    completion,
+    consume,
+    fit_schema,
+    initial_state,
+    max_size,
+    step,
+)
+from app.prompts.evaluation_prompt import FUSED_OUTPUT_SCHEMA
+from app.prompts.placement_prompt import PLACEMENT_OUTPUT_SCHEMA
+from app.prompts.question_prompt import build_question_output_schema
+from app.prompts.tcs_prompt import TCS_OUTPUT_SCHEMA
+from app.services.evaluation_profiles import EVALUATION_PROFILES, SCHEMA_CHARS_PER_TOKEN
+from app.services.question_service import EXPECTED_COUNTS
+from benchmarks.bench_schema_decoding import check
+from benchmarks.tiny_lm import build_tiny_lm
+
+SCHEMAS = {
+    "tcs": TCS_OUTPUT_SCHEMA,
+    "placement": PLACEMENT_OUTPUT_SCHEMA,
+    "fused": FUSED_OUTPUT_SCHEMA,
+    **{f"questions/{r}": build_question_output_schema(n) for r, n in EXPECTED_COUNTS.items()},
+}
+ALPHABET = 'abc XYZ019-,:{}[]"\\n\n'
+
+
+@pytest.fixture(scope="module", params=[0, 1])
+def scheduler(request):
+    # a random model never produces JSON on its own
+    tokenizer, model = build_tiny_lm(hidden_size=64, num_layers=1, seed=request.param)
+    return GenerationScheduler(tokenizer, model, window_ms=0)
+
+
+@functools.lru_cache(maxsize=None)
+def _generate(scheduler, name: str, budget: int) -> str:
+    return scheduler.generate(
+        f"Evaluate ({name}):", budget, 512, stop_at_json=True, schema=SCHEMAS[name]
+    )
+
+
+@pytest.mark.parametrize("name", list(SCHEMAS))
+def test_completion_closes_any_state(name):
+    rng = random.Random(name)
+    for _ in range(5):
+        state, text = initial_state(SCHEMAS[name]), ""
+        for _ in range(600):
+            closed = text + completion(state)
+            assert consume(initial_state(SCHEMAS[name]), closed) is DONE
+            assert check(json.loads(closed), SCHEMAS[name])
+
+            options = [(ch, s) for ch in ALPHABET if (s := step(state, ch)) not in (None, DONE)]
+            if not options:
+                break
+            ch, state = rng.choice(options)
+            text += ch
+
+
+@pytest.mark.parametrize("name", list(SCHEMAS))
+def test_outputs_parse_and_match_schema(scheduler, name):
+    value = json.loads(_generate(scheduler, name, 4000))
+    assert check(value, SCHEMAS[name])
+    if name.startswith("questions/"):
+        assert len(value["questions"]) == EXPECTED_COUNTS[name.split("/", 1)[1]]
+
+
+@pytest.mark.parametrize("name", ["tcs", "placement", "fused"])
+@pytest.mark.parametrize("budget", [320, 700])
+def test_output_is_closed_before_the_budget_runs_out(scheduler, name, budget):
+    # the schemas allow far longer replies than these budgets
+    assert len(_generate(scheduler, name, 4000)) > budget
+    assert check(json.loads(_generate(scheduler, name, budget)), SCHEMAS[name])
+
+
+def test_max_size_is_the_longest_document():
+    schema = SCHEMAS["tcs"]
+    props = schema["properties"]
+    longest = {
+        "score": 100,
+        "band": max(props["band"]["enum"], key=len),
+        "verdict": "x" * props["verdict"]["maxLength"],
+        "issues": ["x" * 300] * props["issues"]["maxItems"],
+        "improvement_points": ["x" * 300] * props["improvement_points"]["maxItems"],
+    }
+    assert max_size(schema) == len(json.dumps(longest, separators=(",", ":")))
+
+
+@pytest.mark.parametrize("name", ["tcs", "placement", "fused"])
+@pytest.mark.parametrize("max_chars", [200, 900, 2500, 10000])
+def test_fit_schema_fits_and_keeps_the_minimums(name, max_chars):
+    schema = SCHEMAS[name]
+    fitted = fit_schema(schema, max_chars)
+    if max_size(schema) <= max_chars:
+        assert fitted is schema
+        return
+    minimal = completion(initial_state(schema))
+    assert check(json.loads(minimal), fitted)
+    assert max_size(fitted) <= max(max_chars, max_size(fit_schema(schema, 0)))
+
+
+@pytest.mark.parametrize("name", list(EVALUATION_PROFILES))
+def test_profile_schemas_follow_the_budgets(name):
+    profile = EVALUATION_PROFILES[name]
+    tcs, placement = profile.tcs_schema(), profile.placement_schema()
+    if not profile.fit_schemas:
+        assert tcs is TCS_OUTPUT_SCHEMA and placement is PLACEMENT_OUTPUT_SCHEMA
+        return
+    assert max_size(tcs) <= profile.tcs_max_new_tokens * SCHEMA_CHARS_PER_TOKEN
+    assert max_size(tcs) < max_size(TCS_OUTPUT_SCHEMA)
+    if profile.placement_max_new_tokens:
+        assert max_size(placement) <= profile.placement_max_new_tokens * SCHEMA_CHARS_PER_TOKEN
+
+
+def test_fast_profile_output_stays_within_its_caps(scheduler):
+    profile = EVALUATION_PROFILES["fast"]
+    schema = profile.tcs_schema()
+    raw = scheduler.generate("Evaluate (fast):", profile.tcs_max_new_tokens, 512, stop_at_json=True, schema=schema)
+    value = json.loads(raw)
+    assert check(value, schema)
+    assert len(value["verdict"]) <= schema["properties"]["verdict"]["maxLength"]
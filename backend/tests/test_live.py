@@ -0,0 +1,94 @@
+# tests/test_live.py
+
+import signal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import live
+from app.main import app
+from app.services import live_ingest
+
+URL = "/api/interview/live"
+CONFIG = {"format": "pcm_s16le", "sample_rate": 16000, "questions": ["Explain how a hash map works."]}
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    # records every session the endpoint opens; chunks stay below one VAD
+    # pass so nothing is transcribed
+    opened = []
+
+    class RecordingSession(live_ingest.LiveTranscriptionSession):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+
+    monkeypatch.setattr(live, "LiveTranscriptionSession", RecordingSession)
+    monkeypatch.setattr(live_ingest, "LIVE_PROCESS_EVERY_S", 3600)
+    monkeypatch.setattr(live_ingest, "_ACTIVE_SESSIONS", 0)
+    return opened
+
+
+def _closed_with_error(ws) -> tuple:
+    frame = ws.receive_json()
+    closed = ws.receive()
+    assert frame["stage"] == "error"
+    assert closed["type"] == "websocket.close"
+    return closed["code"], frame["data"]
+
+
+def test_bad_config_is_refused(sessions):
+    with TestClient(app).websocket_connect(URL) as ws:
+        ws.send_json({**CONFIG, "format": "mp3"})
+        code, data = _closed_with_error(ws)
+    assert code == 1008
+    assert "format must be one of" in data["detail"]
+    assert live_ingest._ACTIVE_SESSIONS == 0
+
+
+def test_partial_sample_chunk_gets_1007(sessions):
+    with TestClient(app).websocket_connect(URL) as ws:
+        ws.send_json(CONFIG)
+        assert ws.receive_json()["stage"] == "ready"
+        ws.send_bytes(bytes(3200))
+        ws.send_bytes(bytes(3))  # half a sample
+        code, data = _closed_with_error(ws)
+    assert code == 1007
+    assert "whole 2-byte samples" in data["detail"]
+    assert live_ingest._ACTIVE_SESSIONS == 0
+
+
+def test_answer_past_the_limit_gets_1009(sessions, monkeypatch):
+    monkeypatch.setattr(live_ingest, "LIVE_MAX_SECONDS", 0.05)
+    with TestClient(app).websocket_connect(URL) as ws:
+        ws.send_json(CONFIG)
+        ws.receive_json()
+        ws.send_bytes(bytes(3200))  # 0.1 s
+        ws.send_bytes(bytes(3200))
+        code, _ = _closed_with_error(ws)
+    assert code == 1009
+    assert live_ingest._ACTIVE_SESSIONS == 0
+
+
+def test_full_sessions_get_1013_with_retry_after(sessions, monkeypatch):
+    monkeypatch.setattr(live_ingest, "_ACTIVE_SESSIONS", live_ingest.LIVE_MAX_SESSIONS)
+    with TestClient(app).websocket_connect(URL) as ws:
+        code, data = _closed_with_error(ws)
+    assert code == 1013
+    assert data["retry_after"] == live_ingest.LIVE_RETRY_AFTER
+    assert sessions == []
+    assert live_ingest._ACTIVE_SESSIONS == live_ingest.LIVE_MAX_SESSIONS
+
+
+def test_closing_mid_answer_cleans_up(sessions):
+    with TestClient(app).websocket_connect(URL) as ws:
+        ws.send_json({**CONFIG, "format": "webm"})
+        assert ws.receive_json()["stage"] == "ready"
+        ws.send_bytes(b"\x1a\x45\xdf\xa3")  # the start of a webm header
+        ws.close()
+
+    # the slot is free again and the session's ffmpeg was killed
+    (session,) = sessions
+    assert live_ingest._ACTIVE_SESSIONS == 0
+    assert session._ffmpeg.proc.wait(timeout=5) == -signal.SIGKILL
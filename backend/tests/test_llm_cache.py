@@ -0,0 +1,74 @@
+# tests/test_llm_cache.py
+
+import json
+import os
+import stat
+
+import pytest
+
+from app.models import generation_scheduler, json_schema_decoding, llm_cache
+from app.models.llm_runner import run_llm
+from app.services.tcs_service import parse_tcs_output
+
+
+class StubScheduler:
+    def __init__(self, reply: dict):
+        self.reply = json.dumps(reply)
+        self.calls = 0
+
+    def generate(self, prompt, **kwargs) -> str:
+        self.calls += 1
+        return self.reply
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "llm-cache" / "replies.sqlite3")
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_PATH", path)
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", True)
+    return path
+
+
+def _stub(monkeypatch, reply: dict) -> StubScheduler:
+    scheduler = StubScheduler(reply)
+    monkeypatch.setattr(generation_scheduler, "_SCHEDULER", scheduler)
+    return scheduler
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_database_is_private(cache_path):
+    llm_cache.store_response("k", "{}")
+    assert llm_cache.get_cached_response("k") == "{}"
+    assert stat.S_IMODE(os.stat(os.path.dirname(cache_path)).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(cache_path).st_mode) == 0o600
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_foreign_directory_is_not_used(cache_path, monkeypatch):
+    os.makedirs(os.path.dirname(cache_path))
+    monkeypatch.setattr(os, "getuid", lambda: os.stat(os.path.dirname(cache_path)).st_uid + 1)
+    llm_cache.store_response("k", "{}")
+    assert llm_cache.get_cached_response("k") is None
+    assert not os.path.exists(cache_path)
+
+
+def test_key_depends_on_schema_decoding(monkeypatch):
+    before = llm_cache.llm_cache_key("prompt", schema={"type": "string"})
+    flag = json_schema_decoding.SCHEMA_DECODING_ENABLED
+    monkeypatch.setattr(json_schema_decoding, "SCHEMA_DECODING_ENABLED", not flag)
+    assert llm_cache.llm_cache_key("prompt", schema={"type": "string"}) != before
+
+
+def test_rejected_reply_is_not_cached(cache_path, monkeypatch):
+    scheduler = _stub(monkeypatch, {"verdict": "parses, but has no score"})
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="score"):
+            run_llm("prompt", validate=parse_tcs_output)
+    assert scheduler.calls == 2
+
+
+def test_accepted_reply_is_served_from_the_cache(cache_path, monkeypatch):
+    scheduler = _stub(monkeypatch, {"score": 70})
+    for _ in range(2):
+        assert run_llm("prompt", validate=parse_tcs_output) == {"score": 70}
+    assert scheduler.calls == 1
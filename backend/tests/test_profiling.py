@@ -0,0 +1,70 @@
+# tests/test_profiling.py
+
+import os
+import stat
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils import profiling
+from app.utils.profiling import THREADED_PROFILE_MODES, parse_profiler
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    path = str(tmp_path / "profiles")
+    monkeypatch.setattr(profiling, "PROFILE_DIR", path)
+    return path
+
+
+def test_parse_profiler():
+    assert parse_profiler(None) is None
+    assert parse_profiler("1") == "sample"
+    assert parse_profiler("cprofile") == "cprofile"
+    assert parse_profiler("sample", THREADED_PROFILE_MODES) == "sample"
+    with pytest.raises(ValueError, match="profiler=sample"):
+        parse_profiler("cprofile", THREADED_PROFILE_MODES)
+    with pytest.raises(ValueError, match="must be one of"):
+        parse_profiler("perf")
+
+
+def test_evaluate_rejects_cprofile():
+    response = TestClient(app).post(
+        "/api/interview/evaluate",
+        params={"profiler": "cprofile"},
+        files={"audio": ("answer.webm", b"x", "audio/webm")},
+        data={"questions": '["Explain how a hash map works."]'},
+    )
+    assert response.status_code == 422
+    assert "profiler=sample" in response.json()["detail"]
+    assert "X-Profile-Id" not in response.headers
+
+
+def test_profiling_is_off_unless_enabled(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", False)
+    response = TestClient(app).post(
+        "/api/interview/evaluate",
+        params={"profiler": "sample"},
+        files={"audio": ("answer.webm", b"x", "audio/webm")},
+        data={"questions": '["Explain how a hash map works."]'},
+    )
+    assert response.status_code == 403
+    assert "X-Profile-Id" not in response.headers
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_profile_dir_is_private(profile_dir):
+    assert profiling.run_profiled("sample", "a" * 32, sum, [1, 2]) == 3
+    assert stat.S_IMODE(os.stat(profile_dir).st_mode) == 0o700
+    assert profiling.profile_path("a" * 32)
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_foreign_profile_dir_is_refused(profile_dir, monkeypatch):
+    os.makedirs(profile_dir)
+    monkeypatch.setattr(os, "getuid", lambda: os.stat(profile_dir).st_uid + 1)
+    with pytest.raises(RuntimeError, match="PROFILE_DIR"):
+        profiling.run_profiled("sample", "b" * 32, sum, [1, 2])
+    open(os.path.join(profile_dir, "b" * 32 + ".collapsed"), "w").close()
+    assert profiling.profile_path("b" * 32) is None
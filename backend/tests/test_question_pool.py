@@ -0,0 +1,104 @@
+# tests/test_question_pool.py
+
+import random
+import time
+
+import pytest
+
+from app.schemas.question import QuestionGenerationRequest
+from app.services import question_pool
+from app.services.question_service import EXPECTED_COUNTS
+
+REQUEST = QuestionGenerationRequest(
+    role="Backend Engineer", experience="2 years", company_type="startup", interview_round="Technical"
+)
+COUNT = EXPECTED_COUNTS["Technical"]
+
+
+class FakeModel:
+    """
+    Deterministic like greedy decoding: the same prompt (avoid list) always
+    gives the same batch. follows_avoid=False ignores the list entirely.
+    """
+
+    def __init__(self, follows_avoid: bool = True):
+        self.follows_avoid = follows_avoid
+        self.calls = 0
+        self.uncached_calls = 0
+
+    def __call__(self, req, avoid=(), use_cache=None):
+        self.calls += 1
+        self.uncached_calls += use_cache is False
+        avoid = list(avoid) if self.follows_avoid else []
+        rng = random.Random(repr(avoid))
+        out = []
+        while len(out) < EXPECTED_COUNTS[req.interview_round]:
+            q = f"Question {rng.randint(1, 10_000)}?"
+            if q not in avoid and q not in out:
+                out.append(q)
+        return out
+
+
+@pytest.fixture
+def model(monkeypatch):
+    fake = FakeModel()
+    monkeypatch.setattr(question_pool, "generate_interview_questions", fake)
+    question_pool.clear_question_pool()
+    yield fake
+    _drain_refills()
+    question_pool.clear_question_pool()
+
+
+def _drain_refills(timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with question_pool._LOCK:
+            if not any(e["refilling"] for e in question_pool._POOLS.values()):
+                return
+        time.sleep(0.01)
+    raise AssertionError("refills did not finish")
+
+
+def _pool_size() -> int:
+    with question_pool._LOCK:
+        return len(question_pool._POOLS[question_pool.pool_key(REQUEST)]["questions"])
+
+
+def test_no_repeats_within_a_session(model):
+    served = []
+    for _ in range(10):
+        questions = question_pool.get_pooled_questions(REQUEST, "session-1")
+        assert len(questions) == COUNT
+        served += questions
+        _drain_refills()
+
+    assert len(set(served)) == len(served)
+
+
+def test_refills_grow_the_pool_and_stop(model):
+    for _ in range(question_pool.QUESTION_POOL_POPULAR_HITS + 1):
+        question_pool.get_pooled_questions(REQUEST)
+    _drain_refills()
+
+    assert _pool_size() == COUNT * question_pool.QUESTION_POOL_BATCHES
+    # refills never reuse a cached reply
+    assert model.uncached_calls == question_pool.QUESTION_POOL_BATCHES - 1
+    calls = model.calls
+    question_pool.get_pooled_questions(REQUEST)
+    _drain_refills()
+    assert model.calls == calls
+
+
+def test_a_model_that_repeats_itself_stalls_instead_of_looping(model):
+    model.follows_avoid = False
+    for _ in range(question_pool.QUESTION_POOL_POPULAR_HITS + 1):
+        question_pool.get_pooled_questions(REQUEST)
+        _drain_refills()
+    # the first refill added nothing, so no further ones ran
+    assert model.calls == 2
+    assert _pool_size() == COUNT
+
+    question_pool.get_pooled_questions(REQUEST, "session-2")
+    with pytest.raises(question_pool.QuestionPoolExhaustedError):
+        question_pool.get_pooled_questions(REQUEST, "session-2")
+    assert model.calls == 2 + question_pool.QUESTION_FRESH_ATTEMPTS
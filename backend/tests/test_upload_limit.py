@@ -0,0 +1,79 @@
+# tests/test_upload_limit.py
+
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import interview
+from app.main import app, get_allowed_origins
+from app.utils.upload_limit import MAX_UPLOAD_BYTES, UPLOAD_CHUNK_BYTES, UploadTooLargeError
+
+ORIGIN = get_allowed_origins()[0]
+
+
+class _ZeroStream:
+    """File-like source of n zero bytes that holds no more than one read."""
+
+    def __init__(self, size: int):
+        self.left = size
+
+    def read(self, n: int) -> bytes:
+        n = min(n, self.left)
+        self.left -= n
+        return bytes(n)
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def test_copy_upload_keeps_memory_flat(tmp_path):
+    size = 64 * UPLOAD_CHUNK_BYTES
+    tracemalloc.start()
+    try:
+        written = interview._copy_upload(_ZeroStream(size), str(tmp_path / "answer.webm"))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert written == size
+    assert (tmp_path / "answer.webm").stat().st_size == size
+    assert peak < 3 * UPLOAD_CHUNK_BYTES
+
+
+def test_copy_upload_stops_past_the_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(interview, "MAX_UPLOAD_BYTES", 4 * UPLOAD_CHUNK_BYTES)
+    stream = _ZeroStream(64 * UPLOAD_CHUNK_BYTES)
+    with pytest.raises(UploadTooLargeError):
+        interview._copy_upload(stream, str(tmp_path / "answer.webm"))
+    # stopped at the first chunk over the limit, not after reading everything
+    assert stream.left == 59 * UPLOAD_CHUNK_BYTES
+
+
+def test_oversize_content_length_gets_413_with_cors_headers(client):
+    response = client.post(
+        "/api/interview/evaluate",
+        content=b"x",
+        headers={
+            "content-length": str(MAX_UPLOAD_BYTES + 1),
+            "content-type": "multipart/form-data; boundary=x",
+            "origin": ORIGIN,
+        },
+    )
+    assert response.status_code == 413
+    assert response.json()["detail"] == str(UploadTooLargeError(MAX_UPLOAD_BYTES))
+    assert response.headers["access-control-allow-origin"] == ORIGIN
+
+
+def test_oversize_file_part_gets_413(client, monkeypatch):
+    monkeypatch.setattr(interview, "MAX_UPLOAD_BYTES", 1024)
+    response = client.post(
+        "/api/interview/evaluate",
+        files={"audio": ("answer.webm", bytes(4096), "audio/webm")},
+        data={"questions": '["Explain how a hash map works."]'},
+        headers={"origin": ORIGIN},
+    )
+    assert response.status_code == 413
+    assert response.headers["access-control-allow-origin"] == ORIGIN
@@ -0,0 +1,52 @@
+# tests/test_warmup.py
+
+import json
+import os
+import subprocess
+import sys
+
+from app.services import job_service, warmup
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("faster_whisper", "ctranslate2", "librosa", "torch", "transformers", "spacy")
+
+
+def _run(code: str, **env) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND, env={**os.environ, "PYTHONPATH": BACKEND, **env},
+        capture_output=True, text=True, check=True, timeout=300
+    ).stdout
+
+
+def test_importing_the_app_loads_no_models():
+    loaded = _run(
+        "import json, sys, app.main\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    assert json.loads(loaded) == []
+
+
+def test_warm_job_pool_reports_every_worker():
+    code = (
+        "import json\n"
+        "from app.services import job_service\n"
+        "if __name__ == '__main__':\n"
+        "    print(json.dumps(job_service.warm_job_pool()))\n"
+        "    job_service.shutdown_job_pool()\n"
+    )
+    reports = json.loads(_run(code, EVALUATION_WORKERS="3", STARTUP_MODE="warm", WARMUP_MODELS=""))
+    assert len({r["pid"] for r in reports}) == 3
+    assert not any("error" in r for r in reports)
+
+
+def test_startup_warmup_warms_what_the_api_process_runs(monkeypatch):
+    warmed = []
+    warmers = {name: (lambda n=name: warmed.append(n)) for name in warmup.WARMUP_MODEL_NAMES}
+    monkeypatch.setattr(warmup, "WARMUP_MODELS", warmup.WARMUP_MODEL_NAMES)
+    monkeypatch.setattr(warmup, "_WARMERS", warmers)
+    monkeypatch.setattr(warmup, "_STATE", dict(warmup._STATE))
+    monkeypatch.setattr(job_service, "warm_job_pool", lambda: [])
+
+    warmup.run_startup_warmup()
+    assert sorted(warmed) == sorted(warmup.API_WARMUP_MODELS)
+    assert warmup.get_readiness()["status"] == "ready"